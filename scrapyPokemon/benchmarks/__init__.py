@@ -0,0 +1,2 @@
+# Benchmarks do projeto (rodar a partir da raiz do repositório, ex.:
+# python scrapyPokemon/benchmarks/bench_parse.py)
@@ -0,0 +1,111 @@
+# Tempo de partida a frio de cada subcomando do pokedex.py
+#
+# Roda cada caso N vezes num processo novo (mediana e melhor tempo de parede) e, numa
+# rodada à parte, lista quais bibliotecas pesadas (scrapy, twisted, pandas, numpy,
+# pymongo, pyarrow) acabaram importadas. "query frio" apaga o cache antes de cada
+# rodada; "query quente" reaproveita o cache gravado pela anterior. O script antigo das
+# consultas (pokedex_index.py) entra como referência. O crawl em si não roda (precisa do
+# site); só o "crawl --help" mede a partida do CLI.
+#   python scrapyPokemon/benchmarks/bench_cli.py [--repeat 5] [--mongo]
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "pokedex.py")
+HEAVY = ("scrapy", "twisted", "pandas", "numpy", "pymongo", "mongomock", "pyarrow")
+
+# Roda o script como __main__ e mostra no stderr os módulos pesados carregados
+PROBE = """
+import json, runpy, sys
+path, argv = sys.argv[1], sys.argv[2:]
+sys.argv = [path] + argv
+sys.path.insert(0, __import__("os").path.dirname(path))
+try:
+    runpy.run_path(path, run_name="__main__")
+except SystemExit:
+    pass
+print(json.dumps(sorted({m.split(".")[0] for m in sys.modules} & set(%r))), file=sys.stderr)
+""" % (HEAVY,)
+
+
+def cases(work, source, mongo):
+    cache = os.path.join(work, "cache")
+    out = os.path.join(work, "out")
+    query = [CLI, "query", "--input", source, "--cache-dir", cache]
+    rows = [
+        ("pokedex --help", [CLI, "--help"], None),
+        ("crawl --help", [CLI, "crawl", "--help"], None),
+        ("query frio", query, cache),
+        ("query quente", query, None),
+        ("query --no-cache", query + ["--no-cache"], None),
+        ("export jsonl", [CLI, "export", "--input", source, "--cache-dir", cache, "--output", out + ".jl"], None),
+        ("export csv", [CLI, "export", "--input", source, "--cache-dir", cache, "--output", out + ".csv"], None),
+        ("normalize", [CLI, "normalize", "--input", source, "--output", out + ".json"], None),
+    ]
+    if importlib.util.find_spec("pandas"):
+        rows.append(("normalize --pandas", [CLI, "normalize", "--pandas", "--input", source,
+                                            "--output", out + ".json"], None))
+    if importlib.util.find_spec("pyarrow"):
+        rows.append(("export parquet", [CLI, "export", "--input", source, "--cache-dir", cache,
+                                        "--output", out + ".parquet"], None))
+    if importlib.util.find_spec("mongomock"):
+        rows.append(("load --mock", [CLI, "load", "--mock", "--input", source], None))
+    if mongo:
+        rows.append(("query --mongo", [CLI, "query", "--mongo"], None))
+    # script antigo das consultas, como referência (relê o JSON a cada execução)
+    rows.append(("(antigo) pokedex_index.py", [os.path.join(ROOT, "pokedex_index.py"), "--input", source], None))
+    return rows
+
+
+def run_once(argv, cwd):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + argv, cwd=cwd, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def heavy_modules(argv, cwd):
+    proc = subprocess.run([sys.executable, "-c", PROBE] + argv, cwd=cwd, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True, check=True)
+    return json.loads(proc.stderr.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partida a frio dos subcomandos do pokedex.py")
+    parser.add_argument("--input", default=os.path.join(ROOT, "..", "data", "pokedex_sorted.json"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mongo", action="store_true", help="inclui query --mongo (MongoDB do .env)")
+    args = parser.parse_args()
+
+    repo = os.path.dirname(ROOT)
+    work = tempfile.mkdtemp(prefix="bench-cli-")
+    try:
+        source = os.path.join(work, "pokedex_sorted.json")
+        shutil.copyfile(args.input, source)
+        baseline = statistics.median(run_once(["-c", "pass"], repo) for _ in range(args.repeat))
+        print(f"interpretador vazio: {baseline * 1000:.0f} ms\n")
+        print(f"{'caso':<32}{'mediana':>10}{'melhor':>10}  bibliotecas pesadas")
+        for name, argv, clear in cases(work, source, args.mongo):
+            times = []
+            for _ in range(args.repeat):
+                if clear:
+                    shutil.rmtree(clear, ignore_errors=True)
+                times.append(run_once(argv, repo))
+            if clear:
+                shutil.rmtree(clear, ignore_errors=True)
+            loaded = ", ".join(heavy_modules(argv, repo)) or "-"
+            print(f"{name:<32}{statistics.median(times) * 1000:>8.0f}ms{min(times) * 1000:>8.0f}ms  {loaded}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# Benchmark da extração da cadeia evolutiva: passada única vs. consultas XPath por seta
+#
+# Gera famílias sintéticas com vários ramos (estilo Eevee/Wurmple), confere que a
+# saída de build_evolution_stages é idêntica à implementação antiga e mede o ganho.
+#   python scrapyPokemon/benchmarks/bench_evolution.py
+#   python scrapyPokemon/benchmarks/bench_evolution.py --corpus scrapyPokemon/corpus
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy.http import HtmlResponse  # noqa: E402
+
+from benchmarks.common import load_corpus, make_response  # noqa: E402
+from scrapyPokemon.caches import EvolutionChainCache  # noqa: E402
+from scrapyPokemon.items import PokemonItem  # noqa: E402
+from scrapyPokemon.spiders.pokemon import PokemonSpider  # noqa: E402
+
+
+# Implementação antiga (uma consulta following/preceding/ancestor por seta), mantida
+# aqui só como referência de saída e de tempo
+def legacy_parse_cards_conds(spider, chain_sel, response):
+
+    def parse_card(card_sel):
+        name = (card_sel.css("a.ent-name::text").get() or "").strip()
+        href = card_sel.css("a.ent-name::attr(href)").get() or ""
+        slug = spider.slug_from_href(href)
+        link_abs = response.urljoin(href)
+        small_text = " ".join(t.strip() for t in card_sel.css("small::text, small *::text").getall() if t.strip())
+        match = re.search(r"#\s*(\d+)", small_text)
+        pokemon_id = match.group(1) if match else None
+        return {"id": pokemon_id, "name": name, "link": link_abs, "slug": slug}
+
+    stages_list, slug_to_index, edges = [], {}, []
+
+    for arrow in chain_sel.xpath(".//span[contains(@class,'infocard-arrow')]"):
+        destination_card = arrow.xpath("following::div[contains(@class,'infocard')][1]")
+        if not destination_card:
+            continue
+        split_anc = arrow.xpath("ancestor::span[contains(@class,'infocard-evo-split')][1]")
+        if split_anc:
+            source_card = split_anc.xpath("preceding-sibling::div[contains(@class,'infocard')][1]")
+        else:
+            source_card = arrow.xpath("preceding::div[contains(@class,'infocard')][1]")
+        if not source_card:
+            continue
+
+        from_stage = parse_card(source_card)
+        to_stage = parse_card(destination_card)
+        if not from_stage["slug"] or not to_stage["slug"]:
+            continue
+        if from_stage["slug"] not in slug_to_index:
+            slug_to_index[from_stage["slug"]] = len(stages_list)
+            stages_list.append(from_stage)
+        if to_stage["slug"] not in slug_to_index:
+            slug_to_index[to_stage["slug"]] = len(stages_list)
+            stages_list.append(to_stage)
+
+        raw = (arrow.xpath("normalize-space(string(.))").get() or "").strip()
+        if raw.startswith("(") and raw.endswith(")"):
+            raw = raw[1:-1].strip()
+        item_name, item_link = None, None
+        for a_tag in arrow.css("a"):
+            href = a_tag.css("::attr(href)").get() or ""
+            if "/item/" in href:
+                item_name = (a_tag.css("::text").get() or "").strip()
+                item_link = response.urljoin(href)
+                break
+        level = spider.parse_level_from(raw)
+        method_text = f"Level {level}" if level is not None else raw
+        edges.append({
+            "i_from": slug_to_index[from_stage["slug"]],
+            "i_to": slug_to_index[to_stage["slug"]],
+            "method_text": method_text,
+            "level": level,
+            "item": item_name,
+            "item_link": item_link,
+        })
+
+    if not stages_list:
+        for c in chain_sel.xpath(".//div[contains(@class,'infocard')]"):
+            st = parse_card(c)
+            if st["slug"] and st["slug"] not in slug_to_index:
+                slug_to_index[st["slug"]] = len(stages_list)
+                stages_list.append(st)
+
+    return stages_list, edges
+
+
+# Spider com a extração antiga, varrendo todas as listas (inclusive as aninhadas) como antes
+class LegacySpider(PokemonSpider):
+    def parse_cards_conds(self, chain_sel, response):
+        return legacy_parse_cards_conds(self, chain_sel, response)
+
+    # A versão antiga percorria todas as listas, inclusive as aninhadas nos splits
+    def evolution_chains(self, response):
+        return response.css("div.infocard-list-evo")
+
+
+def card_html(n):
+    return (f'<div class="infocard "><span class="infocard-lg-img"><a href="/pokedex/mon-{n}">'
+            f'<img src="x.png"></a></span><span class="infocard-lg-data text-muted">'
+            f'<small>#{n:04d}</small><br><a class="ent-name" href="/pokedex/mon-{n}">Mon {n}</a>'
+            f'<br><small><a href="/type/normal" class="itype normal">Normal</a></small></span></div>\n')
+
+
+def arrow_html(k):
+    if k % 3 == 0:
+        return (f'<span class="infocard infocard-arrow"><i class="icon-arrow icon-arrow-e"></i>'
+                f'<small>(use <a href="/item/stone-{k}">Stone {k}</a>)</small></span>\n')
+    return (f'<span class="infocard infocard-arrow"><i class="icon-arrow icon-arrow-e"></i>'
+            f'<small>(Level {10 + k})</small></span>\n')
+
+
+# Família com um card base e `branches` ramos de `depth` estágios cada
+def family_page(branches, depth, filler=200):
+    counter = [1]
+
+    def next_card():
+        counter[0] += 1
+        return counter[0]
+
+    lists = []
+    for b in range(branches):
+        parts = []
+        for d in range(depth):
+            parts.append(arrow_html(b * depth + d))
+            parts.append(card_html(next_card()))
+        lists.append('<div class="infocard-list-evo">\n' + "".join(parts) + "</div>\n")
+
+    chain = ('<div class="infocard-list-evo">\n' + card_html(1)
+             + '<span class="infocard-evo-split">\n' + "".join(lists) + "</span>\n</div>\n")
+    # Conteúdo extra antes/depois, como a página real (tabelas de golpes etc.)
+    rows = "".join(f"<tr><td>Move {i}</td><td>{i}</td></tr>" for i in range(filler))
+    body = (f"<html><body><main><h1>Mon 1</h1><table>{rows}</table>"
+            f"<h2>Evolution chart</h2>{chain}<table>{rows}</table></main></body></html>")
+    return body.encode("utf-8")
+
+
+def bench(spider, responses, repeat):
+    start = time.perf_counter()
+    outputs = []
+    for _ in range(repeat):
+        outputs = []
+        for response in responses:
+            attributes = PokemonItem(link=response.url)
+            spider.build_evolution_stages(response, attributes)
+            outputs.append((attributes.evolution_stages, attributes.evolutions))
+    return (time.perf_counter() - start) / (repeat * len(responses)), outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração da cadeia evolutiva")
+    parser.add_argument("--corpus", default=None, help="confere também as páginas de um corpus gravado")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    new_spider, old_spider, cached_spider = PokemonSpider(), LegacySpider(), PokemonSpider()
+    # Sem cache para comparar só a extração; o terceiro spider mede a família em cache
+    new_spider.evolution_cache = EvolutionChainCache(max_size=0)
+    old_spider.evolution_cache = EvolutionChainCache(max_size=0)
+    cases = [(1, 2), (2, 2), (8, 1), (8, 2), (16, 2), (32, 2), (32, 3)]
+
+    print(f"{'família':<18}{'cards':>7}{'antigo ms':>12}{'novo ms':>10}{'ganho':>8}{'cache ms':>10}")
+    for branches, depth in cases:
+        body = family_page(branches, depth)
+        url = "https://pokemondb.net/pokedex/mon-1"
+        responses = [HtmlResponse(url=url, body=body, encoding="utf-8")]
+        for r in responses:
+            r.selector  # monta a árvore fora da medição
+
+        old_time, old_out = bench(old_spider, responses, args.repeat)
+        new_time, new_out = bench(new_spider, responses, args.repeat)
+        cached_time, cached_out = bench(cached_spider, responses, args.repeat)
+        if old_out != new_out or old_out != cached_out:
+            sys.exit(f"Saída diferente para {branches} ramos x {depth} estágios")
+
+        cards = 1 + branches * depth
+        label = f"{branches} ramos x {depth}"
+        print(f"{label:<18}{cards:>7}{old_time * 1000:>12.3f}{new_time * 1000:>10.3f}"
+              f"{old_time / new_time:>7.1f}x{cached_time * 1000:>10.3f}")
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)["detail"]
+        mismatches = 0
+        for page in pages:
+            _, old_out = bench(old_spider, [make_response(page)], 1)
+            _, new_out = bench(new_spider, [make_response(page)], 1)
+            _, cached_out = bench(cached_spider, [make_response(page)], 1)
+            if old_out != new_out or old_out != cached_out:
+                mismatches += 1
+                print(f"DIFERENTE: {page['url']}")
+        print(f"\n{len(pages)} páginas do corpus conferidas, {mismatches} diferenças")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Confere o DETAIL_FAST_PATH (fast_extract.py) contra os seletores e mede o ganho
+#
+# 1) Diferencial: em cada página de detalhe do corpus compara campo a campo os textos
+#    lidos pelos seletores :contains() do spider com os do scan_detail_page, e o item
+#    final do parse_details com o fast path ligado e desligado. Sai com código 1 se
+#    qualquer campo divergir.
+# 2) Throughput: extração dos campos com a árvore já montada e parse_details completo
+#    (resposta nova a cada chamada), nos dois modos.
+#   python scrapyPokemon/benchmarks/bench_fast_extract.py --corpus scrapyPokemon/corpus --repeat 20
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_CORPUS_DIR, load_corpus, make_response, percentiles, time_calls  # noqa: E402
+from scrapyPokemon.caches import AbilityStore  # noqa: E402
+from scrapyPokemon.fast_extract import scan_detail_page  # noqa: E402
+from scrapyPokemon.items import PokemonItem  # noqa: E402
+from scrapyPokemon.spiders.pokemon import PokemonSpider  # noqa: E402
+
+FIELDS = ("height", "weight", "types_names", "types_multipliers", "ability_names", "ability_links")
+
+
+# Os mesmos textos que os helpers do spider leem pelos seletores
+def selector_fields(response):
+    raw_abilities = response.css("th:contains('Abilities') + td a")
+    return {
+        "height": response.css("th:contains('Height') + td::text").get() or "",
+        "weight": response.css("th:contains('Weight') + td::text").get() or "",
+        "types_names": response.css("table.type-table tr:nth-child(1) th a::attr(title)").getall(),
+        "types_multipliers": [td.css("::text").get(default="").strip()
+                              for td in response.css("table.type-table tr:nth-child(2) td")],
+        "ability_names": [n.strip() for n in raw_abilities.css("::text").getall()],
+        "ability_links": raw_abilities.css("::attr(href)").getall(),
+    }
+
+
+def fast_fields(response):
+    fields = scan_detail_page(response)
+    return {name: getattr(fields, name) for name in FIELDS}
+
+
+def parse_item(spider, page):
+    spider.ability_store = AbilityStore()
+    attributes = PokemonItem(link=page["url"])
+    outputs = list(spider.parse_details(make_response(page), attributes))
+    return attributes.to_item(), [getattr(o, "url", o) for o in outputs]
+
+
+def differential(pages):
+    selector_spider, fast_spider = PokemonSpider(), PokemonSpider()
+    fast_spider.fast_path = True
+    mismatches = 0
+    for page in pages:
+        response = make_response(page)
+        expected, got = selector_fields(response), fast_fields(response)
+        for name in FIELDS:
+            if expected[name] != got[name]:
+                mismatches += 1
+                print(f"DIVERGE {page['url']} {name}: {expected[name]!r} != {got[name]!r}")
+        if parse_item(selector_spider, page) != parse_item(fast_spider, page):
+            mismatches += 1
+            print(f"DIVERGE {page['url']}: item do parse_details")
+    return mismatches
+
+
+def report(name, samples, baseline=None):
+    p = percentiles(samples)
+    total = sum(samples)
+    ratio = f" ({baseline / total:.2f}x)" if baseline else ""
+    print(f"  {name:<26}{len(samples) / total:9.0f} páginas/s  p50 {p['p50'] * 1000:.3f} ms{ratio}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diferencial e throughput do DETAIL_FAST_PATH")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)["detail"]
+    if not pages:
+        sys.exit("Nenhuma página de detalhe no corpus")
+
+    mismatches = differential(pages)
+    print(f"{len(pages)} páginas comparadas campo a campo: "
+          + ("todos os campos iguais" if not mismatches else f"{mismatches} divergências"))
+    if mismatches:
+        sys.exit(1)
+
+    pages = pages * args.repeat
+    warm = [make_response(page) for page in pages]
+    for response in warm:
+        response.selector  # árvore montada fora da medição
+
+    print("campos com a árvore já montada:")
+    base = report("seletores", time_calls(selector_fields, warm))
+    report("fast path", time_calls(fast_fields, warm), base)
+
+    print("parse_details completo:")
+    selector_spider, fast_spider = PokemonSpider(), PokemonSpider()
+    fast_spider.fast_path = True
+    base = report("seletores", time_calls(lambda page: parse_item(selector_spider, page), pages))
+    report("fast path", time_calls(lambda page: parse_item(fast_spider, page), pages), base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# Memória dos Pokémon em construção (esperando as páginas de habilidade)
+#
+# 1) Bytes por item em espera: roda parse_details em todas as páginas de detalhe do corpus
+#    com o AbilityStore vazio (todo item fica pendente) e soma o tamanho profundo dos
+#    PokemonItem retidos, comparando com o dict equivalente que o spider usava antes.
+# 2) Pico de RSS de um crawl completo com concorrência alta contra o servidor local
+#    (latência alta para muitos itens ficarem em espera ao mesmo tempo).
+#   python scrapyPokemon/benchmarks/bench_memory.py --corpus scrapyPokemon/corpus
+
+import argparse
+import os
+import sys
+import threading
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_sort import run_measured  # noqa: E402
+from benchmarks.common import DEFAULT_CORPUS_DIR, load_corpus, make_response  # noqa: E402
+from scrapyPokemon.caches import AbilityStore  # noqa: E402
+from scrapyPokemon.items import PokemonItem  # noqa: E402
+from scrapyPokemon.spiders.pokemon import PokemonSpider  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Tamanho profundo de um conjunto de objetos; objetos compartilhados contam uma vez só
+def deep_size(objs):
+    seen = set()
+    stack = list(objs)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, Mapping):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+        elif hasattr(obj, "__slots__"):
+            stack.extend(getattr(obj, name) for name in obj.__slots__ if hasattr(obj, name))
+    return total
+
+
+# Cópia com strings e floats novos, como saíam dos seletores em cada página
+def fresh(obj):
+    if isinstance(obj, str):
+        return obj.encode("utf-8").decode("utf-8")
+    if isinstance(obj, float):
+        return float(repr(obj))
+    if isinstance(obj, dict):
+        return {fresh(k): fresh(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [fresh(v) for v in obj]
+    return obj
+
+
+# O dict que o spider mantinha em cb_kwargs enquanto as habilidades não chegavam
+def legacy_dict(record):
+    item = record.to_item()
+    item["_pending"] = record.pending
+    return fresh(item)
+
+
+def in_flight_sizes(corpus_dir):
+    pages = load_corpus(corpus_dir)["detail"]
+    spider = PokemonSpider()
+    spider.ability_store = AbilityStore()
+    records = []
+    for page in pages:
+        record = PokemonItem(link=page["url"])
+        spider.ability_store = AbilityStore()
+        list(spider.parse_details(make_response(page), record))
+        if record.pending:
+            records.append(record)
+
+    legacy = [legacy_dict(r) for r in records]
+    return len(records), deep_size(records), deep_size(legacy)
+
+
+def crawl_peak_rss(corpus_dir, port, concurrency, latency):
+    from benchmarks.standin_server import make_server
+
+    server = make_server(port, corpus_dir, latency=latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cmd = [
+        "scrapy", "crawl", "pokemon", "-a", f"base_url=http://127.0.0.1:{port}",
+        "-s", "ROBOTSTXT_OBEY=False", "-s", "ABILITY_STORE_PATH=",
+        "-s", "ADAPTIVE_THROTTLE_ENABLED=False", "-s", "DOWNLOAD_DELAY=0",
+        "-s", f"CONCURRENT_REQUESTS={concurrency}",
+        "-s", f"CONCURRENT_REQUESTS_PER_DOMAIN={concurrency}",
+        "-s", "LOG_LEVEL=ERROR",
+    ]
+    try:
+        elapsed, rss = run_measured(cmd, ROOT)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return elapsed, rss, server.peak_in_flight
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória dos itens em espera e pico de RSS do crawl")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--skip-crawl", action="store_true")
+    args = parser.parse_args()
+
+    count, new_bytes, old_bytes = in_flight_sizes(args.corpus)
+    if not count:
+        sys.exit("Nenhuma página de detalhe com habilidades no corpus")
+    print(f"{count} itens em espera")
+    print(f"  dict antigo : {old_bytes / count:8.0f} bytes/item")
+    print(f"  PokemonItem : {new_bytes / count:8.0f} bytes/item ({new_bytes / old_bytes:.0%})")
+
+    if args.skip_crawl:
+        return
+    elapsed, rss, peak = crawl_peak_rss(args.corpus, args.port, args.concurrency, args.latency)
+    print(f"crawl com concorrência {args.concurrency}: {elapsed:.1f}s, pico de RSS {rss:.1f} MB, "
+          f"pico de {peak} requisições simultâneas no servidor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Tamanho e tempo de leitura: pokedex_sorted.json vs formato normalizado (pokedex_normalized.py)
+#
+# Mede tamanho do arquivo (bytes e linhas), tempo do json.load, tempo para remontar todos
+# os registros no formato antigo e o tamanho em BSON (o "size" que o collStats do MongoDB
+# reporta para os documentos, antes da compressão do WiredTiger).
+#   python scrapyPokemon/benchmarks/bench_normalized.py --input data/pokedex_sorted.json
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pokedex_normalized import NormalizedPokedex, normalize, write_normalized  # noqa: E402
+from sorted_pokedex_stream import iter_records  # noqa: E402
+
+
+def file_stats(path):
+    with open(path, "rb") as f:
+        lines = sum(1 for _ in f)
+    return os.path.getsize(path), lines
+
+
+def best_of(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bson_size(docs):
+    import bson
+
+    return sum(len(bson.encode(doc)) for doc in docs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="formato denormalizado vs normalizado")
+    parser.add_argument("--input", default="data/pokedex_sorted.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    families, pokemon, fallback = normalize(iter_records(args.input))
+    with tempfile.TemporaryDirectory(prefix="bench-normalized-") as work:
+        out_path = os.path.join(work, "pokedex_normalized.json")
+        write_normalized(families, pokemon, out_path)
+
+        old_size, old_lines = file_stats(args.input)
+        new_size, new_lines = file_stats(out_path)
+        old_load, old_docs = best_of(lambda: load_json(args.input), args.repeat)
+        new_load, data = best_of(lambda: load_json(out_path), args.repeat)
+        view = NormalizedPokedex(data["families"], data["pokemon"])
+        rebuild, rebuilt = best_of(lambda: list(view), args.repeat)
+
+    print(f"{len(pokemon)} Pokémon, {len(families)} famílias"
+          + (f", {fallback} registros no formato antigo" if fallback else ""))
+    print(f"{'':<16}{'denormalizado':>16}{'normalizado':>16}")
+    print(f"{'arquivo (KB)':<16}{old_size / 1024:>16.1f}{new_size / 1024:>16.1f}  ({new_size / old_size:.0%})")
+    print(f"{'linhas':<16}{old_lines:>16}{new_lines:>16}")
+    print(f"{'json.load (ms)':<16}{old_load * 1000:>16.2f}{new_load * 1000:>16.2f}")
+    print(f"{'remontar (ms)':<16}{'-':>16}{rebuild * 1000:>16.2f}")
+
+    try:
+        old_bson = bson_size(old_docs)
+        new_bson = bson_size(data["pokemon"]) + bson_size(data["families"])
+        print(f"{'BSON (KB)':<16}{old_bson / 1024:>16.1f}{new_bson / 1024:>16.1f}  ({new_bson / old_bson:.0%})")
+    except ImportError:
+        print("pymongo não instalado, pulando o tamanho em BSON")
+
+    if rebuilt != old_docs:
+        sys.exit("ERRO: registros remontados diferentes da entrada")
+
+
+if __name__ == "__main__":
+    main()
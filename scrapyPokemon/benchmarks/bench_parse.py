@@ -0,0 +1,153 @@
+# Benchmark de throughput dos callbacks do PokemonSpider sobre um corpus gravado
+#
+# Grave o corpus uma vez (dentro de scrapyPokemon/):
+#   scrapy crawl pokemon -s POKEDEX_CORPUS_MODE=record
+# Depois, da raiz do repositório:
+#   python scrapyPokemon/benchmarks/bench_parse.py                 # compara com a baseline
+#   python scrapyPokemon/benchmarks/bench_parse.py --save-baseline # grava nova baseline
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (  # noqa: E402
+    DEFAULT_CORPUS_DIR,
+    compare_with_baseline,
+    load_baseline,
+    load_corpus,
+    make_response,
+    peak_rss_mb,
+    percentiles,
+    save_baseline,
+    time_calls,
+)
+from scrapyPokemon.caches import AbilityStore, EvolutionChainCache  # noqa: E402
+from scrapyPokemon.items import PokemonItem  # noqa: E402
+from scrapyPokemon.spiders.pokemon import PokemonSpider  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_parse.json")
+
+
+# Atributos mínimos que o parse da listagem entregaria para a página de detalhe
+def detail_attributes(page):
+    return PokemonItem(link=page["url"])
+
+
+# Cada repetição começa com o cache de cadeias evolutivas vazio, como um crawl novo;
+# sem isso só a 1ª repetição faria o parse das cadeias e as demais mediriam acertos de cache
+def timed_repeats(spider, fn, args, repeat):
+    samples = []
+    for _ in range(repeat):
+        spider.evolution_cache = EvolutionChainCache(spider.evolution_cache.max_size)
+        samples += time_calls(fn, args)
+    return samples
+
+
+def run(pages, repeat):
+    spider = PokemonSpider()
+    details = pages["detail"]
+    abilities = pages["ability"]
+    listing = pages["all"]
+    results = {}
+
+    # Callbacks completos: resposta nova a cada chamada (inclui montar a árvore HTML)
+    def call_parse(page):
+        list(spider.parse(make_response(page)))
+
+    def call_parse_details(page):
+        # Store vazio: toda página gera as requisições de habilidade, como no 1º crawl
+        spider.ability_store = AbilityStore()
+        list(spider.parse_details(make_response(page), detail_attributes(page)))
+
+    def call_parse_ability(page):
+        attributes = PokemonItem(pending=1)
+        list(spider.parse_ability(make_response(page), attributes, "ability"))
+
+    callbacks = {
+        "parse": (call_parse, listing),
+        "parse_details": (call_parse_details, details),
+        "parse_ability": (call_parse_ability, abilities),
+    }
+
+    total_pages, total_time = 0, 0.0
+    for name, (fn, args) in callbacks.items():
+        samples = timed_repeats(spider, fn, args, repeat)
+        results[name] = {"calls": len(samples), **percentiles(samples)}
+        total_pages += len(samples)
+        total_time += sum(samples)
+
+    # Helpers isolados: árvore já montada, mede só o trabalho de seletores/regex
+    warm = [make_response(page) for page in details]
+    for response in warm:
+        response.selector  # força o parse do HTML fora da medição
+
+    helpers = {
+        "build_evolution_stages": lambda r: spider.build_evolution_stages(r, PokemonItem(link=r.url)),
+        "parse_effectiveness": lambda r: spider.parse_effectiveness(r, PokemonItem()),
+        "parse_height_weight": lambda r: spider.parse_height_weight(r, PokemonItem()),
+    }
+    for name, fn in helpers.items():
+        samples = timed_repeats(spider, fn, warm, repeat)
+        results[name] = {"calls": len(samples), **percentiles(samples)}
+
+    results["summary"] = {
+        "pages": total_pages,
+        "pages_per_sec": total_pages / total_time if total_time else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    return results
+
+
+def print_results(results):
+    print(f"{'callback':<24}{'calls':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, m in results.items():
+        if name == "summary":
+            continue
+        row = [m.get(k) for k in ("p50", "p90", "p99", "max")]
+        cols = "".join(f"{v * 1000:>10.3f}" if v is not None else f"{'-':>10}" for v in row)
+        print(f"{name:<24}{m['calls']:>7}{cols}")
+    s = results["summary"]
+    pps = f"{s['pages_per_sec']:.1f}" if s["pages_per_sec"] else "-"
+    print(f"\n{s['pages']} páginas | {pps} páginas/s | pico de RSS {s['peak_rss_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos callbacks do PokemonSpider")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=1, help="repete cada página N vezes")
+    parser.add_argument("--limit", type=int, default=None, help="máximo de páginas por tipo")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="piora relativa aceita antes de acusar regressão (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.limit)
+    started = time.perf_counter()
+    results = run(pages, args.repeat)
+    print_results(results)
+    print(f"tempo total: {time.perf_counter() - started:.2f}s")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline salva em {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("Sem baseline para comparar (use --save-baseline).")
+        return
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    for name, key, before, now, ratio in regressions:
+        print(f"REGRESSÃO {name} {key}: {before * 1000:.3f}ms -> {now * 1000:.3f}ms ({ratio:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    print("Sem regressões em relação à baseline.")
+
+
+if __name__ == "__main__":
+    main()
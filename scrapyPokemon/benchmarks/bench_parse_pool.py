@@ -0,0 +1,81 @@
+# Escala do parse das páginas de detalhe com o número de processos (PARSE_POOL_WORKERS)
+#
+# Reproduz as páginas de detalhe do corpus pelo mesmo extract_details que o ParsePool usa,
+# com a mesma fila limitada (no máximo 4 páginas por processo no pool), para 1, 2, 4...
+# processos até o número de núcleos. Compara com o parse no próprio processo (como no
+# reactor) e confere que todos devolvem os mesmos dicts.
+#   python scrapyPokemon/benchmarks/bench_parse_pool.py --corpus scrapyPokemon/corpus --repeat 20
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_CORPUS_DIR, load_corpus  # noqa: E402
+from scrapyPokemon.parse_pool import extract_details, init_worker  # noqa: E402
+
+
+def job_args(page):
+    return page["url"], page["body"], "utf-8", {"id": None, "name": None, "link": page["url"]}
+
+
+def run_inline(pages):
+    start = time.perf_counter()
+    results = [extract_details(*job_args(page)) for page in pages]
+    return time.perf_counter() - start, results
+
+
+def run_pool(pages, workers, max_pending, start_method):
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker) as executor:
+        # Sobe todos os processos (e o import do Scrapy) fora da medição
+        list(executor.map(time.sleep, [0.2] * workers))
+
+        results = [None] * len(pages)
+        pending = {}
+        start = time.perf_counter()
+        for i, page in enumerate(pages):
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+            pending[executor.submit(extract_details, *job_args(page))] = i
+        for future in wait(pending).done:
+            results[pending[future]] = future.result()
+        return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput do parse de detalhe por número de processos")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=20, help="quantas vezes reproduzir o corpus")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int, default=4, help="páginas na fila por processo")
+    parser.add_argument("--start-method", default="spawn")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)["detail"] * args.repeat
+    if not pages:
+        sys.exit("Nenhuma página de detalhe no corpus")
+
+    init_worker()
+    inline_time, expected = run_inline(pages)
+    inline_rate = len(pages) / inline_time
+    print(f"{len(pages)} páginas, {os.cpu_count()} núcleos")
+    print(f"  no reactor   : {inline_rate:8.0f} páginas/s")
+
+    workers = 1
+    while workers <= args.max_workers:
+        elapsed, results = run_pool(pages, workers, workers * args.max_pending, args.start_method)
+        rate = len(pages) / elapsed
+        same = "" if results == expected else "  RESULTADO DIFERENTE"
+        print(f"  {workers:2d} processo(s): {rate:8.0f} páginas/s ({rate / inline_rate:.2f}x){same}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
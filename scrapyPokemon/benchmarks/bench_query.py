@@ -0,0 +1,69 @@
+# Benchmark das consultas do mongoDB.py: índices em memória (pokedex_index.py) vs aggregate
+#
+# Carrega o mesmo arquivo numa coleção (mongomock por padrão, ou o MongoDB do .env com
+# --mongo), roda pipeline1/2a/2b e as consultas equivalentes e confere os resultados.
+#   python scrapyPokemon/benchmarks/bench_query.py --input data/pokedex_sorted.json
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mongo_loader import get_collection, load_documents  # noqa: E402
+from mongo_queries import pipeline1, pipeline2a, pipeline2b  # noqa: E402
+from pokedex_index import PokedexIndex, query1, query2a, query2b  # noqa: E402
+from sorted_pokedex_stream import iter_records  # noqa: E402
+
+QUERIES = {
+    "1": (query1, pipeline1),
+    "2a": (query2a, pipeline2a),
+    "2b": (query2b, pipeline2b),
+}
+
+
+# Tempo médio por chamada e o último resultado
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+# O $sort do pipeline2b usa um campo inexistente, então a ordem não é comparável
+def canonical(rows):
+    return sorted(tuple(sorted(row.items())) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="índices em memória vs agregações do MongoDB")
+    parser.add_argument("--input", default="data/pokedex_sorted.json")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--mongo", action="store_true", help="usa o MongoDB do .env em vez do mongomock")
+    args = parser.parse_args()
+
+    build_s, index = timed(lambda: PokedexIndex.load(args.input), 1)
+    print(f"índices montados em {build_s * 1000:.1f} ms ({len(index.docs)} documentos, "
+          f"{len(index.edges)} arestas de evolução)")
+
+    coll = get_collection(mock=not args.mongo)
+    load_documents(coll, iter_records(args.input))
+    mongo_repeat = max(1, args.repeat // 100)
+
+    ok = True
+    print(f"{'consulta':<10}{'índice':>14}{'aggregate':>14}{'speedup':>10}")
+    for name, (query, pipeline) in QUERIES.items():
+        idx_s, idx_rows = timed(lambda: query(index), args.repeat)
+        mongo_s, mongo_rows = timed(lambda: list(coll.aggregate(pipeline)), mongo_repeat)
+        same = canonical(idx_rows) == canonical(mongo_rows)
+        ok &= same
+        print(f"{name:<10}{idx_s * 1e6:>11.1f} µs{mongo_s * 1e6:>11.0f} µs"
+              f"{mongo_s / idx_s:>9.0f}x  {'ok' if same else 'RESULTADOS DIFERENTES'}")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# Testes de carga do pós-processamento com pokedex sintéticas (synthetic_pokedex.py)
+#
+# Para cada tamanho gera o feed sintético e roda, cada etapa num subprocesso (tempo de
+# parede e pico de RSS do filho):
+#   sort   sorted_pokedex_stream.py (e sorted_pokedex_pandas.py com --pandas)
+#   load   mongo_loader.load_documents duas vezes: carga inicial e recarga sem mudanças
+#   query  PokedexIndex + query1/2a/2b e os pipelines do mongo_queries via aggregate
+# No fim mostra as curvas (segundos, µs por documento, RSS) e o expoente de escala entre
+# tamanhos vizinhos (~1 = linear). Por padrão usa mongomock; --mongo usa o MongoDB do .env
+# numa base separada (PokedexLoadTest), apagada antes de cada tamanho. O mongomock varre a
+# coleção inteira em cada find/índice único (load e aggregate ficam quadráticos), então
+# acima de ~10k documentos as curvas de load/query só dizem algo com --mongo.
+#   python scrapyPokemon/benchmarks/bench_scale.py --sizes 10000,100000,1000000 [--csv scale.csv]
+
+import argparse
+import csv
+import importlib.util
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_sort import run_measured  # noqa: E402
+from sorted_pokedex_stream import iter_records  # noqa: E402
+from synthetic_pokedex import TEMPLATE_PATH, generate, write_feed  # noqa: E402
+
+STREAM_SCRIPT = os.path.join(ROOT, "sorted_pokedex_stream.py")
+PANDAS_SCRIPT = os.path.join(ROOT, "sorted_pokedex_pandas.py")
+TEST_DB = "PokedexLoadTest"
+
+
+def test_collection(mongo):
+    from mongo_loader import get_collection
+
+    coll = get_collection(mock=not mongo)
+    return coll.database.client[TEST_DB]["pokemon"]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+# Etapas que rodam no subprocesso (--run-stage); devolvem {métrica: segundos}
+def stage_load(path, mongo):
+    from mongo_loader import load_documents
+
+    coll = test_collection(mongo)
+    coll.drop()
+    first, _ = load_documents(coll, iter_records(path))
+    again, _ = load_documents(coll, iter_records(path))
+    return {"load": first["seconds"], "reload_unchanged": again["seconds"]}
+
+
+def stage_query(path, mongo):
+    from mongo_loader import load_documents
+    from mongo_queries import pipeline1, pipeline2a, pipeline2b
+    from pokedex_index import PokedexIndex, query1, query2a, query2b
+
+    out = {}
+    out["index_build"], index = timed(lambda: PokedexIndex.load(path))
+    for name, query in (("index_q1", query1), ("index_q2a", query2a), ("index_q2b", query2b)):
+        out[name], _ = timed(lambda: query(index))
+
+    coll = test_collection(mongo)
+    if coll.estimated_document_count() == 0:
+        load_documents(coll, iter_records(path))
+    for name, pipeline in (("aggregate_q1", pipeline1), ("aggregate_q2a", pipeline2a),
+                           ("aggregate_q2b", pipeline2b)):
+        out[name], _ = timed(lambda: list(coll.aggregate(pipeline)))
+    return out
+
+
+STAGES = {"load": stage_load, "query": stage_query}
+
+
+def run_stage(name, path, mongo, work):
+    out_path = os.path.join(work, f"{name}.json")
+    cmd = [sys.executable, os.path.abspath(__file__), "--run-stage", name, "--input", path, "--out", out_path]
+    if mongo:
+        cmd.append("--mongo")
+    elapsed, rss = run_measured(cmd, ROOT)
+    with open(out_path, "r", encoding="utf-8") as f:
+        return elapsed, rss, json.load(f)
+
+
+def run_size(size, templates, args, work):
+    rows = []
+    feed = os.path.join(work, "data", "pokedex.json")
+    sorted_path = os.path.join(work, "data", "pokedex_sorted.json")
+
+    gen_s, total = timed(lambda: write_feed(generate(templates, size, args.duplicates, args.seed), feed))
+    mb = os.path.getsize(feed) / (1024 * 1024)
+    print(f"\n{size} únicos ({total} no feed, {mb:.1f} MB) gerados em {gen_s:.1f}s")
+
+    if "sort" in args.stages:
+        if args.pandas:
+            elapsed, rss = run_measured([sys.executable, PANDAS_SCRIPT], work)
+            rows.append((size, "sort_pandas", elapsed, rss))
+        elapsed, rss = run_measured(
+            [sys.executable, STREAM_SCRIPT, "--input", feed, "--output", sorted_path,
+             "--memory-mb", str(args.memory_mb)], work)
+        rows.append((size, "sort_stream", elapsed, rss))
+
+    # load/query usam a saída do sort; sem ele, o feed gerado serve (ids ainda como texto)
+    source = sorted_path if os.path.exists(sorted_path) else feed
+    if args.mongo and "load" not in args.stages:
+        test_collection(True).drop()
+    for name in ("load", "query"):
+        if name in args.stages:
+            _, rss, metrics = run_stage(name, source, args.mongo, work)
+            rows.extend((size, metric, seconds, rss) for metric, seconds in metrics.items())
+
+    for _, metric, seconds, rss in rows:
+        print(f"  {metric:<18}{seconds:9.3f}s {seconds * 1e6 / size:9.2f} µs/doc  RSS {rss:7.1f} MB")
+    os.remove(feed)
+    if os.path.exists(sorted_path):
+        os.remove(sorted_path)
+    return rows
+
+
+def print_curves(rows, sizes):
+    by_metric = {}
+    for size, metric, seconds, rss in rows:
+        by_metric.setdefault(metric, {})[size] = (seconds, rss)
+
+    print(f"\n{'etapa':<18}" + "".join(f"{s:>14}" for s in sizes) + f"{'expoente':>12}")
+    for metric, points in by_metric.items():
+        cells = "".join(f"{points[s][0]:>13.3f}s" if s in points else f"{'-':>14}" for s in sizes)
+        known = [s for s in sizes if s in points and points[s][0] > 0]
+        slopes = [math.log(points[b][0] / points[a][0]) / math.log(b / a) for a, b in zip(known, known[1:])]
+        exponent = " ".join(f"{x:.2f}" for x in slopes) or "-"
+        print(f"{metric:<18}{cells}{exponent:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Curvas de tempo e memória do pós-processamento por tamanho")
+    parser.add_argument("--sizes", default="10000,50000,100000",
+                        help="tamanhos (registros únicos) separados por vírgula")
+    parser.add_argument("--stages", default="sort,load,query")
+    parser.add_argument("--template", default=os.path.join(ROOT, "..", TEMPLATE_PATH))
+    parser.add_argument("--duplicates", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--memory-mb", type=float, default=64)
+    parser.add_argument("--pandas", action="store_true", help="inclui o sorted_pokedex_pandas.py")
+    parser.add_argument("--mongo", action="store_true", help="usa o MongoDB do .env em vez do mongomock")
+    parser.add_argument("--csv", help="grava as medições (tamanho, etapa, segundos, RSS) em CSV")
+    parser.add_argument("--run-stage", choices=sorted(STAGES), help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        result = STAGES[args.run_stage](args.input, args.mongo)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    args.stages = set(args.stages.split(","))
+    if args.pandas and importlib.util.find_spec("pandas") is None:
+        sys.exit("pandas não instalado")
+    sizes = [int(s) for s in args.sizes.split(",")]
+    templates = list(iter_records(args.template))
+
+    rows = []
+    work = tempfile.mkdtemp(prefix="bench-scale-")
+    try:
+        os.makedirs(os.path.join(work, "data"))
+        for size in sizes:
+            rows += run_size(size, templates, args, work)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print_curves(rows, sizes)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["size", "stage", "seconds", "peak_rss_mb"])
+            writer.writerows(rows)
+        print(f"medições salvas em {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
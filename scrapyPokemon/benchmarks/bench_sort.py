@@ -0,0 +1,90 @@
+# Benchmark do normalize/dedupe/sort: sorted_pokedex_pandas.py vs sorted_pokedex_stream.py
+#
+# Roda cada versão num subprocesso (tempo de parede e pico de RSS do próprio filho)
+# e confere que as duas saídas são idênticas.
+#   python scrapyPokemon/benchmarks/bench_sort.py --copies 20
+
+import argparse
+import filecmp
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PANDAS_SCRIPT = os.path.join(ROOT, "sorted_pokedex_pandas.py")
+STREAM_SCRIPT = os.path.join(ROOT, "sorted_pokedex_stream.py")
+
+
+# Roda o comando e devolve (segundos, pico de RSS em MB) do processo filho
+def run_measured(cmd, cwd):
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        sys.exit(f"Falhou: {' '.join(cmd)}")
+    rss_mb = rusage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return elapsed, rss_mb
+
+
+# Entrada de teste: o feed original repetido N vezes (ids duplicados de propósito)
+def build_input(src, dst, copies):
+    with open(src, "r", encoding="utf-8") as f:
+        lines = [line.rstrip().rstrip(",") for line in f if line.strip() not in ("[", "]", "")]
+    with open(dst, "w", encoding="utf-8") as out:
+        out.write("[\n")
+        total = len(lines) * copies
+        n = 0
+        for _ in range(copies):
+            for line in lines:
+                n += 1
+                out.write(line + (",\n" if n < total else "\n"))
+        out.write("]")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pandas vs streaming no sort da pokedex")
+    parser.add_argument("--input", default="data/pokedex.json")
+    parser.add_argument("--copies", type=int, default=1, help="repete o feed N vezes")
+    parser.add_argument("--memory-mb", type=float, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-sort-") as work:
+        os.makedirs(os.path.join(work, "data"))
+        in_path = os.path.join(work, "data", "pokedex.json")
+        total = build_input(args.input, in_path, args.copies)
+        size_mb = os.path.getsize(in_path) / (1024 * 1024)
+        print(f"entrada: {total} registros, {size_mb:.1f} MB")
+
+        results = {}
+        if importlib.util.find_spec("pandas") is not None:
+            results["pandas"] = run_measured([sys.executable, PANDAS_SCRIPT], work)
+            shutil.move(os.path.join(work, "data", "pokedex_sorted.json"),
+                        os.path.join(work, "pandas.json"))
+        else:
+            print("pandas não instalado, pulando a versão original")
+
+        results["stream"] = run_measured(
+            [sys.executable, STREAM_SCRIPT, "--input", in_path,
+             "--output", os.path.join(work, "stream.json"), "--memory-mb", str(args.memory_mb)],
+            work,
+        )
+
+        for name, (elapsed, rss) in results.items():
+            print(f"{name:<8} {elapsed:8.2f}s  pico RSS {rss:8.1f} MB")
+
+        if "pandas" in results:
+            same = filecmp.cmp(os.path.join(work, "pandas.json"), os.path.join(work, "stream.json"),
+                               shallow=False)
+            print("saídas idênticas" if same else "SAÍDAS DIFERENTES")
+            if not same:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
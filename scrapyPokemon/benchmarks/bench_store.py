@@ -0,0 +1,89 @@
+# Benchmark da pokedex binária (pokedex_store.py) contra o JSON indentado
+#
+# Mede abrir o arquivo + ler um Pokémon (como faz um script que só quer um registro),
+# a latência de cada leitura por id com o arquivo já aberto e a iteração completa.
+# "Abrir" no JSON é o json.load do arquivo inteiro; no binário é só o mmap + cabeçalho.
+#   python scrapyPokemon/benchmarks/bench_store.py --input data/pokedex_sorted.json
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import percentiles  # noqa: E402
+from pokedex_store import PokedexStore, write_store  # noqa: E402
+from sorted_pokedex_stream import iter_records  # noqa: E402
+
+
+def json_open_get(path, pid):
+    with open(path, "r", encoding="utf-8") as f:
+        docs = json.load(f)
+    by_id = {doc.get("id"): doc for doc in docs}
+    return by_id.get(pid)
+
+
+def store_open_get(path, pid):
+    with PokedexStore(path) as store:
+        return store.get(pid)
+
+
+def sample(fn, args):
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def fmt(stats):
+    return "  ".join(f"{k} {v * 1e6:9.1f} µs" for k, v in stats.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs pokedex binária com mmap")
+    parser.add_argument("--input", default="data/pokedex_sorted.json")
+    parser.add_argument("--opens", type=int, default=50)
+    parser.add_argument("--lookups", type=int, default=10000)
+    args = parser.parse_args()
+
+    ids = [doc["id"] for doc in iter_records(args.input) if isinstance(doc.get("id"), int)]
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory(prefix="bench-store-") as work:
+        store_path = os.path.join(work, "pokedex.pdx")
+        write_store(iter_records(args.input), store_path)
+        print(f"JSON {os.path.getsize(args.input) / 1024:.1f} KB, "
+              f"binário {os.path.getsize(store_path) / 1024:.1f} KB, {len(ids)} ids")
+
+        # Abrir + ler um registro
+        targets = [rng.choice(ids) for _ in range(args.opens)]
+        print("\nabrir + 1 leitura")
+        print(f"  json    {fmt(percentiles(sample(lambda pid: json_open_get(args.input, pid), targets)))}")
+        print(f"  binário {fmt(percentiles(sample(lambda pid: store_open_get(store_path, pid), targets)))}")
+
+        # Leituras por id com o arquivo aberto
+        targets = [rng.choice(ids) for _ in range(args.lookups)]
+        by_id = {doc.get("id"): doc for doc in iter_records(args.input)}
+        with PokedexStore(store_path) as store:
+            print("\nleitura por id (já aberto)")
+            print(f"  json    {fmt(percentiles(sample(by_id.get, targets)))}  (dict em memória)")
+            print(f"  binário {fmt(percentiles(sample(store.get, targets)))}")
+
+            start = time.perf_counter()
+            count = sum(1 for _ in store)
+            print(f"\niteração completa do binário: {count} registros em "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+            same = list(store) == list(iter_records(args.input))
+    if not same:
+        sys.exit("ERRO: registros do binário diferentes do JSON")
+
+
+if __name__ == "__main__":
+    main()
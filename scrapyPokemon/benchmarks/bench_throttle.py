@@ -0,0 +1,122 @@
+# Valida o AdaptiveThrottleMiddleware contra o servidor local com latência dependente da carga
+#
+# Sobe o standin_server.py (latência = base + extra por requisição simultânea, 429 com
+# Retry-After acima da capacidade) e roda o spider duas vezes: com o atraso fixo antigo
+# (DOWNLOAD_DELAY=1, uma requisição por vez) e com o throttle adaptativo. Cada crawl roda
+# num subprocesso e devolve as stats; no final compara tempo, 429s e decisões tomadas.
+#   python scrapyPokemon/benchmarks/bench_throttle.py --corpus scrapyPokemon/corpus
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.common import DEFAULT_CORPUS_DIR  # noqa: E402
+
+CONFIGS = {
+    "fixo": {"ADAPTIVE_THROTTLE_ENABLED": False, "DOWNLOAD_DELAY": 1},
+    "adaptativo": {"ADAPTIVE_THROTTLE_ENABLED": True, "DOWNLOAD_DELAY": 1,
+                   "ADAPTIVE_THROTTLE_MIN_DELAY": 0, "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 16,
+                   "CONCURRENT_REQUESTS": 32, "ADAPTIVE_THROTTLE_WINDOW": 5},
+}
+
+
+# Roda um crawl neste processo e grava as stats em JSON (chamado via subprocesso)
+def run_one(base_url, overrides, stats_path):
+    os.chdir(ROOT)
+    os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "scrapyPokemon.settings")
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    settings.setdict({
+        "ROBOTSTXT_OBEY": False,
+        "ABILITY_STORE_PATH": None,
+        "LOG_LEVEL": "WARNING",
+        **overrides,
+    }, priority="cmdline")
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler("pokemon")
+    process.crawl(crawler, base_url=base_url)
+    process.start()
+
+    stats = crawler.stats.get_stats()
+    stats["elapsed_time_seconds"] = (stats["finish_time"] - stats["start_time"]).total_seconds()
+    with open(stats_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, default=str)
+
+
+def crawl(base_url, overrides):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        stats_path = tmp.name
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-one", base_url,
+             json.dumps(overrides), stats_path],
+            check=True,
+        )
+        with open(stats_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(stats_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="atraso fixo vs throttle adaptativo no servidor local")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-per-request", type=float, default=0.03)
+    parser.add_argument("--capacity", type=int, default=6)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--only", choices=list(CONFIGS), default=None)
+    args = parser.parse_args()
+
+    from benchmarks.standin_server import make_server
+
+    server = make_server(args.port, args.corpus, latency=args.latency,
+                         latency_per_request=args.latency_per_request,
+                         capacity=args.capacity, retry_after=args.retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"servidor: latência {args.latency * 1000:.0f} ms + {args.latency_per_request * 1000:.0f} ms "
+          f"por requisição simultânea, 429 acima de {args.capacity} (Retry-After {args.retry_after}s)")
+
+    ok = True
+    try:
+        for name, overrides in CONFIGS.items():
+            if args.only and name != args.only:
+                continue
+            server.counts.clear()
+            server.peak_in_flight = 0
+            stats = crawl(base_url, overrides)
+            items = stats.get("item_scraped_count", 0)
+            print(f"\n== {name} ==")
+            print(f"  {stats['elapsed_time_seconds']:.1f}s, {items} itens, "
+                  f"pico de {server.peak_in_flight} requisições simultâneas no servidor")
+            print(f"  respostas do servidor: {dict(sorted(server.counts.items()))}")
+            for key in sorted(stats):
+                if key.startswith("throttle/") or key.startswith("retry/"):
+                    print(f"  {key}: {stats[key]}")
+            if name == "adaptativo" and stats.get("retry/max_reached"):
+                print("  ERRO: requisições desistiram por 429 mesmo com Retry-After")
+                ok = False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--run-one":
+        run_one(sys.argv[2], json.loads(sys.argv[3]), sys.argv[4])
+    else:
+        main()
@@ -0,0 +1,109 @@
+# Utilidades compartilhadas pelos benchmarks
+
+import json
+import os
+import resource
+import sys
+import time
+
+from scrapy.http import Headers, HtmlResponse, Request
+
+from scrapyPokemon.corpus import iter_pages
+
+DEFAULT_CORPUS_DIR = "scrapyPokemon/corpus"
+
+
+# Classifica a página pelo caminho da URL
+def page_kind(url: str) -> str:
+    if "/pokedex/all" in url:
+        return "all"
+    if "/pokedex/" in url:
+        return "detail"
+    if "/ability/" in url:
+        return "ability"
+    return "other"
+
+
+# Carrega as páginas do corpus agrupadas por tipo: {"all": [...], "detail": [...], ...}
+def load_corpus(corpus_dir=DEFAULT_CORPUS_DIR, limit=None):
+    if not os.path.isdir(corpus_dir):
+        sys.exit(f"Corpus não encontrado em {corpus_dir}. "
+                 f"Grave um com: scrapy crawl pokemon -s POKEDEX_CORPUS_MODE=record")
+    pages = {"all": [], "detail": [], "ability": [], "other": []}
+    for page in iter_pages(corpus_dir):
+        kind = page_kind(page["url"])
+        if limit is None or len(pages[kind]) < limit:
+            pages[kind].append(page)
+    return pages
+
+
+# Cria uma resposta nova (sem seletor em cache) a partir de uma página do corpus
+def make_response(page, **request_kwargs):
+    return HtmlResponse(
+        url=page["url"],
+        status=page["status"],
+        headers=Headers(page["headers"]),
+        body=page["body"],
+        encoding="utf-8",
+        request=Request(page["url"], **request_kwargs),
+    )
+
+
+# Percentis simples (nearest-rank) de uma lista de amostras em segundos
+def percentiles(samples, points=(50, 90, 99)):
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    out = {}
+    for p in points:
+        idx = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        out[f"p{p}"] = ordered[idx]
+    out["max"] = ordered[-1]
+    return out
+
+
+# Mede o tempo de cada chamada de fn(arg) e devolve a lista de amostras
+def time_calls(fn, args):
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# Pico de memória residente do processo em MB (ru_maxrss é KB no Linux e bytes no macOS)
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss / (1024 * 1024)
+    return rss / 1024
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+# Compara métricas "quanto menor melhor" com a baseline; retorna as regressões
+def compare_with_baseline(current, baseline, tolerance):
+    regressions = []
+    for name, metrics in current.items():
+        base = (baseline or {}).get(name)
+        if not isinstance(metrics, dict) or not isinstance(base, dict):
+            continue
+        for key in ("p50", "p90"):
+            now, before = metrics.get(key), base.get(key)
+            if not now or not before:
+                continue
+            ratio = now / before
+            if ratio > 1 + tolerance:
+                regressions.append((name, key, before, now, ratio))
+    return regressions
@@ -0,0 +1,165 @@
+# Servidor HTTP local que faz o papel do pokemondb.net a partir de um corpus gravado
+#
+# Responde com ETag/Last-Modified e devolve 304 para requisições condicionais, o que
+# permite testar o recrawl incremental sem tocar no site real. As páginas de --changed
+# ganham uma revisão nova a cada requisição (corpo, ETag e Last-Modified diferentes),
+# então parecem alteradas em todo crawl, não só no primeiro:
+#   python scrapyPokemon/benchmarks/standin_server.py --port 8000 --changed bulbasaur,eevee
+#   cd scrapyPokemon && scrapy crawl pokemon -a base_url=http://127.0.0.1:8000 \
+#       -s INCREMENTAL_ENABLED=True -s ROBOTSTXT_OBEY=False -s DOWNLOAD_DELAY=0
+#
+# Também simula carga: cada resposta demora --latency + --latency-per-request vezes o
+# número de requisições em andamento, e acima de --capacity simultâneas responde 429
+# com Retry-After (usado pelo bench_throttle.py).
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_CORPUS_DIR  # noqa: E402
+from scrapyPokemon.corpus import load_page  # noqa: E402
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "pokedex-standin"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            load = server.in_flight
+            server.peak_in_flight = max(server.peak_in_flight, load)
+        try:
+            if server.capacity and load > server.capacity:
+                self.reply(429, {"Content-Type": "text/plain", "Retry-After": str(server.retry_after)},
+                           b"too many requests")
+                return
+            latency = server.latency + server.latency_per_request * (load - 1)
+            if latency > 0:
+                time.sleep(latency)
+            self.serve_page()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def serve_page(self):
+        server = self.server
+        page = load_page(server.corpus_dir, server.origin + self.path)
+        if page is None:
+            self.reply(404, {"Content-Type": "text/plain"}, b"not found")
+            return
+
+        body = page["body"]
+        # Páginas "alteradas" ganham um comentário com a revisão, mudando conteúdo e ETag
+        slug = self.path.rstrip("/").split("/")[-1]
+        changed = slug in server.changed
+        if changed:
+            with server.lock:
+                server.revisions[slug] += 1
+                revision = server.revisions[slug]
+            body += b"<!-- changed %d -->" % revision
+
+        headers = {"Content-Type": (page["headers"].get("Content-Type") or ["text/html"])[0]}
+        if server.use_etag:
+            headers["ETag"] = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if server.use_last_modified:
+            headers["Last-Modified"] = formatdate(usegmt=True) if changed else server.started_at
+
+        if server.use_etag and self.headers.get("If-None-Match") == headers.get("ETag"):
+            self.reply(304, headers, b"")
+            return
+        if (server.use_last_modified and not changed
+                and self.headers.get("If-Modified-Since") == server.started_at):
+            self.reply(304, headers, b"")
+            return
+
+        self.reply(page["status"], headers, body)
+
+    def reply(self, status, headers, body):
+        with self.server.lock:
+            self.server.counts[status] += 1
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(port, corpus_dir=DEFAULT_CORPUS_DIR, origin="https://pokemondb.net", changed=(),
+                use_etag=True, use_last_modified=True, verbose=False,
+                latency=0.0, latency_per_request=0.0, capacity=0, retry_after=1):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+    server.corpus_dir = corpus_dir
+    server.origin = origin.rstrip("/")
+    server.changed = set(changed)
+    server.revisions = Counter()
+    server.use_etag = use_etag
+    server.use_last_modified = use_last_modified
+    server.verbose = verbose
+    server.latency = latency
+    server.latency_per_request = latency_per_request
+    server.capacity = capacity
+    server.retry_after = retry_after
+    server.in_flight = 0
+    server.peak_in_flight = 0
+    server.started_at = formatdate(usegmt=True)
+    server.counts = Counter()
+    server.lock = threading.Lock()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pokemondb.net local a partir do corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--origin", default="https://pokemondb.net")
+    parser.add_argument("--changed", default="", help="slugs que devem parecer alterados, separados por vírgula")
+    parser.add_argument("--no-etag", action="store_true")
+    parser.add_argument("--no-last-modified", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0, help="latência base em segundos")
+    parser.add_argument("--latency-per-request", type=float, default=0.0,
+                        help="latência extra por requisição simultânea")
+    parser.add_argument("--capacity", type=int, default=0,
+                        help="acima de N requisições simultâneas responde 429 (0 = sem limite)")
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    server = make_server(
+        args.port, args.corpus, args.origin,
+        changed=[s for s in args.changed.split(",") if s],
+        use_etag=not args.no_etag,
+        use_last_modified=not args.no_last_modified,
+        verbose=args.verbose,
+        latency=args.latency,
+        latency_per_request=args.latency_per_request,
+        capacity=args.capacity,
+        retry_after=args.retry_after,
+    )
+    print(f"Servindo {args.corpus} em http://127.0.0.1:{args.port} (Ctrl+C para parar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Respostas por status:", dict(server.counts))
+        print("Pico de requisições simultâneas:", server.peak_in_flight)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#pip install numpy
+
+# Matriz numérica de efetividade (N Pokémon x 18 tipos de ataque) com consultas vetorizadas
+#
+# Guarda os multiplicadores reais em float16 (0, ¼, ½, 1, 1½, 2, 4... são exatos)
+# num .npz ao lado dos registros; os rótulos em português só saem em labels().
+# Uma linha por registro: as formas (Mega, regionais) têm linha própria, identificada
+# por (id, forma), com forma "" na forma base.
+#
+# python scrapyPokemon/effectiveness_matrix.py build
+# python scrapyPokemon/effectiveness_matrix.py takes Ice 4
+# python scrapyPokemon/effectiveness_matrix.py weakest Fire --top 10
+# python scrapyPokemon/effectiveness_matrix.py coverage 6 130 143
+
+import argparse
+
+import numpy as np
+
+from scrapyPokemon.pokemon_types import ATTACK_TYPES, effectiveness_label, label_to_multiplier
+from sorted_pokedex_stream import iter_records
+
+JSON_PATH = "data/pokedex_sorted.json"
+MATRIX_PATH = "data/pokedex_effectiveness.npz"
+
+TYPE_INDEX = {t: i for i, t in enumerate(ATTACK_TYPES)}
+
+OPERATORS = {
+    "==": np.equal, "!=": np.not_equal,
+    ">": np.greater, ">=": np.greater_equal,
+    "<": np.less, "<=": np.less_equal,
+}
+
+
+class EffectivenessMatrix:
+    def __init__(self, ids, names, matrix, forms=None):
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.names = np.asarray(names, dtype=object)
+        self.forms = np.asarray(forms if forms is not None else [""] * len(self.ids), dtype=object)
+        self.matrix = np.asarray(matrix, dtype=np.float16)
+        self._row_of = {(int(pid), form): i for i, (pid, form) in enumerate(zip(self.ids, self.forms))}
+
+    # Monta a matriz a partir dos registros (aceita multiplicadores ou rótulos antigos)
+    @classmethod
+    def from_records(cls, records):
+        ids, names, forms, rows = [], [], [], []
+        for doc in records:
+            effectiveness = doc.get("effectiveness") or {}
+            row = []
+            for t in ATTACK_TYPES:
+                value = effectiveness.get(t, 1.0)
+                row.append(label_to_multiplier(value) if isinstance(value, str) else value)
+            ids.append(int(doc["id"]))
+            # a forma aparece pelo próprio nome nas saídas ("Mega Venusaur")
+            names.append(doc.get("form") or doc.get("name"))
+            forms.append(doc.get("form") or "")
+            rows.append(row)
+        matrix = np.array(rows, dtype=np.float16).reshape(len(rows), len(ATTACK_TYPES))
+        return cls(ids, names, matrix, forms)
+
+    @classmethod
+    def load(cls, path=MATRIX_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            forms = data["forms"].astype(object) if "forms" in data else None
+            return cls(data["ids"], data["names"].astype(object), data["matrix"], forms)
+
+    def save(self, path=MATRIX_PATH):
+        np.savez_compressed(path, ids=self.ids, names=self.names.astype(str), forms=self.forms.astype(str),
+                            matrix=self.matrix)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def column(self, attack_type):
+        return self.matrix[:, TYPE_INDEX[attack_type]]
+
+    # Linha de um id (forma base) ou de um (id, forma); None se não existe
+    def row_index(self, key):
+        pid, form = key if isinstance(key, tuple) else (key, None)
+        return self._row_of.get((int(pid), form or ""))
+
+    def _row(self, key):
+        index = self.row_index(key)
+        if index is None:
+            raise KeyError(key)
+        return index
+
+    def row(self, pokemon_id):
+        return self.matrix[self._row(pokemon_id)]
+
+    # Máscara booleana de uma condição, ex.: mask("Ice", ">=", 2)
+    def mask(self, attack_type, op, value):
+        return OPERATORS[op](self.column(attack_type), value)
+
+    # Filtro em lote: todas as condições [(tipo, op, valor), ...] ao mesmo tempo
+    def filter(self, conditions):
+        selected = np.ones(len(self), dtype=bool)
+        for attack_type, op, value in conditions:
+            selected &= self.mask(attack_type, op, value)
+        return self._pairs(np.flatnonzero(selected))
+
+    # Quem recebe exatamente `multiplier` de dano do tipo (ex.: 4x de Ice)
+    def takes(self, attack_type, multiplier):
+        return self.filter([(attack_type, "==", multiplier)])
+
+    # Mais fracos contra o tipo (maior multiplicador primeiro)
+    def weakest_to(self, attack_type, top=10):
+        col = self.column(attack_type).astype(np.float32)
+        order = np.argsort(-col, kind="stable")[:top]
+        return [(*pair, float(col[i])) for pair, i in zip(self._pairs(order), order)]
+
+    # Resistentes (multiplicador < 1, inclui imunes)
+    def resistant_to(self, attack_type):
+        return self.filter([(attack_type, "<", 1)])
+
+    def immune_to(self, attack_type):
+        return self.takes(attack_type, 0)
+
+    # Cobertura defensiva de um time: por tipo de ataque, quantos membros são
+    # fracos (> 1) e quantos resistem (< 1), e o melhor multiplicador do time.
+    # Pontuação = tipos que alguém resiste - tipos em que mais gente é fraca do que resiste.
+    def team_coverage(self, team_ids):
+        team = self.matrix[[self._row(pid) for pid in team_ids]].astype(np.float32)
+        weak = (team > 1).sum(axis=0)
+        resist = (team < 1).sum(axis=0)
+        best = team.min(axis=0)
+        per_type = {
+            t: {"weak": int(weak[i]), "resist": int(resist[i]), "best": float(best[i])}
+            for i, t in enumerate(ATTACK_TYPES)
+        }
+        score = int((resist > 0).sum() - (weak > resist).sum())
+        return {"score": score, "types": per_type}
+
+    # Rótulos em português de um Pokémon (só para saída)
+    def labels(self, pokemon_id):
+        return {t: effectiveness_label(m) for t, m in zip(ATTACK_TYPES, self.row(pokemon_id))}
+
+    def _pairs(self, rows):
+        return [(int(self.ids[i]), self.names[i]) for i in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas na matriz de efetividade")
+    parser.add_argument("--matrix", default=MATRIX_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="gera a matriz a partir do JSON")
+    build.add_argument("--input", default=JSON_PATH)
+
+    takes = sub.add_parser("takes", help="quem recebe exatamente N x do tipo")
+    takes.add_argument("type")
+    takes.add_argument("multiplier", type=float)
+
+    weakest = sub.add_parser("weakest", help="mais fracos contra o tipo")
+    weakest.add_argument("type")
+    weakest.add_argument("--top", type=int, default=10)
+
+    resistant = sub.add_parser("resistant", help="quem resiste ao tipo")
+    resistant.add_argument("type")
+
+    coverage = sub.add_parser("coverage", help="cobertura defensiva de um time (ids)")
+    coverage.add_argument("ids", type=int, nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        matrix = EffectivenessMatrix.from_records(iter_records(args.input))
+        matrix.save(args.matrix)
+        print(f"Matriz {matrix.matrix.shape} salva em {args.matrix}")
+        return
+
+    matrix = EffectivenessMatrix.load(args.matrix)
+    if args.command == "takes":
+        result = matrix.takes(args.type, args.multiplier)
+    elif args.command == "weakest":
+        result = matrix.weakest_to(args.type, args.top)
+    elif args.command == "resistant":
+        result = matrix.resistant_to(args.type)
+    else:
+        missing = [pid for pid in args.ids if matrix.row_index(pid) is None]
+        if missing:
+            parser.error(f"ids não encontrados: {missing}")
+        result = matrix.team_coverage(args.ids)
+        for t, info in result["types"].items():
+            print(f"{t:<10} fracos={info['weak']} resistem={info['resist']} melhor={info['best']:g}")
+        print(f"pontuação: {result['score']}")
+        return
+
+    for row in result:
+        print(*row)
+    print(f"{len(result)} Pokémon")
+
+
+if __name__ == "__main__":
+    main()
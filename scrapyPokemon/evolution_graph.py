@@ -0,0 +1,217 @@
+# Grafo global de evolução montado depois do crawl a partir dos evolution_stages
+#
+# Cada registro traz o próprio estágio (id_from -> id -> id_to) e os membros da família;
+# aqui tudo vira um único grafo com ids inteiros, adjacência de ida e de volta,
+# profundidade de cada nó (0 = forma base) e a família (componente) a que pertence.
+# O arquivo salvo guarda só nós e arestas; os índices são refeitos na carga.
+#
+# python scrapyPokemon/evolution_graph.py build [--input data/pokedex_sorted.json]
+# python scrapyPokemon/evolution_graph.py family 133
+# python scrapyPokemon/evolution_graph.py into Water --level 30
+
+import argparse
+import json
+import os
+from collections import defaultdict, deque
+
+from scrapyPokemon.items import to_int_id
+from sorted_pokedex_stream import iter_records
+
+JSON_PATH = "data/pokedex_sorted.json"
+GRAPH_PATH = "data/pokedex_evolution_graph.json"
+
+
+class EvolutionGraph:
+    def __init__(self, nodes, edges):
+        # nodes: {id: {"name", "types"}}; edges: {(from_id, to_id): {"level", "method", "item"}}
+        self.nodes = nodes
+        self.edges = edges
+        self.forward = defaultdict(list)
+        self.reverse = defaultdict(list)
+        for from_id, to_id in sorted(edges):
+            self.forward[from_id].append(to_id)
+            self.reverse[to_id].append(from_id)
+
+        self.by_type = defaultdict(set)
+        for pid, node in nodes.items():
+            for t in node.get("types") or []:
+                self.by_type[t].add(pid)
+
+        self.depth = self._depths()
+        self.family_of, self.families = self._families()
+
+    # Junta os estágios de todos os registros (arestas repetidas entre registros se fundem)
+    @classmethod
+    def from_records(cls, records):
+        nodes, edges = {}, {}
+
+        # Nó = espécie: os tipos são os do registro sem "form"; uma forma (Mega, regional)
+        # só preenche os tipos enquanto esse registro não apareceu
+        def add_node(raw_id, name=None, types=None, form=None):
+            pid = to_int_id(raw_id)
+            if pid is None:
+                return None
+            node = nodes.setdefault(pid, {"name": None, "types": None})
+            if name and not node["name"]:
+                node["name"] = name
+            if types is not None and not (form and pid in base_ids):
+                node["types"] = types
+                if not form:
+                    base_ids.add(pid)
+            return pid
+
+        base_ids = set()
+        for doc in records:
+            add_node(doc.get("id"), doc.get("name"), doc.get("types"), doc.get("form"))
+            stages = doc.get("evolution_stages") or []
+            for member in stages:
+                add_node(member.get("id"), member.get("name"))
+            if not stages:
+                continue
+
+            stage = stages[0]
+            pid = add_node(stage.get("id"), stage.get("name"))
+            parent = add_node(stage.get("id_from"), stage.get("from"))
+            if pid is not None and parent is not None:
+                edges.setdefault((parent, pid), {"level": None, "method": None, "item": None})
+
+            targets = zip(stage.get("id_to") or [], stage.get("to") or [], stage.get("level_to") or [],
+                          stage.get("method_evolution") or [], stage.get("item_to") or [])
+            for raw_to, to_name, level, method, item in targets:
+                to_id = add_node(raw_to, to_name)
+                if pid is None or to_id is None:
+                    continue
+                # O estágio da origem é quem tem level/método; ele prevalece sobre o "from" do destino
+                edges[(pid, to_id)] = {"level": level, "method": method, "item": item}
+
+        return cls(nodes, edges)
+
+    @classmethod
+    def load(cls, path=GRAPH_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        nodes = {pid: {"name": name, "types": types} for pid, name, types, *_ in data["nodes"]}
+        edges = {(a, b): {"level": level, "method": method, "item": item}
+                 for a, b, level, method, item in data["edges"]}
+        return cls(nodes, edges)
+
+    # nós: [id, nome, tipos, profundidade, família]; arestas: [de, para, level, método, item]
+    def save(self, path=GRAPH_PATH):
+        data = {
+            "nodes": [[pid, n["name"], n["types"], self.depth[pid], self.family_of[pid]]
+                      for pid, n in sorted(self.nodes.items())],
+            "edges": [[a, b, e["level"], e["method"], e["item"]] for (a, b), e in sorted(self.edges.items())],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # Profundidade = menor distância a partir de uma forma base (nó sem pais)
+    def _depths(self):
+        depth = {}
+        queue = deque()
+        for pid in sorted(self.nodes):
+            if not self.reverse.get(pid):
+                depth[pid] = 0
+                queue.append(pid)
+        while queue:
+            pid = queue.popleft()
+            for child in self.forward.get(pid, ()):
+                if child not in depth:
+                    depth[child] = depth[pid] + 1
+                    queue.append(child)
+        # Nós só alcançáveis por ciclo (não deveria acontecer) ficam na raiz
+        for pid in self.nodes:
+            depth.setdefault(pid, 0)
+        return depth
+
+    # Família = componente conexo ignorando a direção; identificada pelo menor id
+    def _families(self):
+        family_of, families = {}, {}
+        for start in sorted(self.nodes):
+            if start in family_of:
+                continue
+            members, stack = [], [start]
+            family_of[start] = start
+            while stack:
+                pid = stack.pop()
+                members.append(pid)
+                for other in self.forward.get(pid, []) + self.reverse.get(pid, []):
+                    if other not in family_of:
+                        family_of[other] = start
+                        stack.append(other)
+            families[start] = sorted(members)
+        return family_of, families
+
+    def family(self, pid):
+        return self.families.get(self.family_of.get(pid), [])
+
+    def parents(self, pid):
+        return self.reverse.get(pid, [])
+
+    def children(self, pid):
+        return self.forward.get(pid, [])
+
+    def descendants(self, pid):
+        seen, stack = set(), list(self.children(pid))
+        while stack:
+            child = stack.pop()
+            if child not in seen:
+                seen.add(child)
+                stack.extend(self.children(child))
+        return sorted(seen)
+
+    # Arestas que resultam num Pokémon do tipo pedido, opcionalmente com level > min_level
+    def evolves_into(self, type_, min_level=None):
+        out = []
+        for to_id in sorted(self.by_type.get(type_, ())):
+            for from_id in self.reverse.get(to_id, ()):
+                edge = self.edges[(from_id, to_id)]
+                level = edge["level"]
+                if min_level is not None and (level is None or level <= min_level):
+                    continue
+                out.append((from_id, to_id, edge))
+        return out
+
+    def name(self, pid):
+        return self.nodes.get(pid, {}).get("name")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grafo global de evolução da pokedex")
+    parser.add_argument("--graph", default=GRAPH_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="monta o grafo a partir do JSON")
+    build.add_argument("--input", default=JSON_PATH)
+
+    family = sub.add_parser("family", help="família completa de um id")
+    family.add_argument("id", type=int)
+
+    into = sub.add_parser("into", help="evoluções que resultam num tipo")
+    into.add_argument("type")
+    into.add_argument("--level", type=int, default=None, help="só evoluções com level maior que este")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        graph = EvolutionGraph.from_records(iter_records(args.input))
+        graph.save(args.graph)
+        print(f"Grafo salvo em {args.graph}: {len(graph.nodes)} nós, {len(graph.edges)} arestas, "
+              f"{len(graph.families)} famílias")
+        return
+
+    graph = EvolutionGraph.load(args.graph)
+    if args.command == "family":
+        for pid in graph.family(args.id):
+            print(pid, graph.name(pid), "profundidade", graph.depth[pid])
+    else:
+        rows = graph.evolves_into(args.type, args.level)
+        for from_id, to_id, edge in rows:
+            print(f"{graph.name(from_id)} -> {graph.name(to_id)} ({edge['method']})")
+        print(f"{len(rows)} evoluções")
+
+
+if __name__ == "__main__":
+    main()
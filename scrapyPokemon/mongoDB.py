@@ -1,85 +1,51 @@
 #pip install pymongo
 #pip install python-dotenv
 
-import json
 import os
-from dotenv import load_dotenv
-from pymongo import MongoClient
 
-load_dotenv()
-
-mongo_url = os.getenv("MONGODB_URL")
-client = MongoClient(mongo_url)
-
-# banco de dados
-db = client['Pokedex']
-coll = db['pokemon']  # nome da coleção
+from mongo_loader import load_documents, print_stats
+from mongo_summaries import report1, report2a, report2b, update_summaries
+from sorted_pokedex_stream import iter_records
 
 # caminho do JSON já tratado com pandas
 json_path = "data/pokedex_sorted.json"
 
-# carregar arquivo
-with open(json_path, "r", encoding="utf-8") as f:
-    data = json.load(f)
 
-# criar índice para evitar duplicados
-coll.create_index("id", unique=True)
+# pymongo/dotenv só são importados aqui: importar este módulo não conecta no banco
+def main():
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+
+    mongo_url = os.getenv("MONGODB_URL")
+    client = MongoClient(mongo_url)
+
+    # banco de dados
+    db = client['Pokedex']
+    coll = db['pokemon']  # nome da coleção
+
+    # inserir/atualizar em lote (bulk_write por lote, pulando documentos sem mudança);
+    # o loader também cria o índice único em (id, form) para evitar duplicados
+    stats, changed_ids = load_documents(coll, iter_records(json_path))
+    print_stats(stats)
+
+    # atualiza só os resumos dos Pokémon que mudaram nesta carga (mongo_summaries.py);
+    # numa base que já existia antes dos resumos rode uma vez: python scrapyPokemon/mongo_summaries.py rebuild
+    update_summaries(db, changed_ids)
 
-# inserir/atualizar em lote
-for doc in data:
-    coll.update_one({"id": doc["id"]}, {"$set": doc}, upsert=True)
+    #CONSULTAS (leituras diretas nas coleções de resumo, mesmo resultado dos pipelines do mongo_queries.py)
+    print("== Consulta 1: Quantos Pokémon possuem 2 ou mais tipos? ==")
+    print(report1(db))
 
-print(f"{len(data)} documentos inseridos/atualizados em 'Pokedex.pokemon'.")
+    print("\n== Consulta 2-A: Pokémon do tipo Água que evoluem DEPOIS do level 30 (origem) ==")
+    for doc in report2a(db):
+        print(doc)
 
-#CONSULTAS
-print("== Consulta 1: Quantos Pokémon possuem 2 ou mais tipos? ==")
-pipeline1 = [
-    {"$match": {"types": {"$exists": True}}},
-    {"$project": {"n_types": {"$size": "$types"}}},
-    {"$match": {"n_types": {"$gte": 2}}},
-    {"$count": "qtd"}
-]
-print(list(coll.aggregate(pipeline1)))
+    print("\n== Consulta 2-B: Pokémon que RESULTAM em tipo Água após level > 30 (destino) ==")
+    for doc in report2b(db):
+        print(doc)
 
-print("\n== Consulta 2-A: Pokémon do tipo Água que evoluem DEPOIS do level 30 (origem) ==")
-pipeline2a = [
-    {"$match": {"types": "Water"}},
-    {"$unwind": "$evolutions"},
-    {"$match": {"evolutions.level": {"$gt": 30}}},
-    {"$project": {
-        "_id": 0,
-        "Id do Pokemon": "$id",
-        "Nome do Pokemon": "$name",
-        "Evolui para Pokemon do Id": "$evolutions.to_id",
-        "Evolui para o Pokemon de nome": "$evolutions.to_name",
-        "level": "$evolutions.level",
-        "method": "$evolutions.method"
-    }}
-]
-for doc in coll.aggregate(pipeline2a):
-    print(doc)
 
-print("\n== Consulta 2-B: Pokémon que RESULTAM em tipo Água após level > 30 (destino) ==")
-pipeline2b = [
-    {"$unwind": "$evolutions"},
-    {"$match": {"evolutions.level": {"$gt": 30}}},
-    {"$addFields": { "to_id_num": { "$toInt": "$evolutions.to_id" } }}, 
-    {"$lookup": {
-        "from": "pokemon",
-        "localField": "to_id_num",
-        "foreignField": "id",
-        "as": "to_doc"
-    }},
-    {"$unwind": "$to_doc"},
-    {"$match": {"to_doc.types": "Water"}},
-    {"$project": {
-        "_id": 0,
-        "Pokemon evoluido": "$to_doc.name",
-        "Pokemon evoluido de": "$name",
-        "level": "$evolutions.level",
-        "method": "$evolutions.method",
-    }},
-    {"$sort": {"from_name": 1, "level": 1}}
-]
-for doc in coll.aggregate(pipeline2b):
-    print(doc)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
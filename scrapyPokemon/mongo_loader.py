@@ -0,0 +1,140 @@
+#pip install pymongo
+#pip install python-dotenv
+
+# Loader em lote para a coleção Pokedex.pokemon
+#
+# Lê o arquivo registro a registro, calcula um hash do conteúdo de cada documento
+# e, por lote, busca os hashes já gravados: documentos iguais são pulados e os
+# demais viram UpdateOne(upsert=True) num único bulk_write não ordenado.
+# Cada registro é identificado por (id, form): as formas (Mega, regionais) dividem o id
+# com a forma base, que não tem o campo "form".
+#
+# python scrapyPokemon/mongo_loader.py [--input data/pokedex_sorted.json] [--batch-size 500] [--mock] [--summaries]
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from sorted_pokedex_stream import iter_records
+
+JSON_PATH = "data/pokedex_sorted.json"
+HASH_FIELD = "_hash"
+
+
+# Hash estável do documento (chaves ordenadas, sem o próprio campo de hash)
+def content_hash(doc):
+    payload = {k: v for k, v in doc.items() if k not in (HASH_FIELD, "_id")}
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def record_key(doc):
+    return doc["id"], doc.get("form") or None
+
+
+# Filtro de um registro só; "form": None pega a forma base (campo ausente ou nulo)
+def record_filter(doc):
+    return {"id": doc["id"], "form": doc.get("form") or None}
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Grava os documentos em lotes; retorna as estatísticas e os ids alterados (um id
+# aparece uma vez por forma alterada)
+def load_documents(coll, docs, batch_size=500):
+    from pymongo import UpdateOne
+
+    stats = {"total": 0, "skipped": 0, "upserted": 0, "modified": 0, "round_trips": 0}
+    changed_ids = []
+    start = time.perf_counter()
+
+    # Coleções antigas têm o índice único só em "id", que recusaria as formas
+    if "id_1" in coll.index_information():
+        coll.drop_index("id_1")
+        stats["round_trips"] += 1
+    coll.create_index([("id", 1), ("form", 1)], unique=True)
+    stats["round_trips"] += 2
+
+    for batch in batched(docs, batch_size):
+        stats["total"] += len(batch)
+        hashes = {record_key(doc): content_hash(doc) for doc in batch}
+
+        # Um find por lote para saber o que já está igual no banco
+        ids = list(dict.fromkeys(doc["id"] for doc in batch))
+        stored = {
+            record_key(d): d.get(HASH_FIELD)
+            for d in coll.find({"id": {"$in": ids}}, {"_id": 0, "id": 1, "form": 1, HASH_FIELD: 1})
+        }
+        stats["round_trips"] += 1
+
+        ops = []
+        for doc in batch:
+            h = hashes[record_key(doc)]
+            if stored.get(record_key(doc)) == h:
+                stats["skipped"] += 1
+                continue
+            ops.append(UpdateOne(record_filter(doc), {"$set": {**doc, HASH_FIELD: h}}, upsert=True))
+            changed_ids.append(doc["id"])
+
+        if ops:
+            result = coll.bulk_write(ops, ordered=False)
+            stats["round_trips"] += 1
+            stats["upserted"] += result.upserted_count
+            stats["modified"] += result.modified_count
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["docs_per_sec"] = stats["total"] / stats["seconds"] if stats["seconds"] else None
+    return stats, changed_ids
+
+
+def get_collection(mock=False):
+    if mock:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        from dotenv import load_dotenv
+        from pymongo import MongoClient
+        load_dotenv()
+        client = MongoClient(os.getenv("MONGODB_URL"))
+    return client["Pokedex"]["pokemon"]
+
+
+def print_stats(stats):
+    rate = f"{stats['docs_per_sec']:.0f}" if stats["docs_per_sec"] else "-"
+    print(f"{stats['total']} documentos lidos: {stats['upserted']} inseridos, "
+          f"{stats['modified']} atualizados, {stats['skipped']} sem mudança")
+    print(f"{stats['seconds']:.2f}s ({rate} docs/s), {stats['round_trips']} idas ao banco")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carrega a pokedex no MongoDB em lotes")
+    parser.add_argument("--input", default=JSON_PATH)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--mock", action="store_true", help="usa mongomock em memória (sem servidor)")
+    parser.add_argument("--summaries", action="store_true",
+                        help="atualiza as coleções de resumo (mongo_summaries.py) com os ids alterados")
+    args = parser.parse_args(argv)
+
+    coll = get_collection(args.mock)
+    stats, changed_ids = load_documents(coll, iter_records(args.input), args.batch_size)
+    print_stats(stats)
+    if args.summaries:
+        from mongo_summaries import update_summaries
+
+        summary = update_summaries(coll.database, changed_ids, coll.name)
+        print(f"resumos atualizados para {summary['changed']} Pokémon ({summary['edges']} arestas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Pipelines de agregação usados no mongoDB.py (e comparados no benchmark do pokedex_index.py)
+
+# Consulta 1: Quantos Pokémon possuem 2 ou mais tipos?
+pipeline1 = [
+    {"$match": {"types": {"$exists": True}}},
+    {"$project": {"n_types": {"$size": "$types"}}},
+    {"$match": {"n_types": {"$gte": 2}}},
+    {"$count": "qtd"}
+]
+
+# Consulta 2-A: Pokémon do tipo Água que evoluem DEPOIS do level 30 (origem)
+pipeline2a = [
+    {"$match": {"types": "Water"}},
+    {"$unwind": "$evolutions"},
+    {"$match": {"evolutions.level": {"$gt": 30}}},
+    {"$project": {
+        "_id": 0,
+        "Id do Pokemon": "$id",
+        "Nome do Pokemon": "$name",
+        "Evolui para Pokemon do Id": "$evolutions.to_id",
+        "Evolui para o Pokemon de nome": "$evolutions.to_name",
+        "level": "$evolutions.level",
+        "method": "$evolutions.method"
+    }}
+]
+
+# Consulta 2-B: Pokémon que RESULTAM em tipo Água após level > 30 (destino)
+pipeline2b = [
+    {"$unwind": "$evolutions"},
+    {"$match": {"evolutions.level": {"$gt": 30}}},
+    {"$addFields": { "to_id_num": { "$toInt": "$evolutions.to_id" } }}, 
+    {"$lookup": {
+        "from": "pokemon",
+        "localField": "to_id_num",
+        "foreignField": "id",
+        "as": "to_doc"
+    }},
+    {"$unwind": "$to_doc"},
+    # o destino da evolução é a forma base (as formas dividem o id com ela)
+    {"$match": {"to_doc.form": None, "to_doc.types": "Water"}},
+    {"$project": {
+        "_id": 0,
+        "Pokemon evoluido": "$to_doc.name",
+        "Pokemon evoluido de": "$name",
+        "level": "$evolutions.level",
+        "method": "$evolutions.method",
+    }},
+    {"$sort": {"from_name": 1, "level": 1}}
+]
@@ -0,0 +1,306 @@
+#pip install pymongo
+
+# Coleções de resumo das consultas do mongoDB.py, mantidas a cada carga
+#
+# Em vez de refazer $unwind/$lookup/$count na coleção inteira a cada relatório:
+#   summary_members          registro -> nome e tipos como estão nos resumos (base do incremental)
+#   summary_type_counts      quantidade de tipos -> quantos Pokémon            (consulta 1)
+#   summary_type_rosters     tipo -> membros [{"id", "name"}] (+ "form" nas formas)
+#   summary_evolution_edges  uma linha por evolução, com os tipos da origem e do destino
+#                            e o level, indexada por (from_types, level) e (to_types, level)
+#                                                                            (consultas 2-A e 2-B)
+# Cada registro é um (id, form) como no mongo_loader; o destino de uma evolução é sempre a
+# forma base. update_summaries recebe os ids que o mongo_loader inseriu/alterou e refaz os
+# registros desses ids, de todas as formas (e as arestas que apontam para eles). rebuild recalcula tudo a partir da coleção, mostra o que
+# divergia e confere os relatórios contra os pipelines de agregação; rode uma vez numa
+# coleção que já existia antes dos resumos.
+#
+# python scrapyPokemon/mongo_summaries.py rebuild
+# python scrapyPokemon/mongo_summaries.py report 2a
+# python scrapyPokemon/mongo_summaries.py report roster --type Water
+# python scrapyPokemon/mongo_summaries.py --mock --input data/pokedex_sorted.json rebuild
+
+import argparse
+from collections import Counter, defaultdict
+
+from mongo_loader import record_filter
+from scrapyPokemon.items import to_int_id
+
+MEMBERS = "summary_members"
+TYPE_COUNTS = "summary_type_counts"
+ROSTERS = "summary_type_rosters"
+EDGES = "summary_evolution_edges"
+SUMMARY_FIELDS = {"_id": 0, "id": 1, "form": 1, "name": 1, "types": 1, "evolutions": 1}
+
+
+# _id do registro nos resumos: o id na forma base, "id#forma" nas demais
+def member_key(doc):
+    return f"{doc['id']}#{doc['form']}" if doc.get("form") else doc["id"]
+
+
+def member_of(doc):
+    types = doc.get("types")
+    member = {"_id": member_key(doc), "id": doc["id"]}
+    if doc.get("form"):
+        member["form"] = doc["form"]
+    member.update({
+        "name": doc.get("name"),
+        "types": list(types) if types is not None else None,
+        "n_types": len(types) if types is not None else None,
+    })
+    return member
+
+
+def roster_entry(member):
+    entry = {"id": member["id"], "name": member["name"]}
+    if member.get("form"):
+        entry["form"] = member["form"]
+    return entry
+
+
+# Arestas de um Pokémon; targets: id numérico -> membro do destino (o $lookup do 2-B)
+def edges_of(doc, targets):
+    edges = []
+    for i, evo in enumerate(doc.get("evolutions") or []):
+        to_id_num = to_int_id(evo.get("to_id"))
+        target = targets.get(to_id_num)
+        edges.append({
+            "_id": f"{member_key(doc)}:{i}",
+            "from_id": doc["id"],
+            "index": i,
+            "from_name": doc.get("name"),
+            "from_types": list(doc.get("types") or []),
+            "to_id": evo.get("to_id"),
+            "to_id_num": to_id_num,
+            "to_name": evo.get("to_name"),
+            "level": evo.get("level"),
+            "method": evo.get("method"),
+            "to_doc_name": target["name"] if target else None,
+            "to_types": (target["types"] or []) if target else [],
+        })
+    return edges
+
+
+def ensure_indexes(db):
+    edges = db[EDGES]
+    edges.create_index([("from_types", 1), ("level", 1)])
+    edges.create_index([("to_types", 1), ("level", 1)])
+    edges.create_index("from_id")
+    edges.create_index("to_id_num")
+
+
+def fetch_targets(coll, docs):
+    wanted = {to_int_id(evo.get("to_id")) for doc in docs for evo in doc.get("evolutions") or []}
+    wanted.discard(None)
+    query = {"id": {"$in": list(wanted)}, "form": None}
+    return {d["id"]: member_of(d) for d in coll.find(query, {"_id": 0, "id": 1, "name": 1, "types": 1})}
+
+
+# Atualiza os resumos para os ids alterados na carga (mongo_loader.load_documents)
+def update_summaries(db, changed_ids, collection="pokemon"):
+    from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+
+    changed = list(dict.fromkeys(changed_ids))
+    stats = {"changed": len(changed), "edges": 0}
+    if not changed:
+        return stats
+    coll = db[collection]
+    ensure_indexes(db)
+
+    docs = {member_key(d): d for d in coll.find({"id": {"$in": changed}}, SUMMARY_FIELDS)}
+    previous = {m["_id"]: m for m in db[MEMBERS].find({"id": {"$in": changed}})}
+    targets = fetch_targets(coll, docs.values())
+
+    count_delta = Counter()
+    pulls, adds, members, refresh = [], [], [], []
+    for key in dict.fromkeys([*docs, *previous]):
+        old = previous.get(key)
+        new = member_of(docs[key]) if key in docs else None
+        if old == new:
+            continue
+        if old is not None:
+            if old["n_types"] is not None:
+                count_delta[old["n_types"]] -= 1
+            for t in old["types"] or []:
+                pulls.append(UpdateOne({"_id": t}, {"$pull": {"members": record_filter(old)}}))
+        if new is None:
+            members.append(DeleteOne({"_id": key}))
+            continue
+        if new["n_types"] is not None:
+            count_delta[new["n_types"]] += 1
+        for t in new["types"] or []:
+            adds.append(UpdateOne({"_id": t}, {"$addToSet": {"members": roster_entry(new)}}, upsert=True))
+        members.append(ReplaceOne({"_id": key}, new, upsert=True))
+        # Arestas de quem evolui para este Pokémon enxergam o nome e os tipos novos da forma base
+        if "form" not in new:
+            refresh.append(UpdateMany({"to_id_num": new["id"]}, {"$set": {"to_doc_name": new["name"],
+                                                                           "to_types": new["types"] or []}}))
+
+    counts = [UpdateOne({"_id": n}, {"$inc": {"count": d}}, upsert=True) for n, d in count_delta.items() if d]
+    if counts:
+        db[TYPE_COUNTS].bulk_write(counts, ordered=False)
+    if pulls or adds:
+        db[ROSTERS].bulk_write(pulls + adds, ordered=True)  # tira antes de pôr (nome pode ter mudado)
+
+    edge_ops = [DeleteMany({"from_id": {"$in": changed}})]
+    for doc in docs.values():
+        for edge in edges_of(doc, targets):
+            edge_ops.append(InsertOne(edge))
+    stats["edges"] = len(edge_ops) - 1
+    db[EDGES].bulk_write(edge_ops, ordered=True)
+    if refresh:
+        db[EDGES].bulk_write(refresh, ordered=False)
+    if members:
+        db[MEMBERS].bulk_write(members, ordered=False)
+    return stats
+
+
+# Estado esperado dos resumos, calculado do zero a partir da coleção inteira
+def build_expected(docs):
+    docs = [d for d in docs if "id" in d]
+    targets = {d["id"]: member_of(d) for d in docs if isinstance(d["id"], int) and not d.get("form")}
+    members = {member_key(d): member_of(d) for d in docs}
+    counts = Counter(m["n_types"] for m in members.values() if m["n_types"] is not None)
+    rosters = defaultdict(list)
+    for m in members.values():
+        for t in m["types"] or []:
+            rosters[t].append(roster_entry(m))
+    edges = [edge for d in docs for edge in edges_of(d, targets)]
+    return {
+        MEMBERS: list(members.values()),
+        TYPE_COUNTS: [{"_id": n, "count": c} for n, c in counts.items()],
+        ROSTERS: [{"_id": t, "members": ms} for t, ms in rosters.items()],
+        EDGES: edges,
+    }
+
+
+# Forma comparável de cada coleção (ordem dos membros e contagens zeradas não importam)
+def canonical_summary(name, docs):
+    out = {}
+    for doc in docs:
+        doc = dict(doc)
+        if name == ROSTERS:
+            doc["members"] = sorted((m["id"], m.get("form") or "", m["name"]) for m in doc.get("members") or [])
+            if not doc["members"]:
+                continue
+        if name == TYPE_COUNTS and not doc.get("count"):
+            continue
+        out[doc["_id"]] = doc
+    return out
+
+
+# Diferenças por coleção: (faltando, sobrando, diferentes)
+def diff_summaries(db, expected):
+    diffs = {}
+    for name, docs in expected.items():
+        want = canonical_summary(name, docs)
+        have = canonical_summary(name, db[name].find())
+        missing = [k for k in want if k not in have]
+        extra = [k for k in have if k not in want]
+        changed = [k for k in want if k in have and want[k] != have[k]]
+        diffs[name] = (missing, extra, changed)
+    return diffs
+
+
+def rebuild(db, collection="pokemon"):
+    expected = build_expected(db[collection].find({}, SUMMARY_FIELDS))
+    diffs = diff_summaries(db, expected)
+    for name, docs in expected.items():
+        db[name].drop()
+        if docs:
+            db[name].insert_many(docs)
+    ensure_indexes(db)
+    return diffs
+
+
+# Relatórios lidos dos resumos, no mesmo formato dos pipelines do mongo_queries.py
+def report1(db, min_types=2):
+    total = sum(d["count"] for d in db[TYPE_COUNTS].find({"_id": {"$gte": min_types}}))
+    return [{"qtd": total}] if total else []
+
+
+def report2a(db, type_name="Water", level=30):
+    rows = db[EDGES].find({"from_types": type_name, "level": {"$gt": level}}).sort([("from_id", 1), ("index", 1)])
+    return [{
+        "Id do Pokemon": e["from_id"],
+        "Nome do Pokemon": e["from_name"],
+        "Evolui para Pokemon do Id": e["to_id"],
+        "Evolui para o Pokemon de nome": e["to_name"],
+        "level": e["level"],
+        "method": e["method"],
+    } for e in rows]
+
+
+def report2b(db, type_name="Water", level=30):
+    rows = db[EDGES].find({"to_types": type_name, "level": {"$gt": level}}).sort(
+        [("level", 1), ("from_id", 1), ("index", 1)])
+    return [{
+        "Pokemon evoluido": e["to_doc_name"],
+        "Pokemon evoluido de": e["from_name"],
+        "level": e["level"],
+        "method": e["method"],
+    } for e in rows]
+
+
+def roster(db, type_name):
+    doc = db[ROSTERS].find_one({"_id": type_name}) or {}
+    return sorted(doc.get("members") or [], key=lambda m: m["id"])
+
+
+REPORTS = {"1": report1, "2a": report2a, "2b": report2b}
+
+
+def canonical(rows):
+    return sorted(tuple(sorted(row.items())) for row in rows)
+
+
+# Confere os relatórios dos resumos contra as agregações completas
+def check_reports(db, collection="pokemon"):
+    from mongo_queries import pipeline1, pipeline2a, pipeline2b
+
+    pipelines = {"1": pipeline1, "2a": pipeline2a, "2b": pipeline2b}
+    return {name: canonical(REPORTS[name](db)) == canonical(db[collection].aggregate(pipelines[name]))
+            for name in REPORTS}
+
+
+def main(argv=None):
+    from mongo_loader import get_collection, load_documents
+    from sorted_pokedex_stream import iter_records
+
+    parser = argparse.ArgumentParser(description="Resumos materializados das consultas do mongoDB.py")
+    parser.add_argument("--mock", action="store_true", help="usa mongomock em memória (carrega --input antes)")
+    parser.add_argument("--input", default="data/pokedex_sorted.json")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="recalcula tudo, mostra divergências e confere os relatórios")
+    report = sub.add_parser("report", help="lê um relatório dos resumos")
+    report.add_argument("name", choices=sorted(REPORTS) + ["roster"])
+    report.add_argument("--type", default="Water")
+    args = parser.parse_args(argv)
+
+    coll = get_collection(args.mock)
+    db = coll.database
+    if args.mock:
+        _, changed = load_documents(coll, iter_records(args.input))
+        update_summaries(db, changed)
+
+    if args.command == "report":
+        rows = roster(db, args.type) if args.name == "roster" else REPORTS[args.name](db, **(
+            {"type_name": args.type} if args.name != "1" else {}))
+        for row in rows:
+            print(row)
+        return
+
+    diffs = rebuild(db, coll.name)
+    for name, (missing, extra, changed) in diffs.items():
+        status = "ok" if not (missing or extra or changed) else \
+            f"{len(missing)} faltando, {len(extra)} sobrando, {len(changed)} diferentes"
+        print(f"{name:<26} {status}")
+    checks = check_reports(db, coll.name)
+    for name, ok in checks.items():
+        print(f"consulta {name:<4} {'igual à agregação' if ok else 'DIFERENTE da agregação'}")
+    if not all(checks.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# Ponto de entrada único do projeto: crawl, normalize, load, query e export
+#
+# Cada subcomando importa só o que usa (scrapy roda num subprocesso, pandas só com
+# normalize --pandas, pymongo só em load/query --mongo, pyarrow só no export .parquet),
+# então "query" e "export" sobem sem carregar nenhuma dessas bibliotecas.
+# query/export leem o pokedex_sorted.json através de um cache já processado
+# (data/.cache/<arquivo>.pickle com os registros e o PokedexIndex montado), que vale
+# enquanto o tamanho e o mtime do JSON forem os mesmos; normalize e load não usam o cache.
+#
+# python scrapyPokemon/pokedex.py crawl [--output data/pokedex.json] [-s CHAVE=VALOR ...]
+# python scrapyPokemon/pokedex.py normalize [--pandas] [--memory-mb 64]
+# python scrapyPokemon/pokedex.py load [--mock] [--summaries]
+# python scrapyPokemon/pokedex.py query [1|2a|2b|all] [--type Water] [--level 30] [--mongo]
+# python scrapyPokemon/pokedex.py export --output data/pokedex.csv [--fields id,name,types]
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FEED_PATH = "data/pokedex.json"
+JSON_PATH = "data/pokedex_sorted.json"
+CACHE_DIR = "data/.cache"
+CACHE_VERSION = 2
+
+QUERY_TITLES = {
+    "1": "== Consulta 1: Quantos Pokémon possuem {min_types} ou mais tipos? ==",
+    "2a": "== Consulta 2-A: Pokémon do tipo {type} que evoluem DEPOIS do level {level} (origem) ==",
+    "2b": "== Consulta 2-B: Pokémon que RESULTAM em tipo {type} após level > {level} (destino) ==",
+}
+TYPE_TITLES = {"Water": "Água"}
+
+
+def cache_path(json_path, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, os.path.basename(json_path) + ".pickle")
+
+
+# Registros e índice do JSON, do cache quando ele ainda corresponde ao arquivo
+def load_dataset(json_path=JSON_PATH, cache_dir=CACHE_DIR, use_cache=True):
+    st = os.stat(json_path)
+    source = (os.path.abspath(json_path), st.st_size, st.st_mtime_ns, CACHE_VERSION)
+    path = cache_path(json_path, cache_dir)
+    if use_cache:
+        try:
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            if cached["source"] == source:
+                return cached["records"], cached["index"]
+        except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+            pass
+
+    from pokedex_index import PokedexIndex
+    from sorted_pokedex_stream import iter_records
+
+    records = list(iter_records(json_path))
+    index = PokedexIndex(records)
+    if use_cache:
+        # grava num temporário e troca, para um processo concorrente nunca ler cache pela metade
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"source": source, "records": records, "index": index}, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    return records, index
+
+
+def cmd_crawl(args):
+    cmd = [sys.executable, "-m", "scrapy", "crawl", "pokemon", "-O", os.path.abspath(args.output)]
+    for setting in args.set or []:
+        cmd += ["-s", setting]
+    # roda no diretório do scrapy.cfg; o scrapy não é importado neste processo
+    return subprocess.call(cmd, cwd=ROOT)
+
+
+def cmd_normalize(args):
+    if args.pandas:
+        from sorted_pokedex_pandas import sort_pokedex
+
+        count = sort_pokedex(args.input, args.output)
+        print(f"Arquivo ordenado e limpo salvo em {args.output}: {count} registros")
+        return 0
+
+    from sorted_pokedex_stream import sort_pokedex
+
+    count, runs = sort_pokedex(args.input, args.output, args.memory_mb)
+    extra = f" ({runs} blocos em disco)" if runs else ""
+    print(f"Arquivo ordenado e limpo salvo em {args.output}: {count} registros{extra}")
+    return 0
+
+
+def cmd_load(args):
+    from mongo_loader import get_collection, load_documents, print_stats
+    from sorted_pokedex_stream import iter_records
+
+    coll = get_collection(args.mock)
+    stats, changed_ids = load_documents(coll, iter_records(args.input), args.batch_size)
+    print_stats(stats)
+    if args.summaries:
+        from mongo_summaries import update_summaries
+
+        summary = update_summaries(coll.database, changed_ids, coll.name)
+        print(f"resumos atualizados para {summary['changed']} Pokémon ({summary['edges']} arestas)")
+    return 0
+
+
+def run_queries(args):
+    if args.mongo:
+        from mongo_loader import get_collection
+        from mongo_summaries import report1, report2a, report2b
+
+        db = get_collection().database
+        return {
+            "1": lambda: report1(db, args.min_types),
+            "2a": lambda: report2a(db, args.type, args.level),
+            "2b": lambda: report2b(db, args.type, args.level),
+        }
+
+    from pokedex_index import query2a, query2b
+
+    _, index = load_dataset(args.input, args.cache_dir, not args.no_cache)
+    return {
+        "1": lambda: [{"qtd": index.count(min_types=args.min_types)}],
+        "2a": lambda: query2a(index, args.type, args.level),
+        "2b": lambda: query2b(index, args.type, args.level),
+    }
+
+
+def cmd_query(args):
+    queries = run_queries(args)
+    names = sorted(QUERY_TITLES) if args.name == "all" else [args.name]
+    for i, name in enumerate(names):
+        title = QUERY_TITLES[name].format(min_types=args.min_types, type=TYPE_TITLES.get(args.type, args.type),
+                                         level=args.level)
+        print(("\n" if i else "") + title)
+        rows = queries[name]()
+        if name == "1":
+            print(rows)
+        else:
+            for row in rows:
+                print(row)
+    return 0
+
+
+def export_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    return {".jl": "jsonl", ".jsonl": "jsonl", ".csv": "csv", ".parquet": "parquet"}.get(ext, "json")
+
+
+def write_csv(records, path, fields):
+    import csv
+
+    fields = fields or list(dict.fromkeys(k for doc in records for k in doc))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for doc in records:
+            # listas e dicionários vão como JSON dentro da célula
+            writer.writerow([
+                json.dumps(doc[k], ensure_ascii=False) if isinstance(doc.get(k), (list, dict)) else doc.get(k)
+                for k in fields
+            ])
+
+
+def write_parquet(records, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from scrapyPokemon.columnar import item_to_row, pokedex_arrow_schema
+
+    table = pa.Table.from_pylist([item_to_row(doc) for doc in records], schema=pokedex_arrow_schema())
+    pq.write_table(table, path)
+
+
+def cmd_export(args):
+    records, _ = load_dataset(args.input, args.cache_dir, not args.no_cache)
+    fields = args.fields.split(",") if args.fields else None
+    fmt = export_format(args.output, args.format)
+    if fmt == "parquet":
+        if fields:
+            raise SystemExit("--fields não se aplica ao Parquet (o esquema é fixo, veja columnar.py)")
+        write_parquet(records, args.output)
+    elif fmt == "csv":
+        write_csv(records, args.output, fields)
+    else:
+        rows = [{k: doc.get(k) for k in fields} for doc in records] if fields else records
+        with open(args.output, "w", encoding="utf-8") as f:
+            if fmt == "jsonl":
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            else:
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+    print(f"{len(records)} registros exportados para {args.output} ({fmt})")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pokedex", description="Crawl e pós-processamento da pokedex")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    crawl = sub.add_parser("crawl", help="roda o spider e grava o feed")
+    crawl.add_argument("--output", default=FEED_PATH)
+    crawl.add_argument("-s", "--set", action="append", metavar="CHAVE=VALOR", help="setting do Scrapy")
+    crawl.set_defaults(run=cmd_crawl)
+
+    normalize = sub.add_parser("normalize", help="converte ids, remove duplicados e ordena o feed")
+    normalize.add_argument("--input", default=FEED_PATH)
+    normalize.add_argument("--output", default=JSON_PATH)
+    normalize.add_argument("--memory-mb", type=float, default=64)
+    normalize.add_argument("--pandas", action="store_true", help="usa o sorted_pokedex_pandas.py")
+    normalize.set_defaults(run=cmd_normalize)
+
+    load = sub.add_parser("load", help="carrega o JSON ordenado no MongoDB")
+    load.add_argument("--input", default=JSON_PATH)
+    load.add_argument("--batch-size", type=int, default=500)
+    load.add_argument("--mock", action="store_true", help="usa mongomock em memória (sem servidor)")
+    load.add_argument("--summaries", action="store_true", help="atualiza as coleções de resumo")
+    load.set_defaults(run=cmd_load)
+
+    for name, run, help_ in (("query", cmd_query, "consultas do mongoDB.py"),
+                             ("export", cmd_export, "exporta os registros (json, jsonl, csv, parquet)")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--input", default=JSON_PATH)
+        p.add_argument("--cache-dir", default=CACHE_DIR)
+        p.add_argument("--no-cache", action="store_true", help="lê o JSON sem usar nem gravar o cache")
+        p.set_defaults(run=run)
+        if name == "query":
+            p.add_argument("name", nargs="?", default="all", choices=sorted(QUERY_TITLES) + ["all"])
+            p.add_argument("--type", default="Water")
+            p.add_argument("--level", type=int, default=30)
+            p.add_argument("--min-types", type=int, default=2)
+            p.add_argument("--mongo", action="store_true", help="lê das coleções de resumo do MongoDB")
+        else:
+            p.add_argument("--output", required=True)
+            p.add_argument("--format", choices=["json", "jsonl", "csv", "parquet"],
+                           help="padrão: pela extensão do --output")
+            p.add_argument("--fields", help="campos separados por vírgula (json, jsonl e csv)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# Consultas sobre o pokedex_sorted.json sem servidor (substitui as agregações do mongoDB.py)
+#
+# Os índices são montados uma vez na carga; cada registro é identificado pela chave
+# (id, forma), com forma "" na forma base (Mega e formas regionais dividem o id):
+#   by_key        (id, forma) -> documento
+#   by_id         id numérico -> documento da forma base
+#   by_type       tipo -> conjunto de chaves
+#   by_type_count quantidade de tipos -> conjunto de chaves
+#   edges         arestas de evolução (level, chave da origem, to_id, evolução) ordenadas por
+#                 level, com o to_id já convertido para inteiro (o destino é a forma base)
+# e cada consulta vira interseção de conjuntos / bisect em vez de $unwind + $lookup.
+#
+# python scrapyPokemon/pokedex_index.py [--input data/pokedex_sorted.json]
+
+import argparse
+from bisect import bisect_right
+from collections import defaultdict
+
+from scrapyPokemon.items import to_int_id
+from sorted_pokedex_stream import iter_records
+
+JSON_PATH = "data/pokedex_sorted.json"
+
+
+class PokedexIndex:
+    def __init__(self, docs):
+        self.docs = []
+        self.by_key = {}
+        self.by_id = {}
+        self.by_name = {}
+        self.by_type = defaultdict(set)
+        self.by_type_count = defaultdict(set)
+        edges = []
+
+        for doc in docs:
+            pid = doc.get("id")
+            if not isinstance(pid, int):
+                continue
+            key = (pid, doc.get("form") or "")
+            self.docs.append(doc)
+            self.by_key[key] = doc
+            if not key[1] or pid not in self.by_id:
+                self.by_id[pid] = doc
+            self.by_name[doc.get("name")] = pid
+            types = doc.get("types")
+            if types is not None:
+                for t in types:
+                    self.by_type[t].add(key)
+                self.by_type_count[len(types)].add(key)
+            for evo in doc.get("evolutions") or []:
+                level = evo.get("level")
+                if isinstance(level, (int, float)):
+                    edges.append((level, key, to_int_id(evo.get("to_id")), evo))
+
+        # Ordenadas por level (desempate pela ordem de entrada, como o $sort do Mongo)
+        edges.sort(key=lambda e: e[0])
+        self.edges = edges
+        self.edge_levels = [e[0] for e in edges]
+
+    @classmethod
+    def load(cls, path=JSON_PATH):
+        return cls(iter_records(path))
+
+    def get(self, pid):
+        return self.by_id.get(pid)
+
+    # Chaves dos registros que têm todos os tipos pedidos (e, opcionalmente, uma faixa de
+    # quantidade de tipos)
+    def ids_where(self, types=(), min_types=None, max_types=None):
+        sets = [self.by_type.get(t, set()) for t in types]
+        if min_types is not None or max_types is not None:
+            low = min_types if min_types is not None else 0
+            high = max_types if max_types is not None else max(self.by_type_count, default=0)
+            sets.append(set().union(*(ids for n, ids in self.by_type_count.items() if low <= n <= high)))
+        if not sets:
+            return set(self.by_key)
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def find(self, types=(), min_types=None, max_types=None):
+        return [self.by_key[key] for key in sorted(self.ids_where(types, min_types, max_types))]
+
+    def count(self, types=(), min_types=None, max_types=None):
+        return len(self.ids_where(types, min_types, max_types))
+
+    # Arestas de evolução por faixa de level (exclusivo em min, inclusivo em max,
+    # como "$gt"/"$lte"), filtradas pelo tipo da origem e/ou do destino
+    def evolutions(self, min_level=None, max_level=None, from_type=None, to_type=None):
+        lo = bisect_right(self.edge_levels, min_level) if min_level is not None else 0
+        hi = bisect_right(self.edge_levels, max_level) if max_level is not None else len(self.edges)
+        from_keys = self.by_type.get(from_type, set()) if from_type else None
+        to_keys = self.by_type.get(to_type, set()) if to_type else None
+        for level, from_key, to_id, evo in self.edges[lo:hi]:
+            if from_keys is not None and from_key not in from_keys:
+                continue
+            if to_keys is not None and (to_id, "") not in to_keys:
+                continue
+            yield self.by_key[from_key], evo, self.by_id.get(to_id)
+
+
+# Mesmas consultas (e mesmo formato de saída) do mongoDB.py
+
+def query1(index):
+    return [{"qtd": index.count(min_types=2)}]
+
+
+def query2a(index, type_="Water", level=30):
+    return [
+        {
+            "Id do Pokemon": src["id"],
+            "Nome do Pokemon": src["name"],
+            "Evolui para Pokemon do Id": evo.get("to_id"),
+            "Evolui para o Pokemon de nome": evo.get("to_name"),
+            "level": evo.get("level"),
+            "method": evo.get("method"),
+        }
+        for src, evo, _ in index.evolutions(min_level=level, from_type=type_)
+    ]
+
+
+def query2b(index, type_="Water", level=30):
+    return [
+        {
+            "Pokemon evoluido": dst["name"],
+            "Pokemon evoluido de": src["name"],
+            "level": evo.get("level"),
+            "method": evo.get("method"),
+        }
+        for src, evo, dst in index.evolutions(min_level=level, to_type=type_)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas da pokedex com índices em memória")
+    parser.add_argument("--input", default=JSON_PATH)
+    args = parser.parse_args(argv)
+
+    index = PokedexIndex.load(args.input)
+    print("== Consulta 1: Quantos Pokémon possuem 2 ou mais tipos? ==")
+    print(query1(index))
+    print("\n== Consulta 2-A: Pokémon do tipo Água que evoluem DEPOIS do level 30 (origem) ==")
+    for doc in query2a(index):
+        print(doc)
+    print("\n== Consulta 2-B: Pokémon que RESULTAM em tipo Água após level > 30 (destino) ==")
+    for doc in query2b(index):
+        print(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# Formato normalizado da pokedex: cada família evolutiva é guardada uma vez só
+#
+# No pokedex_sorted.json todo Pokémon carrega a família inteira em evolution_stages.
+# Aqui a saída vira {"families": [...], "pokemon": [...]}:
+#   família: {"id", "members": [{"id", "name", "link"}...], "edges": [{"from", "to", "method",
+#             "level", "item", "item_link"}...]}  (from/to são índices em members)
+#   Pokémon: o registro de sempre, com "family" (id) e "member" (índice em members) no lugar
+#            de evolution_stages/evolutions
+# O view (NormalizedPokedex) remonta o formato antigo sob demanda. Se algum registro não
+# puder ser remontado idêntico a partir da família, ele fica com os campos originais.
+#
+# python scrapyPokemon/pokedex_normalized.py [--input data/pokedex_sorted.json] [--output data/pokedex_normalized.json]
+
+import argparse
+import json
+from collections import defaultdict
+
+from sorted_pokedex_stream import iter_records
+
+IN_PATH = "data/pokedex_sorted.json"
+OUT_PATH = "data/pokedex_normalized.json"
+
+EDGE_FIELDS = ("method", "level", "item", "item_link")
+
+
+# Ordem dos membros na página: cada registro traz a família sem ele mesmo, na ordem do
+# documento; junta todas essas sequências numa só (ordenação topológica estável)
+def merge_member_order(sequences):
+    first_seen, after, before_count = {}, defaultdict(set), defaultdict(int)
+    for seq in sequences:
+        for link in seq:
+            first_seen.setdefault(link, len(first_seen))
+        for a, b in zip(seq, seq[1:]):
+            if b not in after[a]:
+                after[a].add(b)
+                before_count[b] += 1
+
+    ready = sorted((link for link in first_seen if before_count[link] == 0), key=first_seen.get)
+    order = []
+    while ready:
+        link = ready.pop(0)
+        order.append(link)
+        for b in after[link]:
+            before_count[b] -= 1
+            if before_count[b] == 0:
+                ready.append(b)
+        ready.sort(key=first_seen.get)
+    # Ordens contraditórias (ciclo): o que sobrou entra na ordem em que apareceu
+    order += sorted((link for link in first_seen if link not in order), key=first_seen.get)
+    return order
+
+
+def own_stage(doc):
+    stages = doc.get("evolution_stages") or []
+    return stages[0] if stages else None
+
+
+# Remonta evolution_stages/evolutions de um membro a partir da família
+def denormalize_evolution(family, member_index):
+    members = family["members"]
+    me = members[member_index]
+
+    from_member = None
+    for edge in family["edges"]:
+        if edge["to"] == member_index:
+            from_member = members[edge["from"]]
+            break
+
+    outgoing = [e for e in family["edges"] if e["from"] == member_index]
+    entry = {
+        "id": me["id"],
+        "name": me["name"],
+        "from": from_member["name"] if from_member else None,
+        "id_from": from_member["id"] if from_member else None,
+        "link_from": from_member["link"] if from_member else None,
+        "to": [members[e["to"]]["name"] for e in outgoing],
+        "id_to": [members[e["to"]]["id"] for e in outgoing],
+        "link_to": [members[e["to"]]["link"] for e in outgoing],
+        "method_evolution": [e["method"] for e in outgoing],
+        "level_to": [e["level"] for e in outgoing],
+        "item_to": [e["item"] for e in outgoing],
+        "item_link_to": [e["item_link"] for e in outgoing],
+    }
+    others = [dict(m) for i, m in enumerate(members) if i != member_index]
+    evolutions = [
+        {
+            "to_id": members[e["to"]]["id"],
+            "to_name": members[e["to"]]["name"],
+            "to_link": members[e["to"]]["link"],
+            **{field: e[field] for field in EDGE_FIELDS},
+        }
+        for e in outgoing
+    ]
+    return [entry] + others, evolutions
+
+
+# Chave de um membro: o slug do link. O registro traz o próprio link relativo
+# ("/pokedex/ivysaur") e as cadeias trazem os links absolutos dos outros membros
+def member_key(link):
+    return link.rstrip("/").rsplit("/", 1)[-1] if link else None
+
+
+# Monta as famílias de um grupo de registros ligados pelas cadeias evolutivas
+def build_family(family_id, docs):
+    sequences, info = [], {}
+    for doc in docs:
+        stages = doc["evolution_stages"]
+        entry = stages[0]
+        info.setdefault(member_key(doc["link"]), {"id": entry.get("id"), "name": entry.get("name"),
+                                                  "link": doc["link"]})
+        for other in stages[1:]:
+            member = info.setdefault(member_key(other.get("link")), {"id": other.get("id"),
+                                                                     "name": other.get("name")})
+            # o link guardado é o das cadeias (absoluto), que é o que a remontagem devolve
+            member["link"] = other.get("link")
+        # Sequência completa vista por este registro: ele mesmo só se sabe a posição por outros
+        sequences.append([member_key(other.get("link")) for other in stages[1:]])
+    for doc in docs:
+        key = member_key(doc["link"])
+        if not any(key in seq for seq in sequences):
+            sequences.insert(0, [key] + [member_key(o.get("link")) for o in doc["evolution_stages"][1:]])
+
+    order = merge_member_order(sequences)
+    index = {key: i for i, key in enumerate(order)}
+    members = [info[key] for key in order]
+
+    edges, seen = [], set()
+    present = {member_key(doc["link"]) for doc in docs}
+    for doc in sorted(docs, key=lambda d: index[member_key(d["link"])]):
+        entry = doc["evolution_stages"][0]
+        targets = zip(entry.get("link_to") or [], entry.get("method_evolution") or [],
+                      entry.get("level_to") or [], entry.get("item_to") or [], entry.get("item_link_to") or [])
+        for link_to, method, level, item, item_link in targets:
+            if member_key(link_to) not in index:
+                continue
+            key = (index[member_key(doc["link"])], index[member_key(link_to)], method, level, item, item_link)
+            if key not in seen:
+                seen.add(key)
+                edges.append({"from": key[0], "to": key[1], "method": method, "level": level,
+                              "item": item, "item_link": item_link})
+
+    # Origem fora do arquivo: a aresta só é conhecida pelo "from" do destino
+    for doc in docs:
+        entry = doc["evolution_stages"][0]
+        from_key = member_key(entry.get("link_from"))
+        if from_key and from_key not in present and from_key in index:
+            key = (index[from_key], index[member_key(doc["link"])], None, None, None, None)
+            if key not in seen:
+                seen.add(key)
+                edges.append({"from": key[0], "to": key[1], "method": None, "level": None,
+                              "item": None, "item_link": None})
+
+    return {"id": family_id, "members": members, "edges": edges}, index
+
+
+# Separa famílias e registros; devolve (families, pokemon, fallback) onde fallback é
+# quantos registros ficaram com os campos originais
+def normalize(records):
+    docs = list(records)
+
+    # Grupos = componentes ligados pelos links dos membros de cada registro
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for doc in docs:
+        if own_stage(doc) is None or not doc.get("link"):
+            continue
+        for other in doc["evolution_stages"][1:]:
+            if other.get("link"):
+                parent[find(member_key(other["link"]))] = find(member_key(doc["link"]))
+        find(member_key(doc["link"]))
+
+    groups = defaultdict(list)
+    for doc in docs:
+        if own_stage(doc) is not None and doc.get("link"):
+            groups[find(member_key(doc["link"]))].append(doc)
+
+    position = {id(doc): i for i, doc in enumerate(docs)}
+    families, family_of = [], {}
+    for group in sorted(groups.values(), key=lambda g: position[id(g[0])]):
+        family, index = build_family(len(families) + 1, group)
+        families.append(family)
+        for doc in group:
+            family_of[id(doc)] = (family, index[member_key(doc["link"])])
+
+    pokemon, fallback = [], 0
+    for doc in docs:
+        placement = family_of.get(id(doc))
+        if placement is not None:
+            family, member = placement
+            stages, evolutions = denormalize_evolution(family, member)
+            if stages == doc.get("evolution_stages") and evolutions == doc.get("evolutions"):
+                pokemon.append(replace_evolution(doc, {"family": family["id"], "member": member}))
+                continue
+            fallback += 1
+        pokemon.append(dict(doc))
+    return families, pokemon, fallback
+
+
+# Troca evolution_stages/evolutions por outras chaves, mantendo a posição no registro
+def replace_evolution(doc, fields):
+    out = {}
+    for key, value in doc.items():
+        if key == "evolution_stages":
+            out.update(fields)
+        elif key != "evolutions":
+            out[key] = value
+    return out
+
+
+class NormalizedPokedex:
+    def __init__(self, families, pokemon):
+        self.families = {f["id"]: f for f in families}
+        self.pokemon = pokemon
+        # (id, forma) -> registro, com forma "" na forma base; by_id fica com a forma base
+        self.by_key = {(doc.get("id"), doc.get("form") or ""): doc for doc in pokemon}
+        self.by_id = {}
+        for doc in pokemon:
+            if not doc.get("form") or doc.get("id") not in self.by_id:
+                self.by_id[doc.get("id")] = doc
+
+    @classmethod
+    def load(cls, path=OUT_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["families"], data["pokemon"])
+
+    # Registro no formato antigo (com evolution_stages e evolutions)
+    def denormalize(self, doc):
+        if "family" not in doc:
+            return doc
+        stages, evolutions = denormalize_evolution(self.families[doc["family"]], doc["member"])
+        out = {}
+        for key, value in doc.items():
+            if key == "family":
+                out["evolution_stages"] = stages
+                out["evolutions"] = evolutions
+            elif key != "member":
+                out[key] = value
+        return out
+
+    def get(self, pid, form=None):
+        doc = self.by_key.get((pid, form or "")) if form else self.by_id.get(pid)
+        return self.denormalize(doc) if doc is not None else None
+
+    def family_of(self, pid):
+        doc = self.by_id.get(pid)
+        return self.families.get(doc.get("family")) if doc is not None else None
+
+    def __iter__(self):
+        for doc in self.pokemon:
+            yield self.denormalize(doc)
+
+    def __len__(self):
+        return len(self.pokemon)
+
+
+def write_normalized(families, pokemon, out_path):
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"families": families, "pokemon": pokemon}, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta a pokedex com cada família evolutiva uma vez só")
+    parser.add_argument("--input", default=IN_PATH)
+    parser.add_argument("--output", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    families, pokemon, fallback = normalize(iter_records(args.input))
+    write_normalized(families, pokemon, args.output)
+
+    # Confere que o view devolve exatamente os registros de entrada
+    view = NormalizedPokedex(families, pokemon)
+    same = list(view) == list(iter_records(args.input))
+    print(f"{len(pokemon)} Pokémon, {len(families)} famílias salvas em {args.output}"
+          + (f" ({fallback} registros mantidos no formato antigo)" if fallback else ""))
+    if not same:
+        raise SystemExit("ERRO: o formato normalizado não remonta a entrada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#pip install msgpack
+
+# Pokedex em arquivo binário aberto via mmap, com acesso direto por id
+#
+# Layout do arquivo (.pdx):
+#   cabeçalho  MAGIC (4 bytes) | versão (u16) | flags (u16) | nº de registros (u32) |
+#              offset do índice (u64) | menor id (i64) | tamanho do índice (u32)
+#   blocos     para cada registro: tamanho (u32) + msgpack do documento (zlib se a flag estiver ligada)
+#   índice     tabela de offsets (u64) endereçada por id - menor id; 0 = id ausente
+# Os ids da pokedex são praticamente contínuos (1..1025), então a tabela direta custa 8 bytes
+# por id e a busca é uma conta + uma leitura no mmap. Ids não inteiros ficam sem índice.
+# As formas (Mega, regionais) dividem o id com a forma base: os registros de um id ficam
+# em sequência no arquivo (como no pokedex_sorted.json) e o índice aponta para o primeiro.
+#
+# python scrapyPokemon/pokedex_store.py [--store data/pokedex.pdx] build [--input data/pokedex_sorted.json]
+# python scrapyPokemon/pokedex_store.py get 25
+# python scrapyPokemon/pokedex_store.py get 3 --form "Mega Venusaur"
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import zlib
+
+from sorted_pokedex_stream import iter_records
+
+IN_PATH = "data/pokedex_sorted.json"
+STORE_PATH = "data/pokedex.pdx"
+
+MAGIC = b"PDX1"
+VERSION = 1
+FLAG_ZLIB = 1
+
+HEADER = struct.Struct("<4sHHIQqI")
+BLOCK_SIZE = struct.Struct("<I")
+INDEX_ENTRY = struct.Struct("<Q")
+
+
+def write_store(records, path=STORE_PATH, compress=True):
+    import msgpack
+
+    index = {}
+    count = 0
+    last_id = None
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0))
+        for doc in records:
+            payload = msgpack.packb(doc, use_bin_type=True)
+            if compress:
+                payload = zlib.compress(payload, 6)
+            offset = f.tell()
+            f.write(BLOCK_SIZE.pack(len(payload)))
+            f.write(payload)
+            pid = doc.get("id")
+            if isinstance(pid, int):
+                if pid not in index:
+                    index[pid] = offset
+                elif pid != last_id:
+                    raise ValueError(f"id {pid} repetido fora de sequência: os registros de um id "
+                                     "precisam vir juntos (como no pokedex_sorted.json)")
+            last_id = pid
+            count += 1
+
+        min_id = min(index, default=0)
+        span = max(index, default=-1) - min_id + 1
+        index_offset = f.tell()
+        for pid in range(min_id, min_id + span):
+            f.write(INDEX_ENTRY.pack(index.get(pid, 0)))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, FLAG_ZLIB if compress else 0, count, index_offset, min_id, span))
+    os.replace(tmp, path)
+    return count
+
+
+class PokedexStore:
+    def __init__(self, path=STORE_PATH):
+        import msgpack
+
+        self._unpackb = msgpack.unpackb
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, flags, self.count, self._index_offset,
+         self._min_id, self._span) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} não é uma pokedex binária (versão {VERSION})")
+        self._compressed = bool(flags & FLAG_ZLIB)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    # Posição do registro no arquivo, direto da tabela (None se o id não existe)
+    def _offset_of(self, pid):
+        slot = pid - self._min_id
+        if not 0 <= slot < self._span:
+            return None
+        (offset,) = INDEX_ENTRY.unpack_from(self._mm, self._index_offset + slot * INDEX_ENTRY.size)
+        return offset or None
+
+    def _read_block(self, offset):
+        (size,) = BLOCK_SIZE.unpack_from(self._mm, offset)
+        start = offset + BLOCK_SIZE.size
+        payload = self._mm[start:start + size]
+        if self._compressed:
+            payload = zlib.decompress(payload)
+        return self._unpackb(payload, raw=False), start + size
+
+    # Registro do id na forma pedida (None = forma base), percorrendo os blocos do id
+    def get(self, pid, form=None):
+        offset = self._offset_of(pid)
+        while offset is not None and offset < self._index_offset:
+            doc, offset = self._read_block(offset)
+            if doc.get("id") != pid:
+                break
+            if (doc.get("form") or None) == (form or None):
+                return doc
+        return None
+
+    def __contains__(self, pid):
+        return self._offset_of(pid) is not None
+
+    def ids(self):
+        return [self._min_id + slot for slot in range(self._span)
+                if INDEX_ENTRY.unpack_from(self._mm, self._index_offset + slot * INDEX_ENTRY.size)[0]]
+
+    # Lê os registros na ordem do arquivo, um bloco por vez
+    def __iter__(self):
+        offset = HEADER.size
+        for _ in range(self.count):
+            doc, offset = self._read_block(offset)
+            yield doc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pokedex binária (msgpack + mmap) com acesso por id")
+    parser.add_argument("--store", default=STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="converte o JSON para o formato binário")
+    build.add_argument("--input", default=IN_PATH)
+    build.add_argument("--no-compress", action="store_true")
+
+    get = sub.add_parser("get", help="mostra um Pokémon pelo id")
+    get.add_argument("id", type=int)
+    get.add_argument("--form", help="nome da forma (padrão: forma base)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = write_store(iter_records(args.input), args.store, compress=not args.no_compress)
+        print(f"{count} registros salvos em {args.store} ({os.path.getsize(args.store) / 1024:.1f} KB)")
+        return
+
+    with PokedexStore(args.store) as store:
+        doc = store.get(args.id, args.form)
+    if doc is None:
+        raise SystemExit(f"id {args.id} não encontrado" + (f" na forma {args.form}" if args.form else ""))
+    print(json.dumps(doc, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Caches em memória usados pelo spider durante o crawl
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+
+# LRU limitado das cadeias evolutivas já lidas, indexado pelo HTML da cadeia.
+# Todos os membros de uma família (Bulbasaur, Ivysaur, Venusaur) têm a mesma
+# marcação, então a família é lida uma vez e cada página só projeta sua visão.
+class EvolutionChainCache:
+    def __init__(self, max_size=256, stats=None):
+        self.max_size = max_size
+        self.stats = stats
+        self._data = OrderedDict()
+
+    # Impressão digital da cadeia: base da URL (links absolutos) + HTML das listas
+    @staticmethod
+    def fingerprint(base_url, chains_html):
+        digest = hashlib.sha1(base_url.encode("utf-8"))
+        for html in chains_html:
+            digest.update(b"\0")
+            digest.update(html.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self._inc_stats("evolution_cache/miss")
+            return None
+        self._data.move_to_end(key)
+        self._inc_stats("evolution_cache/hit")
+        return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self._inc_stats("evolution_cache/evicted")
+        if self.stats is not None:
+            self.stats.max_value("evolution_cache/size", len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def _inc_stats(self, key):
+        if self.stats is not None:
+            self.stats.inc_value(key)
+
+
+# Descrições das habilidades já buscadas, com coalescência de requisições:
+# a primeira página que pede uma URL dispara o download, as que chegam enquanto
+# ele está em andamento só esperam o resultado e as seguintes leem da memória.
+# Opcionalmente persiste em disco entre crawls, com validade (TTL) por entrada.
+class AbilityStore:
+    def __init__(self, path=None, ttl=7 * 24 * 3600, stats=None):
+        self.path = path
+        self.ttl = ttl
+        self.stats = stats
+        self._descriptions = {}  # url -> {"description": ..., "fetched_at": ...}
+        self._waiting = {}       # url em download -> [(attributes, ability_name), ...]
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        now = time.time()
+        for url, entry in entries.items():
+            if self.ttl and now - entry.get("fetched_at", 0) > self.ttl:
+                self._inc_stats("ability_store/expired")
+                continue
+            self._descriptions[url] = entry
+        self._inc_stats("ability_store/loaded", len(self._descriptions))
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._descriptions, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    # Descrição conhecida e ainda válida, ou None
+    def get(self, url):
+        entry = self._descriptions.get(url)
+        if entry is None:
+            return None
+        if self.ttl and time.time() - entry["fetched_at"] > self.ttl:
+            del self._descriptions[url]
+            self._inc_stats("ability_store/expired")
+            return None
+        self._inc_stats("ability_store/hit")
+        return entry["description"]
+
+    def put(self, url, description):
+        self._descriptions[url] = {"description": description, "fetched_at": time.time()}
+        self._inc_stats("ability_store/fetched")
+
+    # Descrição recuperada de outra fonte (checkpoint de um crawl interrompido)
+    def restore(self, url, description):
+        self._descriptions.setdefault(url, {"description": description, "fetched_at": time.time()})
+
+    def is_fetching(self, url):
+        return url in self._waiting
+
+    def start_fetch(self, url):
+        self._waiting[url] = []
+
+    # Registra um item que vai receber a descrição quando o download terminar
+    def wait_for(self, url, attributes, ability_name):
+        self._waiting[url].append((attributes, ability_name))
+        self._inc_stats("ability_store/coalesced")
+
+    # Encerra o download da URL e devolve quem estava esperando por ele
+    def pop_waiters(self, url):
+        return self._waiting.pop(url, [])
+
+    def __len__(self):
+        return len(self._descriptions)
+
+    def _inc_stats(self, key, count=1):
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
@@ -0,0 +1,111 @@
+# Log de checkpoint do crawl (CHECKPOINT_PATH), para retomar um crawl interrompido
+#
+# Arquivo JSON Lines só de acréscimo, uma linha por evento:
+#   {"op": "partial", "link", "item", "ability_names"}  Pokémon com a página de detalhe lida,
+#                                                      esperando as páginas de habilidade
+#   {"op": "ability", "url", "description"}            descrição de habilidade baixada
+#   {"op": "done", "link", "item"}                     Pokémon completo entregue
+# Cada linha vai para o disco assim que é escrita (flush; fsync com CHECKPOINT_FSYNC), então
+# um crash perde no máximo a linha que estava sendo gravada, que é ignorada na leitura.
+# Na retomada os completos saem direto do log, os parciais só buscam as habilidades que
+# faltam e o log é compactado. Um crawl que termina normalmente apaga o log.
+# "link" é a chave do registro (items.record_key): formas alternativas levam "#forma".
+
+import json
+import os
+
+from scrapyPokemon.items import record_key
+
+
+class CheckpointLog:
+    def __init__(self, path, fsync=False, stats=None):
+        self.path = path
+        self.fsync = fsync
+        self.stats = stats
+        self.done = {}          # link -> item
+        self.partial = {}       # link -> {"item", "ability_names"}
+        self.descriptions = {}  # url da habilidade -> descrição
+        self.file = None
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        self._inc_stats("checkpoint/torn_lines")  # linha cortada pelo crash
+                        continue
+                    self._apply(entry)
+            for link in self.done:
+                self.partial.pop(link, None)
+            self._inc_stats("checkpoint/loaded_done", len(self.done))
+            self._inc_stats("checkpoint/loaded_partial", len(self.partial))
+            self._compact()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def _apply(self, entry):
+        op = entry.get("op")
+        if op == "done":
+            self.done[entry["link"]] = entry["item"]
+        elif op == "partial":
+            self.partial[entry["link"]] = {"item": entry["item"], "ability_names": entry["ability_names"]}
+        elif op == "ability":
+            self.descriptions[entry["url"]] = entry["description"]
+
+    # Reescreve o log só com o estado atual (sem parciais que já terminaram)
+    def _compact(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for url, description in self.descriptions.items():
+                f.write(self._line({"op": "ability", "url": url, "description": description}))
+            for link, record in self.partial.items():
+                f.write(self._line({"op": "partial", "link": link, **record}))
+            for link, item in self.done.items():
+                f.write(self._line({"op": "done", "link": link, "item": item}))
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # Crawl terminou inteiro: o próximo começa do zero
+    def clear(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def done_item(self, link):
+        return self.done.get(link)
+
+    def partial_record(self, link):
+        return self.partial.get(link)
+
+    def write_partial(self, attributes, ability_names):
+        self._write({"op": "partial", "link": attributes.key(),
+                     "item": attributes.to_item(), "ability_names": list(ability_names)})
+
+    def write_ability(self, url, description):
+        self._write({"op": "ability", "url": url, "description": description})
+
+    def write_done(self, item):
+        self._write({"op": "done", "link": record_key(item.get("link"), item.get("form")), "item": item})
+
+    @staticmethod
+    def _line(entry):
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+    def _write(self, entry):
+        self.file.write(self._line(entry))
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def _inc_stats(self, key, count=1):
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
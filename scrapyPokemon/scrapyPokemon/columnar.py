@@ -0,0 +1,84 @@
+#pip install pyarrow
+
+# Esquema colunar (Arrow/Parquet) dos Pokémon e conversão item -> linha
+#
+# Escalares viram colunas tipadas, "types" uma coluna de lista e a efetividade
+# uma coluna numérica por tipo de ataque (effectiveness_Fire = 2.0...),
+# para as análises lerem só as colunas de que precisam:
+#   pq.read_table("data/pokedex.parquet", columns=["id", "name", "effectiveness_Ice"])
+
+import json
+
+from scrapyPokemon.items import to_int_id
+from scrapyPokemon.pokemon_types import ATTACK_TYPES, label_to_multiplier
+
+
+def effectiveness_column(attack_type):
+    return f"effectiveness_{attack_type}"
+
+
+def pokedex_arrow_schema():
+    import pyarrow as pa
+
+    evolution = pa.struct([
+        ("to_id", pa.int32()),
+        ("to_name", pa.string()),
+        ("to_link", pa.string()),
+        ("method", pa.string()),
+        ("level", pa.int32()),
+        ("item", pa.string()),
+        ("item_link", pa.string()),
+    ])
+    ability = pa.struct([("name", pa.string()), ("description", pa.string())])
+
+    fields = [
+        ("id", pa.int32()),
+        ("name", pa.string()),
+        ("form", pa.string()),  # nulo na forma base
+        ("link", pa.string()),
+        # float64: altura/peso voltam exatamente como no JSON (6.9, não 6.900000095)
+        ("height", pa.float64()),
+        ("weight", pa.float64()),
+        ("types", pa.list_(pa.dictionary(pa.int8(), pa.string()))),
+    ]
+    fields += [(effectiveness_column(t), pa.float32()) for t in ATTACK_TYPES]
+    fields += [
+        ("abilities_link", pa.list_(pa.string())),
+        ("abilities", pa.list_(ability)),
+        ("evolutions", pa.list_(evolution)),
+        # Estrutura profunda e pouco consultada: fica como JSON
+        ("evolution_stages", pa.string()),
+    ]
+    return pa.schema(fields)
+
+
+# Converte um item do spider (dict) numa linha do esquema acima
+def item_to_row(item):
+    effectiveness = item.get("effectiveness") or {}
+    row = {
+        "id": to_int_id(item.get("id")),
+        "name": item.get("name"),
+        "form": item.get("form"),
+        "link": item.get("link"),
+        "height": item.get("height"),
+        "weight": item.get("weight"),
+        "types": list(item.get("types") or []),
+        "abilities_link": list(item.get("abilities_link") or []),
+        "abilities": [
+            {"name": name, "description": description}
+            for name, description in (item.get("abilities") or {}).items()
+        ],
+        "evolutions": [
+            {**evo, "to_id": to_int_id(evo.get("to_id"))}
+            for evo in item.get("evolutions") or []
+        ],
+        "evolution_stages": json.dumps(item.get("evolution_stages") or [], ensure_ascii=False),
+    }
+    for attack_type in ATTACK_TYPES:
+        value = effectiveness.get(attack_type)
+        # O pipeline recebe o multiplicador do spider; JSON já exportado (pokedex.py
+        # export) traz o rótulo
+        if isinstance(value, str):
+            value = label_to_multiplier(value)
+        row[effectiveness_column(attack_type)] = value
+    return row
@@ -0,0 +1,63 @@
+# Corpus em disco com as respostas gravadas pelo spider (modo record/replay)
+#
+# Cada URL vira um arquivo gzip em <corpus_dir>/<hash[:2]>/<hash>.gz contendo
+# uma linha JSON de cabeçalho (url, status, headers) seguida do corpo bruto.
+
+import gzip
+import hashlib
+import json
+import os
+
+
+# Chave estável da página: sha1 da URL absoluta
+def page_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+# Caminho do arquivo da página dentro do corpus
+def page_path(corpus_dir: str, url: str) -> str:
+    key = page_key(url)
+    return os.path.join(corpus_dir, key[:2], key + ".gz")
+
+
+# Grava uma resposta no corpus (sobrescreve se já existir)
+# key_url permite guardar a página sob outra URL (ex.: origem de um redirect)
+def save_page(corpus_dir, url, status, headers, body, key_url=None):
+    path = page_path(corpus_dir, key_url or url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    header = {"url": url, "status": status, "headers": headers}
+    payload = json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n" + body
+
+    # Escreve num temporário e renomeia para não deixar arquivo pela metade
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(gzip.compress(payload, compresslevel=6))
+    os.replace(tmp_path, path)
+
+
+# Lê um arquivo do corpus e devolve {"url", "status", "headers", "body"}
+def read_page_file(path):
+    with open(path, "rb") as f:
+        payload = gzip.decompress(f.read())
+    header_line, _, body = payload.partition(b"\n")
+    page = json.loads(header_line)
+    page["body"] = body
+    return page
+
+
+# Busca a página de uma URL; retorna None se ela não foi gravada
+def load_page(corpus_dir, url):
+    path = page_path(corpus_dir, url)
+    if not os.path.exists(path):
+        return None
+    return read_page_file(path)
+
+
+# Percorre todas as páginas gravadas (ordem estável pelo nome do arquivo)
+def iter_pages(corpus_dir):
+    for root, dirs, files in os.walk(corpus_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".gz"):
+                yield read_page_file(os.path.join(root, name))
@@ -0,0 +1,94 @@
+# Leitura direta (lxml) dos campos da página de detalhe, ligada por DETAIL_FAST_PATH
+#
+# Os seletores do spider usam :contains(), que vira XPath avaliado no documento inteiro
+# a cada helper (altura, peso, habilidades e as duas linhas da tabela de tipos). Aqui a
+# árvore que o Scrapy já montou é percorrida uma vez só, nos <th> e nas tabelas de tipos,
+# reproduzindo a semântica dos seletores (primeiro texto direto, ordem do documento,
+# todas as formas da página). benchmarks/bench_fast_extract.py confere campo a campo
+# contra os seletores e mede o ganho.
+
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class DetailFields:
+    height: str = ""
+    weight: str = ""
+    types_names: list = field(default_factory=list)
+    types_multipliers: list = field(default_factory=list)
+    ability_names: list = field(default_factory=list)
+    ability_links: list = field(default_factory=list)
+
+
+def is_element(node):
+    return isinstance(node.tag, str)
+
+
+# Textos filhos diretos do elemento (o "::text" dos seletores), na ordem
+def direct_texts(el):
+    texts = [el.text] if el.text is not None else []
+    texts += [child.tail for child in el if child.tail is not None]
+    return texts
+
+
+# "E + td": o próximo irmão que é elemento, se for um <td>
+def next_td(th):
+    for sibling in th.itersiblings():
+        if is_element(sibling):
+            return sibling if sibling.tag == "td" else None
+    return None
+
+
+# Posição do elemento entre os irmãos elementos (1 = primeiro), como no :nth-child()
+def child_position(el):
+    return 1 + sum(1 for sibling in el.itersiblings(preceding=True) if is_element(sibling))
+
+
+def has_class(el, name):
+    return name in (el.get("class") or "").split()
+
+
+def scan_detail_page(response):
+    root = response.selector.root
+    fields = DetailFields()
+    height = weight = None
+
+    # Tabela de dados vitais: th com "Height"/"Weight"/"Abilities" -> td ao lado
+    for th in root.iter("th"):
+        label = "".join(th.itertext())
+        if "Height" not in label and "Weight" not in label and "Abilities" not in label:
+            continue
+        td = next_td(th)
+        if td is None:
+            continue
+        if height is None and "Height" in label:
+            height = next(iter(direct_texts(td)), None)
+        if weight is None and "Weight" in label:
+            weight = next(iter(direct_texts(td)), None)
+        if "Abilities" in label:
+            for a in td.iter("a"):
+                href = a.get("href")
+                if href is not None:
+                    fields.ability_links.append(href)
+                fields.ability_names += [t.strip() for t in direct_texts(a)]
+
+    fields.height = height or ""
+    fields.weight = weight or ""
+
+    # Tabelas de tipos: 1ª linha tem os tipos de ataque, a 2ª os multiplicadores
+    seen = set()
+    for table in root.iter("table"):
+        if not has_class(table, "type-table"):
+            continue
+        for tr in table.iter("tr"):
+            if tr in seen:
+                continue
+            seen.add(tr)
+            position = child_position(tr)
+            if position == 1:
+                for th in tr.iter("th"):
+                    fields.types_names += [a.get("title") for a in th.iter("a") if a.get("title") is not None]
+            elif position == 2:
+                for td in tr.iter("td"):
+                    fields.types_multipliers.append(next(iter(direct_texts(td)), "").strip())
+    return fields
@@ -0,0 +1,51 @@
+# Formas alternativas (Mega, Alola, ...) que dividem a página de detalhe com o Pokémon base
+#
+# Na listagem cada forma é outra linha com o mesmo link e o nome da forma em <small>; o
+# spider agrupa essas linhas numa requisição só e a página é lida uma vez para todas. Aqui
+# ficam a leitura da forma na linha da listagem e a divisão da página em um registro por
+# forma, usando as abas (tabset) que o site monta para cada uma.
+
+from scrapyPokemon.fast_extract import scan_detail_page
+
+
+# Nome da forma na linha da listagem ("Mega Venusaur"); None na linha do Pokémon base
+def row_form(row):
+    form = row.css("td.cell-name small.text-muted::text").get()
+    return (form or "").strip() or None
+
+
+# Abas por forma na página de detalhe (tabset: "tabset-basics" ou "tabset-typedefcol"):
+# nome da aba ("Venusaur", "Mega Venusaur") -> painel
+def form_tabs(response, tabset):
+    panels = {}
+    for tab in response.css(f"div.{tabset} .sv-tabs-tab-list a.sv-tabs-tab"):
+        name = " ".join(t.strip() for t in tab.css("::text").getall() if t.strip())
+        href = tab.attrib.get("href", "")
+        panel = response.xpath("//div[@id=$id]", id=href[1:]) if href.startswith("#") else []
+        if name and panel:
+            panels.setdefault(name, panel[0])
+    return panels
+
+
+# Página compartilhada pelo Pokémon base e suas formas: um parse, um registro por forma.
+# Cada registro lê altura, peso, habilidades e efetividade da aba com o seu nome pelos
+# helpers do spider; sem aba correspondente vale a página inteira (como no parse_details).
+# A cadeia evolutiva é da página: cada forma ganha a sua cópia da do Pokémon base.
+def parse_forms(spider, response, records):
+    basics = form_tabs(response, "tabset-basics")
+    typedefs = form_tabs(response, "tabset-typedefcol")
+    fields = scan_detail_page(response) if spider.fast_path else None
+
+    base = records[0]
+    spider.build_evolution_stages(response, base)
+    for record in records:
+        label = record.form or record.name
+        vitals = basics.get(label)
+        types_panel = typedefs.get(label)
+        spider.parse_height_weight(vitals or response, record, fields if vitals is None else None)
+        spider.parse_effectiveness(types_panel or response, record, fields if types_panel is None else None)
+        if record is not base:
+            record.evolution_stages = [dict(stage) for stage in base.evolution_stages]
+            record.evolutions = [dict(evolution) for evolution in base.evolutions]
+        refs = spider.ability_refs(vitals or response, fields if vitals is None else None)
+        yield from spider.parse_abilities(response, record, refs)
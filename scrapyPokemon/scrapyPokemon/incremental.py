@@ -0,0 +1,51 @@
+# Estado do recrawl incremental: validadores HTTP, hash do conteúdo e último item por URL
+
+import json
+import os
+
+
+class IncrementalState:
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}  # url -> {"etag", "last_modified", "hash", "item"}
+
+    def load(self):
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.pages = json.load(f)
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    # Cabeçalhos condicionais a partir do que o servidor respondeu no último crawl
+    def conditional_headers(self, url):
+        page = self.pages.get(url) or {}
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    # Atualiza validadores e hash; retorna True se o conteúdo mudou (ou é novo)
+    def update_validators(self, url, etag, last_modified, body_hash):
+        page = self.pages.setdefault(url, {})
+        changed = page.get("hash") != body_hash
+        page["etag"] = etag
+        page["last_modified"] = last_modified
+        page["hash"] = body_hash
+        return changed
+
+    def item_for(self, url):
+        return (self.pages.get(url) or {}).get("item")
+
+    def remember_item(self, url, item):
+        self.pages.setdefault(url, {})["item"] = item
@@ -3,10 +3,123 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
-import scrapy
+import sys
+from dataclasses import dataclass, field
+from typing import Optional
 
+from scrapyPokemon.pokemon_types import ATTACK_TYPES
 
-class ScrapypokemonItem(scrapy.Item):
-    # define the fields for your item here like:
-    # name = scrapy.Field()
-    pass
+# Multiplicadores conhecidos; cada tipo de ataque guarda só o índice (1 byte) nesta tabela.
+# A tabela é fixa: um valor fora dela faz o item guardar o dict como veio (extra_effectiveness).
+MULTIPLIERS = (1.0, 0.0, 0.25, 0.5, 2.0, 4.0)
+_MULTIPLIER_CODE = {m: i for i, m in enumerate(MULTIPLIERS)}
+
+
+# Índice do multiplicador em MULTIPLIERS; None se não estiver na tabela
+def multiplier_code(multiplier):
+    return _MULTIPLIER_CODE.get(multiplier)
+
+
+# Id da pokedex ("0025", "#25", 25) como inteiro; None se não for numérico
+def to_int_id(x):
+    if x is None:
+        return None
+    s = str(x).replace("#", "").strip()
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+# Nomes repetidos em milhares de registros (tipos, habilidades, métodos) viram uma só string
+def intern(text):
+    return sys.intern(text) if isinstance(text, str) else text
+
+
+# Chave de um registro: a URL de detalhe e, para formas alternativas (Mega, Alola...) que
+# dividem a mesma página com o Pokémon base, o nome da forma
+def record_key(link, form=None):
+    return f"{link}#{form}" if form else link
+
+
+# Pokémon em construção: sai da listagem, passa pela página de detalhe e fica esperando
+# as páginas de habilidade (via cb_kwargs e na fila do AbilityStore). Com __slots__ e a
+# efetividade em 18 bytes, cada registro em espera ocupa bem menos que o dict equivalente.
+# O item entregue aos pipelines continua sendo o dict de sempre (to_item).
+@dataclass(slots=True)
+class PokemonItem:
+    id: Optional[str] = None
+    name: Optional[str] = None
+    form: Optional[str] = None  # forma alternativa da listagem ("Mega Venusaur"); None = forma base
+    link: Optional[str] = None
+    types: tuple = ()
+    # Campos da página de detalhe (ficam fora do item se ela não foi lida)
+    detailed: bool = False
+    height: Optional[float] = None
+    weight: Optional[float] = None
+    effectiveness: Optional[bytes] = None  # um código de MULTIPLIERS por tipo, na ordem de ATTACK_TYPES
+    extra_effectiveness: Optional[dict] = None  # tabela fora do padrão do site: guarda o dict como veio
+    evolution_stages: list = field(default_factory=list)
+    evolutions: list = field(default_factory=list)
+    abilities_link: tuple = ()
+    abilities: dict = field(default_factory=dict)
+    pending: int = 0
+    gate_slot: Optional[object] = None  # vaga no DetailGate (dividida com as formas da página)
+
+    def key(self):
+        return record_key(self.link, self.form)
+
+    def set_types(self, types):
+        self.types = tuple(intern(t) for t in types)
+
+    def set_effectiveness(self, effectiveness):
+        codes = [multiplier_code(m) for m in effectiveness.values()]
+        if list(effectiveness) == ATTACK_TYPES and None not in codes:
+            self.effectiveness = bytes(codes)
+            self.extra_effectiveness = None
+        else:
+            self.effectiveness = None
+            self.extra_effectiveness = dict(effectiveness)
+
+    def get_effectiveness(self):
+        if self.effectiveness is not None:
+            return {t: MULTIPLIERS[code] for t, code in zip(ATTACK_TYPES, self.effectiveness)}
+        return dict(self.extra_effectiveness or {})
+
+    def set_abilities_link(self, links):
+        self.abilities_link = tuple(links)
+
+    def add_ability(self, name, description):
+        self.abilities[intern(name)] = description
+
+    # Campos da página de detalhe a partir de um item já montado (checkpoint)
+    def set_details(self, item):
+        self.detailed = True
+        self.height = item.get("height")
+        self.weight = item.get("weight")
+        self.set_effectiveness(item.get("effectiveness") or {})
+        self.evolution_stages = item.get("evolution_stages") or []
+        self.evolutions = item.get("evolutions") or []
+
+    # Campos vindos da listagem (/pokedex/all); "form" só aparece nas formas alternativas
+    def base_item(self):
+        item = {"id": self.id, "name": self.name}
+        if self.form is not None:
+            item["form"] = self.form
+        item["link"] = self.link
+        item["types"] = list(self.types)
+        return item
+
+    # Item final, com as mesmas chaves (e na mesma ordem) que o spider sempre produziu
+    def to_item(self):
+        item = self.base_item()
+        if not self.detailed:
+            return item
+        item["height"] = self.height
+        item["weight"] = self.weight
+        item["effectiveness"] = self.get_effectiveness()
+        item["evolution_stages"] = self.evolution_stages
+        item["evolutions"] = self.evolutions
+        item["abilities_link"] = list(self.abilities_link)
+        item["abilities"] = self.abilities
+        return item
@@ -3,11 +3,34 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import cProfile
+import hashlib
+import json
+import logging
+import os
+import pstats
+import random
+import resource
+import sys
+import time
+import types
+from collections import defaultdict
+
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Headers, TextResponse
+from scrapy.responsetypes import responsetypes
+from scrapy.selector import Selector
+from twisted.internet import task
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from scrapyPokemon.corpus import load_page, save_page
+from scrapyPokemon.throttle import ThrottleController, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
 
 class ScrapypokemonSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -54,47 +77,515 @@ class ScrapypokemonSpiderMiddleware:
 
 
 class ScrapypokemonDownloaderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the downloader middleware does not modify the
-    # passed objects.
+    # Grava (record) ou reproduz (replay) as respostas do spider a partir de
+    # um corpus em disco, para rodar e medir o PokemonSpider sem rede.
+    #
+    # POKEDEX_CORPUS_MODE = "record" -> salva toda resposta recebida
+    # POKEDEX_CORPUS_MODE = "replay" -> responde só com o corpus, sem rede
+    #
+    # No replay a resposta sai direto do process_request, então a requisição
+    # nunca entra no slot do downloader e o DOWNLOAD_DELAY não é aplicado.
+
+    def __init__(self, mode, corpus_dir, stats=None):
+        self.mode = mode
+        self.corpus_dir = corpus_dir
+        self.stats = stats
 
     @classmethod
     def from_crawler(cls, crawler):
-        # This method is used by Scrapy to create your spiders.
-        s = cls()
+        mode = crawler.settings.get("POKEDEX_CORPUS_MODE")
+        if not mode:
+            raise NotConfigured
+        if mode not in ("record", "replay"):
+            raise NotConfigured(f"POKEDEX_CORPUS_MODE inválido: {mode!r}")
+
+        s = cls(mode, crawler.settings.get("POKEDEX_CORPUS_DIR", "corpus"), crawler.stats)
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
         return s
 
     def process_request(self, request, spider):
-        # Called for each request that goes through the downloader
-        # middleware.
-
-        # Must either:
-        # - return None: continue processing this request
-        # - or return a Response object
-        # - or return a Request object
-        # - or raise IgnoreRequest: process_exception() methods of
-        #   installed downloader middleware will be called
+        if self.mode != "replay":
+            return None
+
+        page = load_page(self.corpus_dir, request.url)
+        if page is None:
+            self._inc_stats("corpus/replay/miss")
+            raise IgnoreRequest(f"URL fora do corpus: {request.url}")
+
+        self._inc_stats("corpus/replay/hit")
+        headers = Headers(page["headers"])
+        respcls = responsetypes.from_args(headers=headers, url=page["url"], body=page["body"])
+        return respcls(
+            url=page["url"],
+            status=page["status"],
+            headers=headers,
+            body=page["body"],
+            flags=["replay"],
+            request=request,
+        )
+
+    def process_response(self, request, response, spider):
+        if self.mode != "record" or "replay" in response.flags:
+            return response
+
+        # O corpo já chega descomprimido aqui, então descartamos os
+        # cabeçalhos de transferência para o replay não tentar decodificar de novo
+        headers = {
+            k.decode("latin-1"): [v.decode("latin-1") for v in vs]
+            for k, vs in response.headers.items()
+            if k.lower() not in (b"content-encoding", b"content-length", b"transfer-encoding")
+        }
+
+        # Grava também nas URLs originais de um redirect para o replay achar a página
+        for key_url in [request.url] + request.meta.get("redirect_urls", []):
+            save_page(self.corpus_dir, response.url, response.status, headers,
+                      response.body, key_url=key_url)
+        self._inc_stats("corpus/record/saved")
+        self._inc_stats("corpus/record/bytes", len(response.body))
+        return response
+
+    def _inc_stats(self, key, count=1):
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
+
+    def spider_opened(self, spider):
+        spider.logger.info("Corpus em modo %s: %s" % (self.mode, self.corpus_dir))
+
+
+class IncrementalCrawlMiddleware:
+    # Recrawl incremental: manda requisições condicionais (If-None-Match /
+    # If-Modified-Since) para as páginas marcadas com meta["incremental"] e
+    # marca a resposta com a flag "unchanged" quando o servidor responde 304
+    # ou quando o corpo tem o mesmo hash do último crawl.
+    # O estado fica em spider.incremental (IncrementalState).
+
+    def __init__(self, stats=None):
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("INCREMENTAL_ENABLED"):
+            raise NotConfigured
+        return cls(crawler.stats)
+
+    def process_request(self, request, spider):
+        state = getattr(spider, "incremental", None)
+        if state is None or not request.meta.get("incremental"):
+            return None
+
+        for name, value in state.conditional_headers(request.url).items():
+            request.headers.setdefault(name, value)
         return None
 
     def process_response(self, request, response, spider):
-        # Called with the response returned from the downloader.
+        state = getattr(spider, "incremental", None)
+        if state is None or not request.meta.get("incremental"):
+            return response
+
+        if response.status == 304:
+            self._inc_stats("incremental/not_modified")
+            return response.replace(flags=response.flags + ["unchanged"])
+
+        if response.status != 200:
+            return response
+
+        changed = state.update_validators(
+            request.url,
+            self._header(response, b"ETag"),
+            self._header(response, b"Last-Modified"),
+            hashlib.sha1(response.body).hexdigest(),
+        )
+        if changed:
+            self._inc_stats("incremental/changed")
+            return response
+
+        self._inc_stats("incremental/same_hash")
+        return response.replace(flags=response.flags + ["unchanged"])
+
+    @staticmethod
+    def _header(response, name):
+        value = response.headers.get(name)
+        return value.decode("latin-1") if value else None
 
-        # Must either;
-        # - return a Response object
-        # - return a Request object
-        # - or raise IgnoreRequest
+    def _inc_stats(self, key):
+        if self.stats is not None:
+            self.stats.inc_value(key)
+
+
+class AdaptiveThrottleMiddleware:
+    # Ajusta concorrência e atraso de cada slot do downloader conforme a saúde do servidor
+    # (latência das respostas, 429/5xx, exceções de download e Retry-After), no lugar do
+    # DOWNLOAD_DELAY fixo; o DOWNLOAD_DELAY e o CONCURRENT_REQUESTS_PER_DOMAIN passam a ser
+    # só o ponto de partida. Fica depois do RetryMiddleware (550) para ver a resposta ou a
+    # exceção original antes de virar um retry.
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if settings.getbool("AUTOTHROTTLE_ENABLED"):
+            logger.warning("AUTOTHROTTLE_ENABLED e ADAPTIVE_THROTTLE_ENABLED ligados juntos; "
+                           "os dois vão brigar pelo atraso dos slots")
+
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.debug = settings.getbool("ADAPTIVE_THROTTLE_DEBUG")
+        self.options = {
+            "min_concurrency": settings.getint("ADAPTIVE_THROTTLE_MIN_CONCURRENCY", 1),
+            "max_concurrency": settings.getint("ADAPTIVE_THROTTLE_MAX_CONCURRENCY", 8),
+            "min_delay": settings.getfloat("ADAPTIVE_THROTTLE_MIN_DELAY", 0.0),
+            "max_delay": settings.getfloat("ADAPTIVE_THROTTLE_MAX_DELAY", 30.0),
+            "target_latency": settings.getfloat("ADAPTIVE_THROTTLE_TARGET_LATENCY", 1.0),
+            "max_error_rate": settings.getfloat("ADAPTIVE_THROTTLE_MAX_ERROR_RATE", 0.05),
+            "window": settings.getint("ADAPTIVE_THROTTLE_WINDOW", 10),
+        }
+        self.controllers = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("ADAPTIVE_THROTTLE_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def process_response(self, request, response, spider):
+        retry_after = None
+        if response.status in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if response.status == 429 or response.status >= 500:
+            self.stats.inc_value(f"throttle/status/{response.status}")
+        self._observe(request, spider, request.meta.get("download_latency"), response.status, retry_after)
         return response
 
+    # Timeout, conexão recusada etc. contam como erro na janela do slot
     def process_exception(self, request, exception, spider):
-        # Called when a download handler or a process_request()
-        # (from other downloader middleware) raises an exception.
+        if isinstance(exception, IgnoreRequest):
+            return None
+        self.stats.inc_value(f"throttle/exception/{type(exception).__name__}")
+        self._observe(request, spider, None, None)
+        return None
 
-        # Must either:
-        # - return None: continue processing this exception
-        # - return a Response object: stops process_exception() chain
-        # - return a Request object: stops process_exception() chain
-        pass
+    def _observe(self, request, spider, latency, status, retry_after=None):
+        # Resposta do corpus (replay) ou de cache nunca passou por um slot
+        key = request.meta.get("download_slot")
+        slot = self.crawler.engine.downloader.slots.get(key) if key is not None else None
+        if slot is None:
+            return
+
+        controller = self.controllers.get(key)
+        if controller is None:
+            controller = ThrottleController(slot.concurrency, slot.delay, **self.options)
+            self.controllers[key] = controller
+
+        old = (controller.concurrency, controller.delay)
+        decision = controller.observe(latency, status, retry_after)
+        slot.concurrency = controller.concurrency
+        slot.delay = controller.delay
+        if decision is None:
+            return
+
+        self.stats.inc_value(f"throttle/decision/{decision}")
+        self.stats.set_value("throttle/concurrency", controller.concurrency)
+        self.stats.max_value("throttle/concurrency_max", controller.concurrency)
+        self.stats.set_value("throttle/delay_ms", round(controller.delay * 1000))
+        if controller.latency is not None:
+            self.stats.set_value("throttle/latency_ms", round(controller.latency * 1000))
+        if retry_after is not None:
+            self.stats.max_value("throttle/retry_after_max_s", retry_after)
+
+        if self.debug and (controller.concurrency, controller.delay) != old:
+            logger.info(
+                "throttle %(slot)s: %(decision)s conc %(old_conc)d -> %(conc)d, "
+                "delay %(old_delay).0f -> %(delay).0f ms, latência %(latency).0f ms",
+                {
+                    "slot": key,
+                    "decision": decision,
+                    "old_conc": old[0],
+                    "conc": controller.concurrency,
+                    "old_delay": old[1] * 1000,
+                    "delay": controller.delay * 1000,
+                    "latency": (controller.latency or 0) * 1000,
+                },
+                extra={"spider": spider},
+            )
+
+
+# Resident set atual em MB (Linux); fora do Linux usa o pico como aproximação
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# Tempo de parede e de CPU acumulados de uma função
+class Timing:
+    __slots__ = ("calls", "wall", "cpu")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def add(self, wall, cpu):
+        self.wall += wall
+        self.cpu += cpu
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "wall_s": round(self.wall, 6),
+            "cpu_s": round(self.cpu, 6),
+            "wall_ms_per_call": round(self.wall * 1000 / self.calls, 4) if self.calls else None,
+        }
+
+
+# Selector que soma o tempo das avaliações xpath (o css vira xpath por dentro) num Timing;
+# os seletores filhos saem da mesma classe, então a contagem segue pela árvore
+def timed_selector_class(timing):
+    class TimedSelector(Selector):
+        def xpath(self, *args, **kwargs):
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return super().xpath(*args, **kwargs)
+            finally:
+                timing.calls += 1
+                timing.add(time.perf_counter() - wall, time.thread_time() - cpu)
+
+    return TimedSelector
+
+
+# Tipo da página pela requisição (o mesmo critério que o spider usa para montá-las)
+def page_type(request):
+    if request.url.endswith("/robots.txt"):
+        return "robots"
+    if request.meta.get("pokemon_detail"):
+        return "detail"
+    if "ability_url" in request.meta:
+        return "ability"
+    return "listing"
+
+
+class CrawlProfilerMiddleware:
+    # Instrumenta o crawl para dizer onde o tempo vai: rede, seletores ou memória.
+    #   - tempo de parede/CPU por callback (request.callback), medido em cada passo da saída
+    #     do callback; callbacks async (parse_details_pooled) contam só o tempo no reactor
+    #   - quantas avaliações de seletor (xpath/css) e quanto tempo dentro delas: cada
+    #     resposta que passa por aqui ganha um Selector cronometrado, nada global é trocado
+    #   - bytes e latência de download por tipo de página (listing, detail, ability, robots)
+    #   - amostras periódicas de itens parciais em espera, requisições em andamento e RSS
+    # Fica o mais perto possível do spider (ordem alta em SPIDER_MIDDLEWARES) para medir só
+    # o callback. No spider_closed grava um relatório JSON em CRAWL_PROFILE_PATH. Com
+    # CRAWL_PROFILE_SAMPLE_RATE > 0, essa fração das respostas roda o callback sob cProfile,
+    # o resultado vai para CRAWL_PROFILE_CPROFILE_PATH (abra com pstats ou snakeviz) e o
+    # relatório ganha o tempo dos helpers do spider nessas amostras.
+    HELPERS = ("build_evolution_stages", "parse_evolution_chains", "parse_effectiveness",
+               "parse_height_weight", "parse_abilities", "parse_forms")
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.report_path = settings.get("CRAWL_PROFILE_PATH")
+        self.sample_rate = settings.getfloat("CRAWL_PROFILE_SAMPLE_RATE", 0.0)
+        self.cprofile_path = settings.get("CRAWL_PROFILE_CPROFILE_PATH")
+        self.interval = settings.getfloat("CRAWL_PROFILE_INTERVAL", 1.0)
+
+        self.timings = defaultdict(Timing)
+        self.selector = Timing()
+        self.selector_class = timed_selector_class(self.selector)
+        self.pages = defaultdict(lambda: {"responses": 0, "bytes": 0, "latency_s": 0.0})
+        self.samples = []
+        self.profiler = cProfile.Profile() if self.sample_rate > 0 else None
+        self.profiled_calls = 0
+        self._profiling = False
+        self._random = random.Random(0)
+        self._loop = None
+        self._start = None
+        self._start_cpu = None
+        self._start_rss = None
+
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(self.response_received, signal=signals.response_received)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("CRAWL_PROFILE_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
 
     def spider_opened(self, spider):
-        spider.logger.info("Spider opened: %s" % spider.name)
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_rss = current_rss_mb()
+        self._loop = task.LoopingCall(self._sample, spider)
+        self._loop.start(self.interval, now=True)
+
+    def spider_closed(self, spider, reason):
+        if self._loop is not None and self._loop.running:
+            self._loop.stop()
+        self._sample(spider)
+
+        report = self._report(reason, spider)
+        stats = self.crawler.stats
+        stats.set_value("profile/diagnosis", report["diagnosis"])
+        stats.set_value("profile/reactor_busy_share", report["summary"]["reactor_busy_share"])
+        stats.set_value("profile/selector_calls", self.selector.calls)
+
+        if self.report_path:
+            directory = os.path.dirname(self.report_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if self.profiler is not None and self.cprofile_path and self.profiled_calls:
+            self.profiler.dump_stats(self.cprofile_path)
+
+        logger.info("perfil do crawl: %(diagnosis)s (reactor ocupado %(busy).0f%%, seletores %(sel).0f%% "
+                    "dos callbacks, pico de %(partial)d itens parciais)%(path)s",
+                    {"diagnosis": report["diagnosis"],
+                     "busy": report["summary"]["reactor_busy_share"] * 100,
+                     "sel": report["summary"]["selector_share_of_callbacks"] * 100,
+                     "partial": report["summary"]["peak_partial_items"],
+                     "path": f", relatório em {self.report_path}" if self.report_path else ""},
+                    extra={"spider": spider})
+
+    def response_received(self, response, request, spider):
+        page = self.pages[page_type(request)]
+        page["responses"] += 1
+        page["bytes"] += len(response.body)
+        page["latency_s"] += request.meta.get("download_latency") or 0.0
+
+    # Seletor cronometrado só nesta resposta (o TextResponse cria o seu sob demanda)
+    def process_spider_input(self, response, spider):
+        if isinstance(response, TextResponse) and response._cached_selector is None:
+            response._cached_selector = self.selector_class(response)
+        return None
+
+    def process_spider_output(self, response, result, spider):
+        timing, profile = self._start_call(response)
+        while True:
+            try:
+                value = self._timed(timing, profile, next, result)
+            except StopIteration:
+                return
+            yield value
+
+    async def process_spider_output_async(self, response, result, spider):
+        timing, profile = self._start_call(response)
+        iterator = result.__aiter__()
+        while True:
+            try:
+                value = await self._timed_await(timing, profile, iterator.__anext__())
+            except StopAsyncIteration:
+                return
+            yield value
+
+    def _start_call(self, response):
+        callback = getattr(response.request, "callback", None)
+        timing = self.timings[getattr(callback, "__name__", None) or "parse"]
+        timing.calls += 1
+        profile = (self.profiler is not None and not self._profiling
+                   and self._random.random() < self.sample_rate)
+        if profile:
+            self.profiled_calls += 1
+        return timing, profile
+
+    def _timed(self, timing, profile, fn, *args):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        if profile:
+            self._profiling = True
+            self.profiler.enable()
+        try:
+            return fn(*args)
+        finally:
+            if profile:
+                self.profiler.disable()
+                self._profiling = False
+            timing.add(time.perf_counter() - wall, time.thread_time() - cpu)
+
+    # Espera um awaitable medindo só os trechos que rodam no reactor, não o tempo parado
+    # esperando o pool de parse (parse_details_pooled) ou a rede
+    @types.coroutine
+    def _timed_await(self, timing, profile, awaitable):
+        it = awaitable.__await__()
+        step, value = it.send, None
+        while True:
+            try:
+                signal = self._timed(timing, profile, step, value)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value = yield signal
+                step = it.send
+            except BaseException as error:
+                value = error
+                step = it.throw
+
+    def _sample(self, spider):
+        engine = self.crawler.engine
+        downloader = getattr(engine, "downloader", None)
+        self.samples.append({
+            "t": round(time.perf_counter() - self._start, 3),
+            "partial_items": getattr(spider, "partial_items", None),
+            "downloading": len(downloader.active) if downloader is not None else None,
+            "rss_mb": round(current_rss_mb(), 1),
+        })
+
+    # Tempo acumulado dos helpers do spider (e do forms.py) nas chamadas amostradas pelo cProfile
+    def _helper_timings(self, spider):
+        if self.profiler is None or not self.profiled_calls:
+            return {}
+        files = {sys.modules[type(spider).__module__].__file__, sys.modules["scrapyPokemon.forms"].__file__}
+        helpers = {}
+        for (filename, _, name), (_, calls, own, cumulative, _) in pstats.Stats(self.profiler).stats.items():
+            if filename in files and name in self.HELPERS:
+                helpers[name] = {"calls": calls, "own_s": round(own, 6), "cumulative_s": round(cumulative, 6)}
+        return helpers
+
+    def _report(self, reason, spider):
+        elapsed = time.perf_counter() - self._start
+        callbacks_wall = sum(t.wall for t in self.timings.values())
+        busy = callbacks_wall / elapsed if elapsed else 0.0
+        selector_share = self.selector.wall / callbacks_wall if callbacks_wall else 0.0
+        latency = sum(p["latency_s"] for p in self.pages.values())
+        responses = sum(p["responses"] for p in self.pages.values())
+        peak_partial = max((s["partial_items"] or 0 for s in self.samples), default=0)
+        peak_rss = max((s["rss_mb"] for s in self.samples), default=0.0)
+        rss_growth = peak_rss - self._start_rss
+
+        # Heurística: o reactor passou mais da metade do crawl parseando -> CPU (seletores
+        # se eles dominam os callbacks); memória crescendo junto com itens parciais -> memória;
+        # senão o crawl passou a maior parte do tempo esperando a rede
+        if busy > 0.5:
+            diagnosis = "selector-bound" if selector_share > 0.5 else "cpu-bound"
+        elif rss_growth > 256 and peak_partial > 0:
+            diagnosis = "memory-bound"
+        else:
+            diagnosis = "network-bound"
+
+        return {
+            "reason": reason,
+            "diagnosis": diagnosis,
+            "summary": {
+                "elapsed_s": round(elapsed, 3),
+                "process_cpu_s": round(time.process_time() - self._start_cpu, 3),
+                "callbacks_wall_s": round(callbacks_wall, 3),
+                "reactor_busy_share": round(busy, 4),
+                "selector_share_of_callbacks": round(selector_share, 4),
+                "responses": responses,
+                "mean_download_latency_s": round(latency / responses, 4) if responses else None,
+                "peak_partial_items": peak_partial,
+                "start_rss_mb": round(self._start_rss, 1),
+                "peak_rss_mb": peak_rss,
+                "profiled_calls": self.profiled_calls,
+            },
+            "callbacks": {name: timing.as_dict() for name, timing in sorted(self.timings.items())},
+            "helpers": self._helper_timings(spider),
+            "selectors": self.selector.as_dict(),
+            "pages": {
+                kind: {**page, "latency_s": round(page["latency_s"], 4)}
+                for kind, page in sorted(self.pages.items())
+            },
+            "samples": self.samples,
+        }
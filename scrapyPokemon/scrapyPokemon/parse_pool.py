@@ -0,0 +1,131 @@
+# Parse das páginas de detalhe em processos separados (PARSE_POOL_WORKERS > 0)
+#
+# O reactor do Twisted roda numa thread só; sem o throttle, montar a árvore HTML e rodar
+# os seletores da página de detalhe vira o gargalo e segura o downloader. Aqui o corpo da
+# resposta vai para um pool de processos que faz altura/peso, efetividades, cadeia
+# evolutiva e a lista de habilidades, e devolve um dict simples. O spider só aplica o
+# resultado no PokemonItem e segue com as requisições de habilidade.
+#
+# Fila limitada: no máximo max_pending páginas no pool; as outras esperam um lugar dentro
+# do próprio callback. Enquanto esperam, as respostas continuam contando no slot do
+# scraper, então o engine para de puxar requisições sozinho quando passa de
+# SCRAPER_SLOT_MAX_ACTIVE_SIZE e volta assim que elas saem (sem engine.pause, que só
+# voltava no próximo heartbeat do engine). Stats em parse_pool/*.
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from twisted.internet.defer import CancelledError, Deferred, DeferredSemaphore
+
+from scrapyPokemon.items import intern
+
+# Spider usado só como parser dentro de cada processo do pool
+_parser = None
+
+
+def init_worker():
+    global _parser
+    from scrapyPokemon.spiders.pokemon import PokemonSpider
+
+    _parser = PokemonSpider()
+
+
+# Roda no processo do pool: mesmo código do parse_details, saída em tipos simples
+def extract_details(url, body, encoding, base, fast_path=False):
+    from scrapy.http import HtmlResponse
+
+    from scrapyPokemon.fast_extract import scan_detail_page
+    from scrapyPokemon.items import PokemonItem
+
+    if _parser is None:
+        init_worker()
+    response = HtmlResponse(url=url, body=body, encoding=encoding)
+    attributes = PokemonItem(id=base.get("id"), name=base.get("name"), link=base.get("link"))
+    fields = scan_detail_page(response) if fast_path else None
+    _parser.parse_height_weight(response, attributes, fields)
+    _parser.parse_effectiveness(response, attributes, fields)
+    _parser.build_evolution_stages(response, attributes)
+    ability_names, ability_links = _parser.ability_refs(response, fields)
+    return {
+        "height": attributes.height,
+        "weight": attributes.weight,
+        "effectiveness": attributes.get_effectiveness(),
+        "evolution_stages": attributes.evolution_stages,
+        "evolutions": attributes.evolutions,
+        "ability_names": ability_names,
+        "ability_links": ability_links,
+    }
+
+
+# Aplica o resultado do pool no item (mesmo estado que o parse_details deixaria)
+def apply_details(attributes, details):
+    attributes.detailed = True
+    attributes.height = details["height"]
+    attributes.weight = details["weight"]
+    attributes.set_effectiveness(details["effectiveness"])
+    for evolution in details["evolutions"]:
+        evolution["method"] = intern(evolution["method"])
+    for stage in details["evolution_stages"][:1]:
+        stage["method_evolution"] = [intern(m) for m in stage["method_evolution"]]
+    attributes.evolution_stages = details["evolution_stages"]
+    attributes.evolutions = details["evolutions"]
+
+
+class ParsePool:
+    def __init__(self, workers, max_pending=0, start_method="spawn", stats=None, fast_path=False):
+        self.workers = workers
+        self.fast_path = fast_path
+        self.max_pending = max_pending or workers * 4
+        self.start_method = start_method
+        self.stats = stats
+        self.pending = 0
+        self._slots = DeferredSemaphore(self.max_pending)
+        self._executor = None
+
+    def start(self):
+        context = multiprocessing.get_context(self.start_method)
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=init_worker)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    # Manda a página para o pool quando houver lugar; o Deferred dispara no reactor com o
+    # dict de extract_details
+    def submit(self, response, attributes):
+        self._inc_stats("parse_pool/submitted")
+        if not self._slots.tokens:
+            self._inc_stats("parse_pool/waited")
+        d = self._slots.acquire()
+        d.addCallback(self._send, response.url, response.body, response.encoding, attributes.base_item())
+        return d
+
+    def _send(self, _, url, body, encoding, base):
+        from twisted.internet import reactor
+
+        if self._executor is None:
+            self._slots.release()
+            raise CancelledError()
+        self.pending += 1
+        if self.stats is not None:
+            self.stats.max_value("parse_pool/pending_max", self.pending)
+        d = Deferred()
+        future = self._executor.submit(extract_details, url, body, encoding, base, self.fast_path)
+        future.add_done_callback(lambda f: reactor.callFromThread(self._done, f, d))
+        return d
+
+    def _done(self, future, d):
+        self.pending -= 1
+        self._slots.release()
+
+        error = CancelledError() if future.cancelled() else future.exception()
+        if error is not None:
+            self._inc_stats("parse_pool/failed")
+            d.errback(error)
+        else:
+            d.callback(future.result())
+
+    def _inc_stats(self, key):
+        if self.stats is not None:
+            self.stats.inc_value(key)
@@ -4,10 +4,134 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
+import json
+import os
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.exceptions import NotConfigured
+
+from scrapyPokemon.columnar import item_to_row, pokedex_arrow_schema
+from scrapyPokemon.items import record_key
+from scrapyPokemon.pokemon_types import effectiveness_label
 
 
 class ScrapypokemonPipeline:
     def process_item(self, item, spider):
         return item
+
+
+class IncrementalDeltaPipeline:
+    # Compara cada item com o último crawl (spider.incremental) e grava em
+    # INCREMENTAL_DELTA_PATH, em JSON Lines, só os Pokémon novos ou alterados.
+    # Assim os loaders podem processar apenas o delta.
+
+    def __init__(self, delta_path, stats=None):
+        self.delta_path = delta_path
+        self.stats = stats
+        self.file = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("INCREMENTAL_ENABLED"):
+            raise NotConfigured
+        return cls(crawler.settings.get("INCREMENTAL_DELTA_PATH"), crawler.stats)
+
+    def open_spider(self, spider):
+        directory = os.path.dirname(self.delta_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.delta_path, "w", encoding="utf-8")
+
+    def close_spider(self, spider):
+        self.file.close()
+
+    def process_item(self, item, spider):
+        state = getattr(spider, "incremental", None)
+        if state is None:
+            return item
+
+        current = ItemAdapter(item).asdict()
+        key = record_key(current.get("link"), current.get("form"))
+        previous = state.item_for(key)
+
+        if previous == current:
+            self.stats.inc_value("incremental/delta/unchanged")
+            return item
+
+        status = "added" if previous is None else "changed"
+        self.file.write(json.dumps(current, ensure_ascii=False) + "\n")
+        self.stats.inc_value(f"incremental/delta/{status}")
+        state.remember_item(key, current)
+        return item
+
+
+class ParquetExportPipeline:
+    # Grava os Pokémon num arquivo Parquet (PARQUET_EXPORT_PATH) conforme o crawl
+    # avança, um row group a cada PARQUET_ROW_GROUP_SIZE itens. Esquema em columnar.py.
+    # Roda antes do EffectivenessLabelPipeline: a efetividade chega como multiplicador.
+
+    def __init__(self, path, row_group_size, stats=None):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.stats = stats
+        self.rows = []
+        self.schema = None
+        self.writer = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        path = crawler.settings.get("PARQUET_EXPORT_PATH")
+        if not path:
+            raise NotConfigured
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise NotConfigured("PARQUET_EXPORT_PATH precisa do pyarrow (pip install pyarrow)")
+        return cls(path, crawler.settings.getint("PARQUET_ROW_GROUP_SIZE", 128), crawler.stats)
+
+    def open_spider(self, spider):
+        import pyarrow.parquet as pq
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.schema = pokedex_arrow_schema()
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+    def close_spider(self, spider):
+        self._flush()
+        self.writer.close()
+
+    def process_item(self, item, spider):
+        self.rows.append(item_to_row(ItemAdapter(item).asdict()))
+        if len(self.rows) >= self.row_group_size:
+            self._flush()
+        return item
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if not self.rows:
+            return
+        table = pa.Table.from_pylist(self.rows, schema=self.schema)
+        self.writer.write_table(table, row_group_size=self.row_group_size)
+        if self.stats is not None:
+            self.stats.inc_value("parquet/row_groups")
+            self.stats.inc_value("parquet/rows", len(self.rows))
+        self.rows = []
+
+
+class EffectivenessLabelPipeline:
+    # O spider guarda a efetividade como multiplicador numérico; os rótulos em
+    # português ("super efetivo", "pouco efetivo"...) só são gerados aqui, na saída.
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        effectiveness = adapter.get("effectiveness")
+        if effectiveness:
+            adapter["effectiveness"] = {
+                t: effectiveness_label(m) if isinstance(m, (int, float)) else m
+                for t, m in effectiveness.items()
+            }
+        return item
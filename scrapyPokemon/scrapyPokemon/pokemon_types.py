@@ -0,0 +1,59 @@
+# Tipos de ataque na ordem da tabela de efetividade do pokemondb.net
+
+ATTACK_TYPES = [
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice",
+    "Fighting", "Poison", "Ground", "Flying", "Psychic", "Bug",
+    "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+]
+
+
+# Formata as efetividades dos tipos
+def format_effectiveness(txt: str) -> str:
+    if not txt:
+        return "neutro"
+    return (txt.replace("½", "pouco efetivo")
+               .replace("¼", "quase não efetivo")
+               .replace("0", "nulo")
+               .replace("2", "super efetivo"))
+
+
+# Texto da tabela do site -> multiplicador numérico ("" -> 1, "½" -> 0.5, "1½" -> 1.5)
+# Texto que não é um multiplicador devolve None (quem chama decide se ignora a célula)
+def parse_multiplier(txt: str):
+    txt = (txt or "").strip()
+    if not txt:
+        return 1.0
+    try:
+        if txt.endswith("½") or txt.endswith("¼"):
+            whole = float(txt[:-1]) if txt[:-1] else 0.0
+            return whole + (0.5 if txt.endswith("½") else 0.25)
+        return float(txt)
+    except ValueError:
+        return None
+
+
+# Multiplicador -> texto como o site escreve (inverso de parse_multiplier)
+# O site usa frações só em ½, ¼ e 1½; o resto aparece em decimal (ex.: 2.5)
+FRACTION_TEXT = {1.0: "", 0.5: "½", 0.25: "¼", 1.5: "1½"}
+
+def multiplier_text(multiplier: float) -> str:
+    multiplier = float(multiplier)
+    if multiplier in FRACTION_TEXT:
+        return FRACTION_TEXT[multiplier]
+    return f"{multiplier:g}"
+
+
+# Rótulo de saída ("super efetivo", "pouco efetivo"...) derivado do multiplicador
+def effectiveness_label(multiplier: float) -> str:
+    return format_effectiveness(multiplier_text(multiplier))
+
+
+# Rótulo já formatado -> multiplicador (para ler os JSON antigos)
+def label_to_multiplier(label: str) -> float:
+    if label == "neutro":
+        return 1.0
+    txt = (label.replace("super efetivo", "2")
+                .replace("nulo", "0")
+                .replace("quase não efetivo", "¼")
+                .replace("pouco efetivo", "½"))
+    return parse_multiplier(txt)
@@ -0,0 +1,120 @@
+# Ordem das requisições do spider: termina os Pokémon já começados antes de abrir novos
+#
+# O parse da listagem entrega ~1000 páginas de detalhe de uma vez; sem controle, as
+# requisições de habilidade entram na fila atrás de todas elas e centenas de itens
+# ficam pela metade na memória. O DetailGate segura as requisições de detalhe e só
+# libera uma nova quando há menos de max_open páginas abertas (detalhe pedido e algum
+# item da página, base ou forma, ainda não entregue). As requisições de habilidade vão
+# com prioridade maior.
+# Stats em items/*: abertos (atual e pico), tempo até o 1º item, latência de conclusão
+# (da saída da requisição de detalhe até o item) e pico de RSS do processo.
+
+import resource
+import sys
+import time
+from collections import deque
+
+
+# Vaga de uma página de detalhe no gate: o Pokémon base e as formas que saem da mesma
+# página dividem a vaga, que só fecha quando o último deles termina
+class GateSlot:
+    __slots__ = ("link", "started_at", "left")
+
+    def __init__(self, link, started_at, left):
+        self.link = link
+        self.started_at = started_at
+        self.left = left
+
+
+def detail_records(request):
+    attributes = request.cb_kwargs.get("attributes")
+    records = [attributes] if attributes is not None else []
+    return records + list(request.cb_kwargs.get("forms") or ())
+
+
+class DetailGate:
+    def __init__(self, max_open=0, stats=None):
+        self.max_open = max_open  # 0 = sem limite
+        self.stats = stats
+        self.backlog = deque()
+        self.slots = set()
+        self.peak_open = 0
+        self.latencies = []
+        self.started_at = time.monotonic()
+        self.first_item_at = None
+
+    @property
+    def open(self):
+        return len(self.slots)
+
+    def start(self):
+        self.started_at = time.monotonic()
+
+    def push(self, request):
+        self.backlog.append(request)
+
+    # Requisições de detalhe que podem sair agora
+    def release(self):
+        released = []
+        while self.backlog and (self.max_open <= 0 or self.open < self.max_open):
+            request = self.backlog.popleft()
+            records = detail_records(request)
+            if records:
+                slot = GateSlot(request.url, time.monotonic(), len(records))
+                for record in records:
+                    record.gate_slot = slot
+                self.slots.add(slot)
+            released.append(request)
+        self.peak_open = max(self.peak_open, self.open)
+        if self.stats is not None:
+            self.stats.set_value("items/in_flight", self.open)
+            self.stats.max_value("items/in_flight_max", self.open)
+            self.stats.set_value("items/detail_backlog", len(self.backlog))
+        return released
+
+    # Registro terminou: item entregue, ou a página de detalhe falhou/foi descartada
+    # (delivered=False). Registros que não saíram pelo gate (retomados do checkpoint) não
+    # contam, e cada registro só conta uma vez.
+    def finished(self, attributes, delivered=True):
+        slot = attributes.gate_slot
+        if slot is None:
+            return
+        attributes.gate_slot = None
+        now = time.monotonic()
+        if delivered:
+            self.latencies.append(now - slot.started_at)
+            if self.first_item_at is None:
+                self.first_item_at = now
+        slot.left -= 1
+        if slot.left > 0:
+            return
+        self.slots.discard(slot)
+        if self.stats is not None:
+            self.stats.set_value("items/in_flight", self.open)
+
+    # Requisição de detalhe que não vai gerar itens: todos os registros da página terminam
+    def finished_request(self, request):
+        for record in detail_records(request):
+            self.finished(record, delivered=False)
+
+    # Vagas ainda ocupadas (links) quando nada mais está em andamento: algum registro
+    # saiu do crawl sem passar por finished. Só serve para diagnóstico; as vagas continuam
+    # contando para o limite.
+    def leaked(self):
+        if self.stats is not None and self.slots:
+            self.stats.set_value("items/gate_leaked", len(self.slots))
+        return sorted(slot.link for slot in self.slots)
+
+    def report(self):
+        if self.stats is None:
+            return
+        if self.first_item_at is not None:
+            self.stats.set_value("items/first_item_s", round(self.first_item_at - self.started_at, 3))
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            for p in (50, 90, 99):
+                value = ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+                self.stats.set_value(f"items/completion_latency_p{p}_ms", round(value * 1000))
+            self.stats.set_value("items/completion_latency_max_ms", round(ordered[-1] * 1000))
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stats.set_value("items/peak_rss_mb", round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1))
@@ -22,6 +22,7 @@ ADDONS = {}
 ROBOTSTXT_OBEY = True
 
 # Concurrency and throttling settings
+# (com o ADAPTIVE_THROTTLE ligado, estes são só os valores iniciais de cada slot)
 #CONCURRENT_REQUESTS = 16
 CONCURRENT_REQUESTS_PER_DOMAIN = 1
 DOWNLOAD_DELAY = 1
@@ -40,15 +41,69 @@ DOWNLOAD_DELAY = 1
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
+SPIDER_MIDDLEWARES = {
 #    "scrapyPokemon.middlewares.ScrapypokemonSpiderMiddleware": 543,
-#}
+    "scrapyPokemon.middlewares.CrawlProfilerMiddleware": 950,
+}
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
-#    "scrapyPokemon.middlewares.ScrapypokemonDownloaderMiddleware": 543,
-#}
+DOWNLOADER_MIDDLEWARES = {
+    "scrapyPokemon.middlewares.ScrapypokemonDownloaderMiddleware": 543,
+    "scrapyPokemon.middlewares.IncrementalCrawlMiddleware": 550,
+    "scrapyPokemon.middlewares.AdaptiveThrottleMiddleware": 560,
+}
+
+# Corpus de respostas para rodar o spider offline
+# "record" grava toda resposta em POKEDEX_CORPUS_DIR, "replay" reproduz sem rede
+# Ex.: scrapy crawl pokemon -s POKEDEX_CORPUS_MODE=replay
+POKEDEX_CORPUS_MODE = None
+POKEDEX_CORPUS_DIR = "corpus"
+
+# Quantas famílias evolutivas já lidas ficam em cache (LRU) durante o crawl
+EVOLUTION_CACHE_SIZE = 256
+
+# Descrições de habilidades salvas entre crawls (None desliga a persistência)
+# e por quanto tempo, em segundos, cada descrição continua válida
+ABILITY_STORE_PATH = "cache/abilities.json"
+ABILITY_STORE_TTL = 7 * 24 * 3600
+
+# Recrawl incremental: requisições condicionais (ETag/Last-Modified) nas páginas de
+# detalhe, páginas sem mudança reaproveitam o último item e o delta (novos/alterados)
+# vai para INCREMENTAL_DELTA_PATH em JSON Lines
+# Ex.: scrapy crawl pokemon -s INCREMENTAL_ENABLED=True
+INCREMENTAL_ENABLED = False
+INCREMENTAL_STATE_PATH = "cache/incremental.json"
+INCREMENTAL_DELTA_PATH = "../data/pokedex_delta.jl"
+
+# Termina os Pokémon já começados antes de abrir novos: no máximo MAX_INFLIGHT_ITEMS
+# páginas de detalhe pedidas com itens (base e formas) ainda não entregues (0 = sem
+# limite), e as páginas de habilidade furam a fila com ABILITY_REQUEST_PRIORITY. Stats em
+# items/* (abertos, tempo até o 1º item, latência de conclusão, pico de RSS).
+# Ex.: scrapy crawl pokemon -s MAX_INFLIGHT_ITEMS=32
+MAX_INFLIGHT_ITEMS = 0
+ABILITY_REQUEST_PRIORITY = 10
+
+# Checkpoint em disco (log só de acréscimo) dos Pokémon completos, dos que esperam
+# habilidades e das habilidades já baixadas. Rodar de novo depois de um crash ou Ctrl+C
+# retoma de onde parou; um crawl que termina normalmente apaga o log. None desliga.
+# Ex.: scrapy crawl pokemon -s CHECKPOINT_PATH=cache/checkpoint.jl
+CHECKPOINT_PATH = None
+CHECKPOINT_FSYNC = False
+
+# Campos da página de detalhe (altura, peso, tipos, habilidades) lidos numa passada só
+# pela árvore lxml em vez dos seletores :contains() (ver fast_extract.py)
+DETAIL_FAST_PATH = False
+
+# Parse das páginas de detalhe num pool de processos (0 desliga; útil sem throttle,
+# quando o parse vira o gargalo do reactor). No máximo MAX_PENDING páginas no pool
+# (0 = 4 por processo); as outras esperam no callback e seguram o engine pelo limite
+# do scraper (SCRAPER_SLOT_MAX_ACTIVE_SIZE). Desligado por padrão: só ganha de
+# PARSE_POOL_WORKERS=0 quando o parse é mais caro que a rede (medir com bench_parse_pool).
+# Ex.: scrapy crawl pokemon -s PARSE_POOL_WORKERS=4
+PARSE_POOL_WORKERS = 0
+PARSE_POOL_MAX_PENDING = 0
+PARSE_POOL_START_METHOD = "spawn"
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -56,11 +111,50 @@ DOWNLOAD_DELAY = 1
 #    "scrapy.extensions.telnet.TelnetConsole": None,
 #}
 
+# Throttle adaptativo (desligado: com ele o crawl pode passar de DOWNLOAD_DELAY e
+# CONCURRENT_REQUESTS_PER_DOMAIN até os limites abaixo): sobe a concorrência e baixa o
+# atraso enquanto a latência média fica abaixo de TARGET_LATENCY (segundos) e os erros
+# (429, 5xx, timeouts) abaixo de MAX_ERROR_RATE a cada WINDOW respostas; recua com latência
+# alta ou erros e respeita o Retry-After na hora.
+# Decisões em stats throttle/* (ADAPTIVE_THROTTLE_DEBUG=True loga cada mudança)
+# Ex.: scrapy crawl pokemon -s ADAPTIVE_THROTTLE_ENABLED=True
+ADAPTIVE_THROTTLE_ENABLED = False
+ADAPTIVE_THROTTLE_MIN_CONCURRENCY = 1
+ADAPTIVE_THROTTLE_MAX_CONCURRENCY = 4
+ADAPTIVE_THROTTLE_MIN_DELAY = 0.25
+ADAPTIVE_THROTTLE_MAX_DELAY = 30
+ADAPTIVE_THROTTLE_TARGET_LATENCY = 1.0
+ADAPTIVE_THROTTLE_MAX_ERROR_RATE = 0.05
+ADAPTIVE_THROTTLE_WINDOW = 10
+ADAPTIVE_THROTTLE_DEBUG = False
+
+# Perfil do crawl (CrawlProfilerMiddleware): tempo por callback, seletores, bytes por
+# tipo de página e itens parciais ao longo do tempo; relatório JSON no fim com o
+# diagnóstico (network-bound, selector-bound, cpu-bound ou memory-bound). SAMPLE_RATE > 0
+# roda essa fração dos callbacks sob cProfile (e o relatório ganha o tempo dos helpers).
+# Ex.: scrapy crawl pokemon -s CRAWL_PROFILE_ENABLED=True -s CRAWL_PROFILE_SAMPLE_RATE=0.1
+CRAWL_PROFILE_ENABLED = False
+CRAWL_PROFILE_PATH = "../data/crawl_profile.json"
+CRAWL_PROFILE_INTERVAL = 1.0
+CRAWL_PROFILE_SAMPLE_RATE = 0.0
+CRAWL_PROFILE_CPROFILE_PATH = "../data/crawl_profile.prof"
+
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "scrapyPokemon.pipelines.ScrapypokemonPipeline": 300,
-#}
+# O Parquet grava os multiplicadores numéricos do spider, antes dos rótulos; os rótulos
+# de efetividade vêm antes das saídas JSON, então feed e delta incremental gravam o mesmo
+# formato
+ITEM_PIPELINES = {
+    "scrapyPokemon.pipelines.ScrapypokemonPipeline": 300,
+    "scrapyPokemon.pipelines.ParquetExportPipeline": 650,
+    "scrapyPokemon.pipelines.EffectivenessLabelPipeline": 700,
+    "scrapyPokemon.pipelines.IncrementalDeltaPipeline": 800,
+}
+
+# Exportação colunar em Parquet (precisa do pyarrow; None desliga)
+# Ex.: scrapy crawl pokemon -s PARQUET_EXPORT_PATH=../data/pokedex.parquet
+PARQUET_EXPORT_PATH = None
+PARQUET_ROW_GROUP_SIZE = 128
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
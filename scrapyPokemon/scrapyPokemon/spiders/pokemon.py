@@ -1,16 +1,46 @@
 #pip install scrapy
 
 import re
-import scrapy
+from urllib.parse import urlparse
 
-# Formata as efetividades dos tipos
-def format_effectiveness(txt: str) -> str:
-    if not txt:
-        return "neutro"
-    return (txt.replace("½", "pouco efetivo")
-               .replace("¼", "quase não efetivo")
-               .replace("0", "nulo")
-               .replace("2", "super efetivo"))
+import scrapy
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from scrapy.utils.defer import maybe_deferred_to_future
+from lxml import etree
+
+from scrapyPokemon.caches import AbilityStore, EvolutionChainCache
+from scrapyPokemon.checkpoint import CheckpointLog
+from scrapyPokemon.fast_extract import scan_detail_page
+from scrapyPokemon.forms import parse_forms, row_form
+from scrapyPokemon.incremental import IncrementalState
+from scrapyPokemon.items import PokemonItem, intern
+from scrapyPokemon.parse_pool import ParsePool, apply_details
+from scrapyPokemon.scheduling import DetailGate
+from scrapyPokemon.pokemon_types import parse_multiplier
+
+# XPaths pré-compilados usados na leitura da cadeia evolutiva
+ENT_NAME_XPATH = etree.XPath("descendant::a[contains(concat(' ', normalize-space(@class), ' '), ' ent-name ')]")
+SMALL_TEXT_XPATH = etree.XPath("descendant::small//text()")
+TEXT_XPATH = etree.XPath("text()")
+NORMALIZED_TEXT_XPATH = etree.XPath("normalize-space(string(.))")
+
+# Seletor só das cadeias de nível mais alto (as listas aninhadas nos splits já são lidas junto)
+TOP_LEVEL_CHAINS = (
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' infocard-list-evo ')]"
+    "[not(ancestor::div[contains(concat(' ', normalize-space(@class), ' '), ' infocard-list-evo ')])]"
+)
+
+# Tipos de elemento da cadeia evolutiva (mesmo critério "contains(@class, ...)" do site)
+def is_card(el):
+    cls = el.get("class") or ""
+    return el.tag == "div" and "infocard" in cls and "infocard-list-evo" not in cls
+
+def is_arrow(el):
+    return el.tag == "span" and "infocard-arrow" in (el.get("class") or "")
+
+def is_split(el):
+    return el.tag == "span" and "infocard-evo-split" in (el.get("class") or "")
 
 class PokemonSpider(scrapy.Spider):
     name = "pokemon"
@@ -20,6 +50,96 @@ class PokemonSpider(scrapy.Spider):
     # REGEX para pegar o nivel do pokemon por exemplo: (level 16) -> 16
     LV_Regex = re.compile(r"\bLevel\s*(\d+)", re.I)
 
+    # REGEX para pegar o número do card da evolução por exemplo: #0133 -> 0133
+    ID_Regex = re.compile(r"#\s*(\d+)")
+
+    def __init__(self, *args, base_url=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evolution_cache = EvolutionChainCache()
+        self.ability_store = AbilityStore()
+        self.incremental = None
+        self.parse_pool = None
+        self.checkpoint = None
+        self.detail_gate = DetailGate()
+        self.ability_priority = 0
+        self.fast_path = False  # DETAIL_FAST_PATH: campos da página de detalhe via fast_extract
+        self.partial_items = 0  # itens esperando páginas de habilidade (lido pelo CrawlProfilerMiddleware)
+
+        # Permite apontar o crawl para um servidor local, ex.: -a base_url=http://127.0.0.1:8000
+        if base_url:
+            self.start_urls = [base_url.rstrip("/") + "/pokedex/all"]
+            self.allowed_domains = [urlparse(base_url).hostname]
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.evolution_cache = EvolutionChainCache(crawler.settings.getint("EVOLUTION_CACHE_SIZE", 256))
+        spider.ability_store = AbilityStore(
+            crawler.settings.get("ABILITY_STORE_PATH"),
+            crawler.settings.getint("ABILITY_STORE_TTL", 7 * 24 * 3600),
+        )
+        if crawler.settings.getbool("INCREMENTAL_ENABLED"):
+            spider.incremental = IncrementalState(crawler.settings.get("INCREMENTAL_STATE_PATH"))
+        if crawler.settings.get("CHECKPOINT_PATH"):
+            spider.checkpoint = CheckpointLog(
+                crawler.settings.get("CHECKPOINT_PATH"),
+                crawler.settings.getbool("CHECKPOINT_FSYNC"),
+            )
+        spider.fast_path = crawler.settings.getbool("DETAIL_FAST_PATH")
+        if crawler.settings.getint("PARSE_POOL_WORKERS") > 0:
+            spider.parse_pool = ParsePool(
+                crawler.settings.getint("PARSE_POOL_WORKERS"),
+                crawler.settings.getint("PARSE_POOL_MAX_PENDING"),
+                crawler.settings.get("PARSE_POOL_START_METHOD", "spawn"),
+                fast_path=spider.fast_path,
+            )
+        spider.detail_gate = DetailGate(crawler.settings.getint("MAX_INFLIGHT_ITEMS"))
+        spider.ability_priority = crawler.settings.getint("ABILITY_REQUEST_PRIORITY")
+        crawler.signals.connect(spider.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(spider.request_dropped, signal=signals.request_dropped)
+        crawler.signals.connect(spider.spider_error, signal=signals.spider_error)
+        return spider
+
+    # As stats do crawler só existem depois que o crawl começa
+    def spider_opened(self, spider):
+        self.evolution_cache.stats = self.crawler.stats
+        self.ability_store.stats = self.crawler.stats
+        self.ability_store.load()
+        self.detail_gate.stats = self.crawler.stats
+        self.detail_gate.start()
+        if self.incremental is not None:
+            self.incremental.load()
+        if self.checkpoint is not None:
+            self.checkpoint.stats = self.crawler.stats
+            self.checkpoint.load()
+            # Habilidades já baixadas antes da interrupção não são buscadas de novo
+            for url, description in self.checkpoint.descriptions.items():
+                self.ability_store.restore(url, description)
+        if self.parse_pool is not None:
+            self.parse_pool.stats = self.crawler.stats
+            self.parse_pool.start()
+
+    # Spider criado sem crawler (benchmarks chamam os callbacks direto) não tem stats
+    def _inc_stats(self, key, count=1):
+        crawler = getattr(self, "crawler", None)
+        if crawler is not None and crawler.stats is not None:
+            crawler.stats.inc_value(key, count)
+
+    # Guarda as descrições de habilidades e o estado incremental para o próximo crawl
+    def closed(self, reason):
+        self.detail_gate.report()
+        self.ability_store.save()
+        if self.incremental is not None:
+            self.incremental.save()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        if self.checkpoint is not None:
+            if reason == "finished":
+                self.checkpoint.clear()
+            else:
+                self.checkpoint.close()
+
     # Pega o ultimo segmento da url por exemplo https://pokemondb.net/pokedex/bulbasaur -> bulbasaur (para saber qual a proxima evolução)
     @staticmethod
     def slug_from_href(href: str) -> str:
@@ -40,106 +160,159 @@ class PokemonSpider(scrapy.Spider):
         return int(match.group(1)) if match else None
     
 
-    def parse_cards_conds(self, chain_sel, response):
-
-        def parse_card(card_sel):
-            # Extrai o nome do Pokémon
-            name = (card_sel.css("a.ent-name::text").get() or "").strip()
-
-             # Pega o href relativo do card (link para a página do Pokémon)
-            href = card_sel.css("a.ent-name::attr(href)").get() or ""
+    # Lê um card da cadeia (nome, link, slug e número) direto da árvore lxml
+    def parse_card(self, card, response):
+        # Extrai o nome do Pokémon e o href relativo do card
+        name, href = "", ""
+        ent_names = ENT_NAME_XPATH(card)
+        if ent_names:
+            texts = TEXT_XPATH(ent_names[0])
+            name = (texts[0] if texts else "").strip()
+            href = ent_names[0].get("href") or ""
 
-            # Converte o href em slug (último segmento do path) para usar como ID
-            slug = self.slug_from_href(href)
+        # Converte o href em slug (último segmento do path) para usar como ID
+        slug = self.slug_from_href(href)
 
-            # Constrói link absoluto
-            link_abs = response.urljoin(href)
+        # Constrói link absoluto
+        link_abs = response.urljoin(href)
 
-            # Coleta os textos de como exemplo "# 133" etc.
-            small_text = " ".join(t.strip() for t in card_sel.css("small::text, small *::text").getall() if t.strip())
+        # Coleta os textos de como exemplo "# 133" etc. e extrai o número
+        small_text = " ".join(t.strip() for t in SMALL_TEXT_XPATH(card) if t.strip())
+        match = self.ID_Regex.search(small_text)
+        pokemon_id = match.group(1) if match else None
 
-            # Tenta extrair o número do pokemon tipo "# 133"
-            match = re.search(r"#\s*(\d+)", small_text)
-            pokemon_id = match.group(1) if match else None
-
-            # Retorna a estrutura canônica de um "nó" da cadeia
-            return {"id": pokemon_id, "name": name, "link": link_abs, "slug": slug}
+        # Retorna a estrutura canônica de um "nó" da cadeia
+        return {"id": pokemon_id, "name": name, "link": link_abs, "slug": slug}
 
+    # Card de origem de um split: o card irmão imediatamente antes dele
+    @staticmethod
+    def split_source(split):
+        for sibling in split.itersiblings(preceding=True):
+            if is_card(sibling):
+                return sibling
+        return None
+
+    # Percorre a cadeia uma única vez em ordem de documento montando estágios e arestas.
+    # Mesmas regras das consultas XPath antigas:
+    #   destino = 1º card depois da seta
+    #   origem  = card antes do split que contém a seta, ou o último card antes dela
+    def parse_cards_conds(self, chain_sel, response):
+        chain = chain_sel.root
         stages_list, slug_to_index, edges = [], {}, []
-
-        arrows = chain_sel.xpath(".//span[contains(@class,'infocard-arrow')]")
-        for arrow in arrows:
-            # destino: 1º card depois da seta
-            destination_card = arrow.xpath("following::div[contains(@class,'infocard')][1]")
-            if not destination_card:
+        parsed = {}  # card -> estágio (cada card é lido uma única vez)
+
+        def stage_of(card):
+            if card not in parsed:
+                parsed[card] = self.parse_card(card, response)
+            return parsed[card]
+
+        def register(stage):
+            if stage["slug"] not in slug_to_index:
+                slug_to_index[stage["slug"]] = len(stages_list)
+                stages_list.append(stage)
+
+        # Se a cadeia já está dentro de um split (lista aninhada), a origem vem de fora dela
+        splits = []
+        for ancestor in chain.iterancestors():
+            if is_split(ancestor):
+                splits.append((ancestor, self.split_source(ancestor)))
+                break
+
+        cards = []
+        last_card = None
+        last_child_card = {}  # pai -> último card filho direto visto
+        waiting = []          # setas (elemento, card de origem) esperando o card de destino
+
+        for event, el in etree.iterwalk(chain, events=("start", "end")):
+            if event == "end":
+                if splits and splits[-1][0] is el:
+                    splits.pop()
                 continue
 
-            # origem: se dentro de split, é o card imediatamente antes do split; senão, último antes da seta
-            split_anc = arrow.xpath("ancestor::span[contains(@class,'infocard-evo-split')][1]")
-            if split_anc:
-                source_card = split_anc.xpath("preceding-sibling::div[contains(@class,'infocard')][1]")
-            else:
-                source_card = arrow.xpath("preceding::div[contains(@class,'infocard')][1]")
-            if not source_card:
-                continue
-
-            from_stage = parse_card(source_card)
-            to_stage = parse_card(destination_card)
-            if not from_stage["slug"] or not to_stage["slug"]:
-                continue
-
-            # registra índices únicos
-            if from_stage["slug"] not in slug_to_index:
-                slug_to_index[from_stage["slug"]] = len(stages_list)
-                stages_list.append(from_stage)
-            if to_stage["slug"] not in slug_to_index:
-                slug_to_index[to_stage["slug"]] = len(stages_list)
-                stages_list.append(to_stage)
-
-            # remove parenteses do level ou item
-            raw = (arrow.xpath("normalize-space(string(.))").get() or "").strip()
-            if raw.startswith("(") and raw.endswith(")"):
-                raw = raw[1:-1].strip()
-
-            # item (se houver)
-            item_name, item_link = None, None
-            for a_tag in arrow.css("a"):
-                href = a_tag.css("::attr(href)").get() or ""
-                if "/item/" in href:
-                    item_name = (a_tag.css("::text").get() or "").strip()
-                    item_link = response.urljoin(href)
-                    break
-
-            level = self.parse_level_from(raw)   # "Level N" -> int
-            method_text = f"Level {level}" if level is not None else raw
-
-            edges.append({
-                "i_from": slug_to_index[from_stage["slug"]],
-                "i_to": slug_to_index[to_stage["slug"]],
-                "method_text": method_text,
-                "level": level,
-                "item": item_name,
-                "item_link": item_link,
-            })
+            if is_card(el):
+                cards.append(el)
+                for arrow, source_card in waiting:
+                    self.add_edge(arrow, stage_of(source_card), stage_of(el),
+                                  register, slug_to_index, edges, response)
+                waiting = []
+                last_card = el
+                last_child_card[el.getparent()] = el
+            elif is_split(el):
+                splits.append((el, last_child_card.get(el.getparent())))
+            elif is_arrow(el):
+                source_card = splits[-1][1] if splits else last_card
+                if source_card is not None:
+                    waiting.append((el, source_card))
 
         # fallback: lista cards se não houver setas
         if not stages_list:
-            cards = chain_sel.xpath(".//div[contains(@class,'infocard')]")
-            for c in cards:
-                st = parse_card(c)
-                if st["slug"] and st["slug"] not in slug_to_index:
-                    slug_to_index[st["slug"]] = len(stages_list)
-                    stages_list.append(st)
+            for card in cards:
+                st = stage_of(card)
+                if st["slug"]:
+                    register(st)
 
         return stages_list, edges
 
+    # Registra a aresta de uma seta (origem -> destino) com método, level e item
+    def add_edge(self, arrow, from_stage, to_stage, register, slug_to_index, edges, response):
+        if not from_stage["slug"] or not to_stage["slug"]:
+            return
 
+        # registra índices únicos
+        register(from_stage)
+        register(to_stage)
+
+        # remove parenteses do level ou item
+        raw = NORMALIZED_TEXT_XPATH(arrow).strip()
+        if raw.startswith("(") and raw.endswith(")"):
+            raw = raw[1:-1].strip()
+
+        # item (se houver)
+        item_name, item_link = None, None
+        for a_tag in arrow.iter("a"):
+            href = a_tag.get("href") or ""
+            if "/item/" in href:
+                texts = TEXT_XPATH(a_tag)
+                item_name = (texts[0] if texts else "").strip()
+                item_link = response.urljoin(href)
+                break
+
+        level = self.parse_level_from(raw)   # "Level N" -> int
+        method_text = f"Level {level}" if level is not None else raw
+
+        edges.append({
+            "i_from": slug_to_index[from_stage["slug"]],
+            "i_to": slug_to_index[to_stage["slug"]],
+            "method_text": method_text,
+            "level": level,
+            "item": item_name,
+            "item_link": item_link,
+        })
+
+
+
+    # Cadeias evolutivas da página (só as de nível mais alto; as aninhadas vêm junto)
+    def evolution_chains(self, response):
+        return response.xpath(TOP_LEVEL_CHAINS)
+
+    # Estágios e arestas de cada cadeia da página, lidos uma vez por família (cache LRU)
+    def parse_evolution_chains(self, response):
+        chains = self.evolution_chains(response)
+        if not chains:
+            return []
+
+        key = self.evolution_cache.fingerprint(response.urljoin("/"), chains.getall())
+        parsed = self.evolution_cache.get(key)
+        if parsed is None:
+            parsed = [self.parse_cards_conds(chain, response) for chain in chains]
+            self.evolution_cache.put(key, parsed)
+        return parsed
 
     def build_evolution_stages(self, response, attributes):
 
 
-        # Descobre o slug do Pokémon atual (usa attributes['link'] se existir; senão a URL da página)
-        current_slug = self.slug_from_href(attributes.get("link") or response.url)
+        # Descobre o slug do Pokémon atual (usa attributes.link se existir; senão a URL da página)
+        current_slug = self.slug_from_href(attributes.link or response.url)
 
 
         from_name = from_id = from_link = None # quem evolui para o atual (estágio anterior)
@@ -154,8 +327,7 @@ class PokemonSpider(scrapy.Spider):
         seen_edges_flat = set()      # (to_slug, method, level, item)
         seen_edges_lists = set()     # mesmo critério, para deduplicar nos arrays to_/method_
 
-        for chain in response.css("div.infocard-list-evo"):
-            stages, edges = self.parse_cards_conds(chain, response)
+        for stages, edges in self.parse_evolution_chains(response):
             if not stages:
                 continue
 
@@ -186,7 +358,7 @@ class PokemonSpider(scrapy.Spider):
                             "to_id": destination_stage["id"],
                             "to_name": destination_stage["name"],
                             "to_link": destination_stage["link"],
-                            "method": edge["method_text"],
+                            "method": intern(edge["method_text"]),
                             "level": edge["level"],
                             "item": edge["item"],
                             "item_link": edge["item_link"],
@@ -198,15 +370,15 @@ class PokemonSpider(scrapy.Spider):
                         to_names.append(destination_stage["name"])
                         to_ids.append(destination_stage["id"])
                         to_links.append(destination_stage["link"])
-                        methods.append(edge["method_text"])
+                        methods.append(intern(edge["method_text"]))
                         levels.append(edge["level"])
                         items.append(edge["item"])
                         item_links.append(edge["item_link"])
 
         # Monta a primeira entrada (o próprio Pokémon)
         evo_entry = {
-            "id": attributes.get("id"),
-            "name": attributes.get("name"),
+            "id": attributes.id,
+            "name": attributes.name,
             "from": from_name,
             "id_from": from_id,
             "link_from": from_link,
@@ -222,52 +394,196 @@ class PokemonSpider(scrapy.Spider):
         # Demais estágios (linhas evolutivas)
         others_list = list(others_by_slug.values())
 
-        attributes["evolution_stages"] = [evo_entry] + others_list
-        attributes["evolutions"] = evolutions 
+        attributes.evolution_stages = [evo_entry] + others_list
+        attributes.evolutions = evolutions
 
 
     # Pega todas as informações basicas do pokemon
     def parse_base_info(self, pokemon, attributes, link):
-        attributes["id"] = pokemon.css("span.infocard-cell-data::text").get()
-        attributes["name"] = pokemon.css("a.ent-name::text").get()
-        attributes["link"] = link
-        attributes["types"] = pokemon.css("td.cell-icon a::text").getall()
+        attributes.id = pokemon.css("span.infocard-cell-data::text").get()
+        attributes.name = pokemon.css("a.ent-name::text").get()
+        attributes.link = link
+        attributes.set_types(pokemon.css("td.cell-icon a::text").getall())
+        # Formas alternativas aparecem como outra linha com o mesmo link (ver forms.py)
+        attributes.form = row_form(pokemon)
 
     # Começo do parse
     def parse(self, response):
+        # link -> Pokémon da listagem que usam essa página de detalhe (base + formas)
+        by_link = {}
         for pokemon in response.css("table#pokedex tbody tr"):
 
             rel = pokemon.css("a.ent-name::attr(href)").get()
             link = response.urljoin(rel) if rel else None
-            attributes = {}
+            attributes = PokemonItem()
             self.parse_base_info(pokemon, attributes, link)
 
             if link:
-                yield response.follow(
-                    link,
-                    callback=self.parse_details,
-                    cb_kwargs={"attributes": attributes}
-                )
+                resumed = self.resume_from_checkpoint(response, attributes)
+                if resumed is not None:
+                    yield from resumed
+                    continue
+                by_link.setdefault(link, []).append(attributes)
             else:
-                yield attributes
+                yield attributes.to_item()
+
+        # Uma requisição (e uma vaga no gate) por página; as formas vão junto e saem do mesmo parse
+        for link, (attributes, *forms) in by_link.items():
+            if forms:
+                self._inc_stats("pokemon/form_rows_grouped", len(forms))
+            self.detail_gate.push(response.follow(
+                link,
+                callback=self.parse_details if self.parse_pool is None else self.parse_details_pooled,
+                errback=self.parse_details_error,
+                cb_kwargs={"attributes": attributes, "forms": forms},
+                meta=self.detail_meta()
+            ))
+
+        yield from self.detail_gate.release()
+
+    # Página de detalhe que falhou: o Pokémon (e as formas da página) sai da conta dos abertos
+    def parse_details_error(self, failure):
+        request = failure.request
+        self.logger.warning("Falha ao baixar detalhe %s: %s", request.url, failure.value)
+        self.detail_gate.finished_request(request)
+        yield from self.detail_gate.release()
+
+    # Requisição de detalhe descartada pelo scheduler (ex.: URL repetida no filtro de duplicatas)
+    def request_dropped(self, request, spider):
+        if request.meta.get("pokemon_detail"):
+            self.detail_gate.finished_request(request)
+            self._crawl_released()
+
+    # Exceção num callback: os registros da requisição não terminam pelo caminho normal
+    # (o Scrapy já loga o erro); libera as vagas deles no gate
+    def spider_error(self, failure, response, spider):
+        request = getattr(response, "request", None)
+        if request is None:
+            return
+        if request.meta.get("pokemon_detail"):
+            self.detail_gate.finished_request(request)
+        elif "ability_url" in request.meta:
+            self.detail_gate.finished(request.cb_kwargs["attributes"], delivered=False)
+            for waiting_attributes, _ in self.ability_store.pop_waiters(request.meta["ability_url"]):
+                self.detail_gate.finished(waiting_attributes, delivered=False)
+        self._crawl_released()
+
+    def _crawl_released(self):
+        for request in self.detail_gate.release():
+            self.crawler.engine.crawl(request)
+
+    # Nada mais em andamento mas ainda há detalhes no gate: libera em vez de fechar. Vaga
+    # ocupada nessa hora é registro que sumiu sem passar por finished: só fica no log.
+    def spider_idle(self, spider):
+        released = self.detail_gate.release()
+        if released:
+            for request in released:
+                self.crawler.engine.crawl(request)
+            raise DontCloseSpider
+        if self.detail_gate.open:
+            leaked = self.detail_gate.leaked()
+            self.logger.error("%d páginas de detalhe ocupam o gate sem concluir (%s); %d ficaram na fila",
+                              len(leaked), ", ".join(leaked[:10]), len(self.detail_gate.backlog))
+
+    # Pokémon que um crawl interrompido já tinha completado (sai do log) ou deixado
+    # esperando habilidades (só as que faltam são buscadas). None = crawl normal.
+    def resume_from_checkpoint(self, response, attributes):
+        if self.checkpoint is None:
+            return None
+        item = self.checkpoint.done_item(attributes.key())
+        if item is not None:
+            self._inc_stats("checkpoint/resumed_done")
+            return [{**item, **attributes.base_item()}]
+        record = self.checkpoint.partial_record(attributes.key())
+        if record is None:
+            return None
+        self._inc_stats("checkpoint/resumed_partial")
+        attributes.set_details(record["item"])
+        refs = (record["ability_names"], record["item"]["abilities_link"])
+        return self.parse_abilities(response, attributes, refs)
+
+    # No modo incremental a página de detalhe vai com requisição condicional e aceita 304
+    def detail_meta(self):
+        if self.incremental is None:
+            return {"pokemon_detail": True}
+        return {"pokemon_detail": True, "incremental": True, "handle_httpstatus_list": [304]}
 
     # Pega informações da segunda tela onde tem os detalhes dos pokemons
-    def parse_details(self, response, attributes):
+    # (forms: outras linhas da listagem com o mesmo link, ver forms.parse_forms)
+    def parse_details(self, response, attributes, forms=()):
+
+        # Página sem mudança desde o último crawl: reaproveita os itens anteriores
+        if "unchanged" in response.flags:
+            records = [attributes, *forms]
+            previous = [self.incremental.item_for(record.key() if record.link else response.url)
+                        for record in records]
+            if all(item is not None for item in previous):
+                for record, item in zip(records, previous):
+                    yield {**item, **record.base_item()}  # dados da listagem sempre atualizados
+                    self.detail_gate.finished(record)
+                yield from self.detail_gate.release()
+                return
+
+            # 304 sem item salvo (crawl anterior interrompido): baixa de novo sem condicional
+            if response.status == 304:
+                request = response.request
+                headers = request.headers.copy()
+                headers.pop(b"If-None-Match", None)
+                headers.pop(b"If-Modified-Since", None)
+                yield request.replace(
+                    headers=headers,
+                    meta={**request.meta, "incremental": False},
+                    dont_filter=True
+                )
+                return
+
+        if forms:
+            yield from parse_forms(self, response, [attributes, *forms])
+            return
+
+        # Com DETAIL_FAST_PATH os campos saem de uma única passada na árvore
+        fields = scan_detail_page(response) if self.fast_path else None
 
-        self.parse_height_weight(response, attributes)
+        self.parse_height_weight(response, attributes, fields)
 
-        self.parse_effectiveness(response, attributes)
+        self.parse_effectiveness(response, attributes, fields)
 
         self.build_evolution_stages(response, attributes)
 
-        yield from self.parse_abilities(response, attributes)
+        yield from self.parse_abilities(response, attributes, self.ability_refs(response, fields))
+
+    # Mesmo resultado do parse_details, mas o parse da página roda no pool de processos
+    async def parse_details_pooled(self, response, attributes, forms=()):
+        # Página sem mudança (modo incremental) não precisa de parse e página com formas lê
+        # uma aba por registro: as duas seguem o caminho normal
+        if "unchanged" in response.flags or forms:
+            for output in self.parse_details(response, attributes, forms):
+                yield output
+            return
+
+        try:
+            details = await maybe_deferred_to_future(self.parse_pool.submit(response, attributes))
+        except Exception as error:
+            # Pool quebrado (processo morto, erro no parse): faz o parse aqui mesmo
+            self.logger.warning("Falha no pool de parse para %s, lendo no reactor: %r", response.url, error)
+            for output in self.parse_details(response, attributes):
+                yield output
+            return
+
+        apply_details(attributes, details)
+        for output in self.parse_abilities(response, attributes,
+                                           (details["ability_names"], details["ability_links"])):
+            yield output
 
     # Pega informações sobre a altura e peso e transforma para cm e kg
-    def parse_height_weight(self, response, attributes):
+    def parse_height_weight(self, response, attributes, fields=None):
 
         # Pega o texto bruto
-        raw_height = response.css("th:contains('Height') + td::text").get() or ""
-        raw_weight = response.css("th:contains('Weight') + td::text").get() or ""
+        if fields is not None:
+            raw_height, raw_weight = fields.height, fields.weight
+        else:
+            raw_height = response.css("th:contains('Height') + td::text").get() or ""
+            raw_weight = response.css("th:contains('Weight') + td::text").get() or ""
 
         # Normaliza espaços não-quebrados e similares
         raw_height = raw_height.replace("\xa0", " ").strip()
@@ -287,48 +603,120 @@ class PokemonSpider(scrapy.Spider):
         if kg_match:
             weight_kg = float(kg_match.group(1))
 
-        attributes["height"] = height_cm
-        attributes["weight"] = weight_kg
-
-    # Pega as efetividades e retorna quais sao os tipos efetivos e não efetivos daquele pokemon
-    def parse_effectiveness(self, response, attributes):
-        types_names = response.css("table.type-table tr:nth-child(1) th a::attr(title)").getall()
-        types_multipliers = [td.css("::text").get(default="").strip()
-                             for td in response.css("table.type-table tr:nth-child(2) td")]
+        attributes.detailed = True
+        attributes.height = height_cm
+        attributes.weight = weight_kg
+
+    # Pega as efetividades como multiplicadores numéricos (2.0, 0.5, 0.0...)
+    # Os rótulos ("super efetivo"...) são gerados só na saída pelo EffectivenessLabelPipeline
+    def parse_effectiveness(self, response, attributes, fields=None):
+        if fields is not None:
+            types_names, types_multipliers = fields.types_names, fields.types_multipliers
+        else:
+            types_names = response.css("table.type-table tr:nth-child(1) th a::attr(title)").getall()
+            types_multipliers = [td.css("::text").get(default="").strip()
+                                 for td in response.css("table.type-table tr:nth-child(2) td")]
         type_effectiveness = {}
         for t, v in zip(types_names, types_multipliers):
-            type_effectiveness[t] = format_effectiveness(v)
-        attributes["effectiveness"] = type_effectiveness
+            multiplier = parse_multiplier(v)
+            # Célula fora do padrão não derruba o parse da página: o tipo fica de fora
+            if multiplier is None:
+                self.logger.warning("Efetividade não reconhecida em %s: %s=%r",
+                                    getattr(response, "url", attributes.link), t, v)
+                continue
+            type_effectiveness[t] = multiplier
+        attributes.set_effectiveness(type_effectiveness)
 
-    # Pega as habilidades e entra no link delas para pegar a descrição
-    def parse_abilities(self, response, attributes):
+    # Nomes e links das habilidades listadas na página de detalhe
+    def ability_refs(self, response, fields=None):
+        if fields is not None:
+            return fields.ability_names, fields.ability_links
         raw_abilities = response.css("th:contains('Abilities') + td a")
         ability_links = raw_abilities.css("::attr(href)").getall()
         ability_names = [n.strip() for n in raw_abilities.css("::text").getall()]
-        attributes["abilities_link"] = ability_links 
-        attributes["abilities"] = {}
-        attributes["_pending"] = len(ability_links)
+        return ability_names, ability_links
 
-        if attributes["_pending"] == 0:
-            attributes.pop("_pending", None)
-            yield attributes
+    # Pega as habilidades e entra no link delas para pegar a descrição
+    # (refs já lidos pelo pool de parse evitam montar a árvore da página no reactor)
+    def parse_abilities(self, response, attributes, refs=None):
+        ability_names, ability_links = refs if refs is not None else self.ability_refs(response)
+        attributes.set_abilities_link(ability_links)
+        attributes.abilities = {}
+        attributes.pending = len(ability_links)
+
+        if attributes.pending == 0:
+            yield self.finish_item(attributes)
+            yield from self.detail_gate.release()
             return
+        self.partial_items += 1
+        if self.checkpoint is not None:
+            self.checkpoint.write_partial(attributes, ability_names)
 
         for ability_name, url in zip(ability_names, ability_links):
+            ability_url = response.urljoin(url)
+
+            # Descrição já conhecida (deste crawl ou de um anterior salvo em disco)
+            description_text = self.ability_store.get(ability_url)
+            if description_text is not None:
+                yield from self.complete_ability(attributes, ability_name, description_text)
+                continue
+
+            # Já tem requisição em andamento para essa habilidade: só espera o resultado
+            if self.ability_store.is_fetching(ability_url):
+                self.ability_store.wait_for(ability_url, attributes, ability_name)
+                continue
+
+            self.ability_store.start_fetch(ability_url)
             yield response.follow(
-                url,
+                ability_url,
                 callback=self.parse_ability,
+                errback=self.parse_ability_error,
                 cb_kwargs={"attributes": attributes, "ability_name": ability_name},
-                dont_filter=True  # processa mesmo URLs repetidas
+                meta={"ability_url": ability_url},
+                priority=self.ability_priority,  # termina os Pokémon já começados antes de abrir novos
+                dont_filter=True  # a coalescência acima já evita URLs repetidas
             )
 
+    # Preenche a descrição de uma habilidade e entrega o item quando não falta nenhuma
+    def complete_ability(self, attributes, ability_name, description_text):
+        attributes.add_ability(ability_name, description_text)
+
+        attributes.pending -= 1
+        if attributes.pending <= 0:
+            self.partial_items -= 1
+            yield self.finish_item(attributes)
+            yield from self.detail_gate.release()
+
+    # Item completo; com checkpoint ligado fica registrado antes de sair do spider
+    def finish_item(self, attributes):
+        item = attributes.to_item()
+        if self.checkpoint is not None:
+            self.checkpoint.write_done(item)
+        self.detail_gate.finished(attributes)
+        return item
+
     # Pega as descrições das habilidades dos pokemons
     def parse_ability(self, response, attributes, ability_name):
         description_text = response.css("h2:contains('Effect') + p *::text").getall()
         description_text = " ".join(t.strip() for t in description_text if t.strip()) or "—"
-        attributes["abilities"][ability_name] = description_text
 
-        attributes["_pending"] -= 1
-        if attributes["_pending"] <= 0:
-            attributes.pop("_pending", None)
-            yield attributes
\ No newline at end of file
+        ability_url = response.meta.get("ability_url", response.url)
+        self.ability_store.put(ability_url, description_text)
+        if self.checkpoint is not None:
+            self.checkpoint.write_ability(ability_url, description_text)
+
+        yield from self.complete_ability(attributes, ability_name, description_text)
+        for waiting_attributes, waiting_name in self.ability_store.pop_waiters(ability_url):
+            yield from self.complete_ability(waiting_attributes, waiting_name, description_text)
+
+    # Se a página da habilidade falhar, completa os itens que dependiam dela sem descrição
+    def parse_ability_error(self, failure):
+        request = failure.request
+        ability_url = request.meta.get("ability_url", request.url)
+        self.logger.warning("Falha ao baixar habilidade %s: %s", ability_url, failure.value)
+
+        yield from self.complete_ability(
+            request.cb_kwargs["attributes"], request.cb_kwargs["ability_name"], "—"
+        )
+        for waiting_attributes, waiting_name in self.ability_store.pop_waiters(ability_url):
+            yield from self.complete_ability(waiting_attributes, waiting_name, "—")
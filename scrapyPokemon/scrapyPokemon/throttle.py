@@ -0,0 +1,114 @@
+# Controle adaptativo de concorrência/atraso por servidor (usado pelo AdaptiveThrottleMiddleware)
+#
+# AIMD: a cada janela de WINDOW respostas saudáveis (latência média e taxa de erro dentro
+# do orçamento) o atraso cai e a concorrência sobe um passo; latência alta faz o caminho
+# inverso e uma janela com erros (429, 5xx, timeout/erro de rede) acima de max_error_rate
+# corta a concorrência pela metade. Só um Retry-After recua na hora, sem esperar a janela:
+# vira atraso mínimo e segura novos aumentos até o prazo passar.
+
+import time
+from email.utils import parsedate_to_datetime
+
+INCREASE = "increase"
+DECREASE = "decrease"
+BACKOFF = "backoff"
+RETRY_AFTER = "retry_after"
+HOLD = "hold"
+
+
+# Retry-After em segundos: aceita "120" ou uma data HTTP
+def parse_retry_after(value, now=None):
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class ThrottleController:
+    def __init__(self, concurrency=1, delay=1.0, min_concurrency=1, max_concurrency=8,
+                 min_delay=0.0, max_delay=30.0, target_latency=1.0, max_error_rate=0.05,
+                 window=10, alpha=0.3):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(min_concurrency, max_concurrency)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.alpha = alpha
+
+        self.concurrency = min(max(concurrency, min_concurrency), self.max_concurrency)
+        self.delay = min(max(delay, min_delay), max_delay)
+        self.latency = None  # média móvel exponencial, em segundos
+        self.hold_until = 0.0
+        self._seen = 0
+        self._errors = 0
+
+    # Registra uma resposta (status None = exceção no download) e devolve a decisão tomada
+    # (ou None se ainda juntando a janela)
+    def observe(self, latency, status, retry_after=None, now=None):
+        now = time.monotonic() if now is None else now
+        self._seen += 1
+
+        if status is None or status == 429 or status >= 500:
+            self._errors += 1
+            if retry_after is not None:
+                self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+                self.delay = self._clamp_delay(max(self.delay, retry_after))
+                self.hold_until = max(self.hold_until, now + retry_after)
+                self._reset_window()
+                return RETRY_AFTER
+        elif latency is not None:
+            # só respostas boas entram na média: timeouts e erros já contam na taxa de erro
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency = self.alpha * latency + (1 - self.alpha) * self.latency
+
+        if self._seen < self.window:
+            return None
+
+        error_rate = self._errors / self._seen
+        self._reset_window()
+
+        if error_rate > self.max_error_rate:
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+            self.delay = self._clamp_delay(max(self.delay * 2, self.min_delay, 0.25))
+            return BACKOFF
+
+        if (self.latency or 0) > self.target_latency:
+            self.concurrency = max(self.min_concurrency, self.concurrency - 1)
+            self.delay = self._clamp_delay(max(self.delay * 1.5, self.min_delay, 0.1))
+            return DECREASE
+
+        if now < self.hold_until:
+            return HOLD
+
+        # Folga de 20% antes de subir, para não oscilar em cima do limite
+        if (self.latency or 0) <= 0.8 * self.target_latency:
+            changed = False
+            if self.delay > self.min_delay:
+                self.delay = self._clamp_delay(self.delay * 0.5 if self.delay > 0.05 else 0.0)
+                changed = True
+            if self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                changed = True
+            if changed:
+                return INCREASE
+        return HOLD
+
+    def _clamp_delay(self, delay):
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    def _reset_window(self):
+        self._seen = 0
+        self._errors = 0
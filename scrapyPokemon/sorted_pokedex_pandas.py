@@ -1,7 +1,6 @@
 #pip install pandas
 
 import json
-import pandas as pd # type: ignore
 
 IN_PATH = "data/pokedex.json"
 OUT_PATH = "data/pokedex_sorted.json"
@@ -15,27 +14,49 @@ def _to_int_id(x):
     except ValueError:
         return None
 
-# Abrir o json
-with open(IN_PATH, "r", encoding="utf-8") as f:
-    arr = json.load(f)  # array de dicts
-
-# Transformar Id em inteiro
-for doc in arr:
-    # 1) transformar id em inteiro
-    int_id = _to_int_id(doc.get("id"))
-    if int_id is not None:
-        doc["id"] = int_id 
-
-df = pd.DataFrame(arr)
-df = df.drop_duplicates(subset="id", keep="last")
-
-# Ordenar por id inteiro 
-df["_id_num"] = df["id"].apply(lambda x: x if isinstance(x, int) else 10**9)
-df = df.sort_values("_id_num").drop(columns="_id_num")
-
-# Salva em um novo json
-out = df.to_dict(orient="records")
-with open(OUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(out, f, ensure_ascii=False, indent=2)
-
-print(f"Arquivo ordenado e limpo salvo em {OUT_PATH}")
+# import do pandas só aqui dentro: importar este módulo (pokedex.py) não carrega o pandas
+def sort_pokedex(in_path=IN_PATH, out_path=OUT_PATH):
+    import pandas as pd # type: ignore
+
+    # Abrir o json
+    with open(in_path, "r", encoding="utf-8") as f:
+        arr = json.load(f)  # array de dicts
+
+    # Transformar Id em inteiro
+    for doc in arr:
+        # 1) transformar id em inteiro
+        int_id = _to_int_id(doc.get("id"))
+        if int_id is not None:
+            doc["id"] = int_id 
+
+    df = pd.DataFrame(arr)
+    # Formas alternativas (Mega, Alola...) têm o mesmo id do Pokémon base: a chave é (id, forma)
+    if "form" in df.columns:
+        df["form"] = df["form"].astype(object).where(df["form"].notna(), None)
+        df = df.drop_duplicates(subset=["id", "form"], keep="last")
+    else:
+        df = df.drop_duplicates(subset="id", keep="last")
+
+    # Ordenar por id inteiro (forma base primeiro, depois as formas pelo nome)
+    df["_id_num"] = df["id"].apply(lambda x: x if isinstance(x, int) else 10**9)
+    sort_by = ["_id_num"]
+    if "form" in df.columns:
+        df["_form"] = df["form"].fillna("")
+        sort_by.append("_form")
+    df = df.sort_values(sort_by, kind="stable").drop(columns=sort_by)
+
+    # Salva em um novo json
+    out = df.to_dict(orient="records")
+    # "form" só nas formas alternativas (o Pokémon base continua sem o campo)
+    for doc in out:
+        if doc.get("form") is None:
+            doc.pop("form", None)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+
+    return len(out)
+
+
+if __name__ == "__main__":
+    sort_pokedex()
+    print(f"Arquivo ordenado e limpo salvo em {OUT_PATH}")
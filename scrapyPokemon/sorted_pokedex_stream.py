@@ -0,0 +1,163 @@
+#Substituto em streaming do sorted_pokedex_pandas.py (só biblioteca padrão)
+#
+# Lê o feed do Scrapy registro a registro (JSON Lines ou array JSON), converte o id para inteiro,
+# mantém só o último registro de cada id (e forma) e ordena pelo id. Se a entrada passar
+# do orçamento de memória, os blocos ordenados vão para arquivos temporários e
+# são intercalados no final (merge sort externo).
+#
+# python scrapyPokemon/sorted_pokedex_stream.py [--input ...] [--output ...] [--memory-mb 64]
+
+import argparse
+import heapq
+import json
+import os
+import tempfile
+
+from scrapyPokemon.items import to_int_id
+
+IN_PATH = "data/pokedex.json"
+OUT_PATH = "data/pokedex_sorted.json"
+
+# Ids que não viram inteiro vão para o fim, como no script com pandas
+NO_ID_KEY = 10**9
+
+
+# Lê os registros um a um: JSON Lines ou array JSON (de uma linha, um objeto por
+# linha como o feed do Scrapy, ou indentado como o pokedex_sorted.json)
+def iter_records(path, chunk_size=1 << 16):
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_size)
+        if not buf.lstrip().startswith("["):
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        # Array: decodifica um objeto por vez, lendo mais texto só quando precisa
+        pos = buf.index("[") + 1
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                buf, pos = f.read(chunk_size), 0
+                if not buf:
+                    return
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                doc, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield doc
+
+
+# Normaliza o registro (id inteiro) e devolve a chave de ordenação
+def normalize(doc):
+    int_id = to_int_id(doc.get("id"))
+    if int_id is not None:
+        doc["id"] = int_id
+    return doc["id"] if isinstance(doc.get("id"), int) else NO_ID_KEY
+
+
+def write_run(run_dir, buffer):
+    buffer.sort()
+    fd, path = tempfile.mkstemp(dir=run_dir, suffix=".run")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for sort_key, id_repr, form, seq, line in buffer:
+            f.write(json.dumps([sort_key, id_repr, form, seq], ensure_ascii=False) + "\t" + line + "\n")
+    return path
+
+
+def read_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for row in f:
+            key, _, line = row.rstrip("\n").partition("\t")
+            sort_key, id_repr, form, seq = json.loads(key)
+            yield sort_key, id_repr, form, seq, line
+
+
+# Mantém só o último registro (maior seq) de cada (id, forma) numa sequência já ordenada
+def keep_last(sorted_rows):
+    previous = None
+    for row in sorted_rows:
+        if previous is not None and (previous[0], previous[1], previous[2]) != (row[0], row[1], row[2]):
+            yield previous
+        previous = row
+    if previous is not None:
+        yield previous
+
+
+# Escreve no mesmo formato do json.dump(..., indent=2) do script original
+def write_sorted(rows, out_path, columns):
+    with open(out_path, "w", encoding="utf-8") as f:
+        count = 0
+        for _, _, _, _, line in rows:
+            doc = json.loads(line)
+            # Mesmas colunas (e ordem) do DataFrame: união das chaves na ordem em que apareceram;
+            # "form" só nas formas alternativas (o Pokémon base continua sem o campo)
+            doc = {col: doc.get(col) for col in columns if col != "form" or doc.get("form") is not None}
+            body = json.dumps(doc, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            f.write(("[\n  " if count == 0 else ",\n  ") + body)
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
+
+
+def sort_pokedex(in_path=IN_PATH, out_path=OUT_PATH, memory_mb=64):
+    budget = memory_mb * 1024 * 1024
+    columns = {}  # dict como conjunto ordenado
+    buffer, buffer_bytes, runs = [], 0, []
+
+    with tempfile.TemporaryDirectory(prefix="pokedex-sort-") as run_dir:
+        for seq, doc in enumerate(iter_records(in_path)):
+            for col in doc:
+                columns.setdefault(col, None)
+            # Chave: (ordem, id e forma para agrupar duplicados, posição na entrada);
+            # formas alternativas dividem o id com o Pokémon base e vêm depois dele
+            sort_key = normalize(doc)
+            id_repr = json.dumps(doc.get("id"), sort_keys=True)
+            line = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+            buffer.append((sort_key, id_repr, doc.get("form") or "", seq, line))
+            buffer_bytes += len(line) + 64
+
+            # Passou do orçamento: ordena o bloco e despeja em disco
+            if buffer_bytes >= budget:
+                runs.append(write_run(run_dir, buffer))
+                buffer, buffer_bytes = [], 0
+
+        if runs:
+            if buffer:
+                runs.append(write_run(run_dir, buffer))
+                buffer = []
+            rows = heapq.merge(*(read_run(path) for path in runs))
+        else:
+            buffer.sort()
+            rows = buffer
+
+        count = write_sorted(keep_last(rows), out_path, list(columns))
+
+    return count, len(runs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normaliza, remove duplicados e ordena a pokedex")
+    parser.add_argument("--input", default=IN_PATH)
+    parser.add_argument("--output", default=OUT_PATH)
+    parser.add_argument("--memory-mb", type=float, default=64,
+                        help="orçamento de memória antes de usar arquivos temporários")
+    args = parser.parse_args(argv)
+
+    count, runs = sort_pokedex(args.input, args.output, args.memory_mb)
+    extra = f" ({runs} blocos em disco)" if runs else ""
+    print(f"Arquivo ordenado e limpo salvo em {args.output}: {count} registros{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Gera uma pokedex sintética grande no formato do feed do Scrapy (para testes de carga)
+#
+# Parte de um feed real (--template) e clona as famílias evolutivas: o clone k soma
+# k * (maior id) a todos os ids da família e acrescenta "-k" aos slugs e " #k" aos nomes,
+# reescrevendo evolution_stages e evolutions de forma consistente. Tipos, efetividades,
+# habilidades, métodos/níveis/itens de evolução e a ordem do feed vêm do registro real;
+# altura e peso variam um pouco a cada clone. Uma fração dos registros (--duplicates)
+# sai de novo mais adiante com o mesmo id e o peso alterado, como um recrawl no mesmo
+# arquivo (o sort fica com o último). Tudo é gravado em streaming.
+#
+# python scrapyPokemon/synthetic_pokedex.py --count 100000 [--template data/pokedex.json]
+#        [--output data/pokedex_synthetic.json] [--duplicates 0.02] [--seed 1] [--jsonl]
+
+import argparse
+import heapq
+import json
+import random
+
+from scrapyPokemon.items import to_int_id
+from sorted_pokedex_stream import iter_records
+
+TEMPLATE_PATH = "data/pokedex.json"
+OUT_PATH = "data/pokedex_synthetic.json"
+
+
+# Reescreve ids, nomes e links de um registro real para o clone k
+class Cloner:
+    def __init__(self, templates):
+        self.span = max((to_int_id(t.get("id")) or 0 for t in templates), default=0)
+        self.width = max((len(str(t.get("id") or "")) for t in templates), default=4)
+
+    def id(self, value, k):
+        number = to_int_id(value)
+        if k == 0 or number is None:
+            return value
+        return str(number + k * self.span).zfill(self.width)
+
+    @staticmethod
+    def name(value, k):
+        return f"{value} #{k}" if k and value else value
+
+    @staticmethod
+    def link(value, k):
+        return f"{value.rstrip('/')}-{k}" if k and value else value
+
+    def stage(self, stage, k):
+        out = dict(stage)
+        out["id"] = self.id(stage.get("id"), k)
+        out["name"] = self.name(stage.get("name"), k)
+        if "link" in stage:
+            out["link"] = self.link(stage["link"], k)
+        if "from" in stage:
+            out["from"] = self.name(stage["from"], k)
+            out["id_from"] = self.id(stage["id_from"], k)
+            out["link_from"] = self.link(stage["link_from"], k)
+            out["to"] = [self.name(v, k) for v in stage["to"]]
+            out["id_to"] = [self.id(v, k) for v in stage["id_to"]]
+            out["link_to"] = [self.link(v, k) for v in stage["link_to"]]
+        return out
+
+    def record(self, doc, k, rng):
+        out = dict(doc)
+        out["id"] = self.id(doc.get("id"), k)
+        out["name"] = self.name(doc.get("name"), k)
+        out["link"] = self.link(doc.get("link"), k)
+        if k:
+            for field in ("height", "weight"):
+                if isinstance(doc.get(field), (int, float)):
+                    out[field] = round(doc[field] * rng.uniform(0.9, 1.1), 1)
+        if "evolution_stages" in doc:
+            out["evolution_stages"] = [self.stage(s, k) for s in doc["evolution_stages"]]
+        if "evolutions" in doc:
+            out["evolutions"] = [
+                {**e, "to_id": self.id(e["to_id"], k), "to_name": self.name(e["to_name"], k),
+                 "to_link": self.link(e["to_link"], k)}
+                for e in doc["evolutions"]
+            ]
+        return out
+
+
+# Registros sintéticos em ordem de saída (clones + duplicatas atrasadas)
+def generate(templates, count, duplicates=0.0, seed=1, delay=1000):
+    rng = random.Random(seed)
+    cloner = Cloner(templates)
+    later = []  # (posição de saída, desempate, registro) das duplicatas
+    emitted, produced, k = 0, 0, 0
+
+    while produced < count:
+        for doc in templates:
+            if produced >= count:
+                break
+            while later and later[0][0] <= emitted:
+                yield heapq.heappop(later)[2]
+                emitted += 1
+            record = cloner.record(doc, k, rng)
+            yield record
+            emitted += 1
+            produced += 1
+            if rng.random() < duplicates:
+                again = dict(record)
+                if isinstance(again.get("weight"), (int, float)):
+                    again["weight"] = round(again["weight"] + 0.1, 1)
+                heapq.heappush(later, (emitted + rng.randint(1, delay), produced, again))
+        k += 1
+
+    while later:
+        yield heapq.heappop(later)[2]
+
+
+# Mesmo layout do feed do Scrapy: array com um objeto por linha (ou JSON Lines)
+def write_feed(records, path, jsonl=False):
+    total = 0
+    with open(path, "w", encoding="utf-8") as f:
+        if not jsonl:
+            f.write("[")
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False)
+            if jsonl:
+                f.write(line + "\n")
+            else:
+                f.write(("\n" if total == 0 else ",\n") + line)
+            total += 1
+        if not jsonl:
+            f.write("\n]")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera uma pokedex sintética grande a partir de um feed real")
+    parser.add_argument("--count", type=int, required=True, help="registros únicos a gerar")
+    parser.add_argument("--template", default=TEMPLATE_PATH)
+    parser.add_argument("--output", default=OUT_PATH)
+    parser.add_argument("--duplicates", type=float, default=0.02, help="fração de registros repetidos")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jsonl", action="store_true")
+    args = parser.parse_args(argv)
+
+    templates = list(iter_records(args.template))
+    if not templates:
+        raise SystemExit(f"nenhum registro em {args.template}")
+    total = write_feed(generate(templates, args.count, args.duplicates, args.seed), args.output, args.jsonl)
+    print(f"{total} registros ({args.count} únicos) salvos em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
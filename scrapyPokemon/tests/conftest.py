@@ -0,0 +1,72 @@
+# Utilidades compartilhadas pelos testes
+#
+# tests/fixtures tem um recorte do corpus do modo replay: a listagem com Bulbasaur,
+# Ivysaur, Venusaur (e a linha da Mega Venusaur, que divide a página com ele) e Eevee,
+# as páginas de detalhe deles e as páginas das habilidades que elas citam. crawl() roda
+# os callbacks do spider sobre essas páginas sem reactor, seguindo as requisições geradas.
+
+import os
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy.http import Headers, HtmlResponse, Request  # noqa: E402
+
+from scrapyPokemon.spiders.pokemon import PokemonSpider  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LISTING_URL = "https://pokemondb.net/pokedex/all"
+DETAIL_PAGES = ("bulbasaur", "ivysaur", "venusaur", "eevee")
+
+
+def fixture_url(name):
+    return LISTING_URL if name == "pokedex_all" else f"https://pokemondb.net/pokedex/{name}"
+
+
+# Página gravada de uma URL (o nome do arquivo é o último trecho do caminho)
+def fixture_body(url):
+    name = url.rstrip("/").rsplit("/", 1)[-1]
+    if url == LISTING_URL:
+        name = "pokedex_all"
+    with open(os.path.join(FIXTURES_DIR, name + ".html"), "rb") as f:
+        return f.read()
+
+
+def make_response(url, request=None, status=200, body=None, headers=None, flags=None):
+    return HtmlResponse(
+        url=url,
+        status=status,
+        headers=Headers(headers or {"Content-Type": "text/html; charset=utf-8"}),
+        body=fixture_body(url) if body is None else body,
+        encoding="utf-8",
+        request=request or Request(url),
+        flags=flags,
+    )
+
+
+# Roda o crawl inteiro nas fixtures; devolve os itens na ordem em que saíram
+def crawl(spider):
+    items = []
+    queue = deque([Request(LISTING_URL, callback=spider.parse)])
+    while queue:
+        request = queue.popleft()
+        callback = request.callback or spider.parse
+        for output in callback(make_response(request.url, request), **request.cb_kwargs):
+            if isinstance(output, Request):
+                queue.append(output)
+            else:
+                items.append(output)
+    return items
+
+
+@pytest.fixture
+def spider():
+    return PokemonSpider()
+
+
+@pytest.fixture
+def crawled_items():
+    return crawl(PokemonSpider())
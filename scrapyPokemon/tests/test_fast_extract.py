@@ -0,0 +1,52 @@
+# DETAIL_FAST_PATH (fast_extract.py) contra os seletores :contains() do spider
+
+import pytest
+
+from benchmarks.bench_fast_extract import FIELDS, fast_fields, selector_fields
+from conftest import DETAIL_PAGES, crawl, fixture_url, make_response
+from scrapyPokemon.forms import form_tabs
+from scrapyPokemon.spiders.pokemon import PokemonSpider
+
+
+@pytest.mark.parametrize("name", DETAIL_PAGES)
+def test_fields_match_selectors(name):
+    response = make_response(fixture_url(name))
+    expected, got = selector_fields(response), fast_fields(response)
+    for field in FIELDS:
+        assert got[field] == expected[field], field
+    assert expected["height"] and expected["ability_links"]
+
+
+def test_items_match_with_fast_path():
+    fast = PokemonSpider()
+    fast.fast_path = True
+    assert crawl(fast) == crawl(PokemonSpider())
+
+
+def test_forms_read_their_own_tab(crawled_items):
+    venusaur = [item for item in crawled_items if item["name"] == "Venusaur"]
+    assert [item.get("form") for item in venusaur] == [None, "Mega Venusaur"]
+    base, mega = venusaur
+    assert "form" not in base
+    assert (base["height"], base["weight"]) == (200.0, 100.0)
+    assert (mega["height"], mega["weight"]) == (240.0, 155.5)
+    assert list(mega["abilities"]) == ["Thick Fat"]
+    assert mega["evolution_stages"] == base["evolution_stages"]
+
+
+def test_form_records_do_not_share_evolution_dicts(spider):
+    records = []
+    for output in spider.parse(make_response(fixture_url("pokedex_all"))):
+        if output.cb_kwargs["forms"]:
+            records = [output.cb_kwargs["attributes"], *output.cb_kwargs["forms"]]
+            list(spider.parse_details(make_response(output.url, output), **output.cb_kwargs))
+    base, mega = records
+    assert mega.evolution_stages == base.evolution_stages
+    assert all(a is not b for a, b in zip(mega.evolution_stages, base.evolution_stages))
+    assert all(a is not b for a, b in zip(mega.evolutions, base.evolutions))
+
+
+def test_form_tabs():
+    tabs = form_tabs(make_response(fixture_url("venusaur")), "tabset-basics")
+    assert list(tabs) == ["Venusaur", "Mega Venusaur"]
+    assert form_tabs(make_response(fixture_url("bulbasaur")), "tabset-basics") == {}
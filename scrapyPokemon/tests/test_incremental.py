@@ -0,0 +1,129 @@
+# Recrawl incremental: requisições condicionais, 304/mesmo hash -> "unchanged", itens
+# reaproveitados pelo spider e o delta gravado pelo IncrementalDeltaPipeline
+
+import json
+
+from scrapy.http import Request
+from scrapy.utils.test import get_crawler
+
+from conftest import fixture_body, fixture_url, make_response
+from scrapyPokemon.incremental import IncrementalState
+from scrapyPokemon.items import record_key
+from scrapyPokemon.middlewares import IncrementalCrawlMiddleware
+from scrapyPokemon.pipelines import IncrementalDeltaPipeline
+from scrapyPokemon.spiders.pokemon import PokemonSpider
+
+VENUSAUR = fixture_url("venusaur")
+
+
+def incremental_spider(state=None):
+    spider = PokemonSpider()
+    spider.incremental = state or IncrementalState(None)
+    return spider
+
+
+def incremental_middleware():
+    crawler = get_crawler(PokemonSpider, {"INCREMENTAL_ENABLED": True})
+    return IncrementalCrawlMiddleware.from_crawler(crawler), crawler.stats
+
+
+def detail_request(spider):
+    return Request(VENUSAUR, meta=spider.detail_meta())
+
+
+def test_conditional_headers_from_previous_crawl():
+    spider = incremental_spider()
+    spider.incremental.update_validators(VENUSAUR, '"v1"', "Wed, 21 Oct 2015 07:28:00 GMT", "h")
+    middleware, _ = incremental_middleware()
+    request = detail_request(spider)
+    middleware.process_request(request, spider)
+
+    assert request.headers[b"If-None-Match"] == b'"v1"'
+    assert request.headers[b"If-Modified-Since"] == b"Wed, 21 Oct 2015 07:28:00 GMT"
+    assert spider.detail_meta()["handle_httpstatus_list"] == [304]
+
+
+def test_not_modified_and_same_hash_are_unchanged():
+    spider = incremental_spider()
+    middleware, stats = incremental_middleware()
+
+    first = middleware.process_response(detail_request(spider), make_response(VENUSAUR), spider)
+    same = middleware.process_response(detail_request(spider), make_response(VENUSAUR), spider)
+    not_modified = middleware.process_response(
+        detail_request(spider), make_response(VENUSAUR, status=304, body=b""), spider)
+    edited = middleware.process_response(
+        detail_request(spider), make_response(VENUSAUR, body=fixture_body(VENUSAUR) + b"<!-- -->"), spider)
+
+    assert "unchanged" not in first.flags and "unchanged" not in edited.flags
+    assert "unchanged" in same.flags and "unchanged" in not_modified.flags
+    assert stats.get_value("incremental/changed") == 2
+    assert stats.get_value("incremental/same_hash") == 1
+    assert stats.get_value("incremental/not_modified") == 1
+
+
+def test_requests_without_incremental_meta_pass_through():
+    spider = incremental_spider()
+    middleware, _ = incremental_middleware()
+    request = Request(VENUSAUR)
+    middleware.process_request(request, spider)
+    response = make_response(VENUSAUR, status=304, body=b"")
+
+    assert b"If-None-Match" not in request.headers
+    assert middleware.process_response(request, response, spider) is response
+
+
+# Pokémon base e forma da mesma página (Venusaur e Mega Venusaur): uma requisição só
+def venusaur_request(spider):
+    for request in spider.parse(make_response(fixture_url("pokedex_all"))):
+        if request.url == VENUSAUR:
+            return request
+
+
+def test_not_modified_page_reuses_previous_items(crawled_items):
+    state = IncrementalState(None)
+    for item in crawled_items:
+        state.remember_item(record_key(item["link"], item.get("form")), item)
+    spider = incremental_spider(state)
+    request = venusaur_request(spider)
+    response = make_response(VENUSAUR, request, status=304, body=b"", flags=["unchanged"])
+
+    outputs = list(spider.parse_details(response, **request.cb_kwargs))
+    previous = [item for item in crawled_items if item["link"] == VENUSAUR]
+    assert outputs == previous
+    assert request.cb_kwargs["attributes"].gate_slot not in spider.detail_gate.slots
+
+
+def test_not_modified_without_saved_item_downloads_again():
+    spider = incremental_spider()
+    request = venusaur_request(spider)
+    request.headers["If-None-Match"] = '"v1"'
+    response = make_response(VENUSAUR, request, status=304, body=b"", flags=["unchanged"])
+
+    (retry,) = list(spider.parse_details(response, **request.cb_kwargs))
+    assert isinstance(retry, Request) and retry.dont_filter
+    assert b"If-None-Match" not in retry.headers
+    assert retry.meta["incremental"] is False
+
+
+def test_delta_has_only_added_or_changed_items(tmp_path, crawled_items):
+    crawler = get_crawler(PokemonSpider, {"INCREMENTAL_ENABLED": True,
+                                          "INCREMENTAL_DELTA_PATH": str(tmp_path / "delta.jl")})
+    spider = incremental_spider()
+
+    def run(items):
+        pipeline = IncrementalDeltaPipeline.from_crawler(crawler)
+        pipeline.open_spider(spider)
+        for item in items:
+            pipeline.process_item(item, spider)
+        pipeline.close_spider(spider)
+        with open(tmp_path / "delta.jl", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    assert run(crawled_items) == crawled_items
+
+    changed = [dict(item) for item in crawled_items]
+    changed[3]["weight"] = 160.0  # só a Mega Venusaur muda
+    assert run(changed) == [changed[3]]
+    assert crawler.stats.get_value("incremental/delta/changed") == 1
+    assert crawler.stats.get_value("incremental/delta/unchanged") == len(crawled_items) - 1
+
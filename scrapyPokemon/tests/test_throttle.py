@@ -0,0 +1,124 @@
+# Decisões do ThrottleController (AIMD por janela, Retry-After, exceções de download)
+# e o AdaptiveThrottleMiddleware aplicando-as no slot do downloader
+
+from types import SimpleNamespace
+
+from scrapy.core.downloader import Slot
+from scrapy.http import Request, Response
+from scrapy.utils.test import get_crawler
+from twisted.internet.error import TimeoutError
+
+from scrapyPokemon.middlewares import AdaptiveThrottleMiddleware
+from scrapyPokemon.spiders.pokemon import PokemonSpider
+from scrapyPokemon.throttle import (BACKOFF, DECREASE, HOLD, INCREASE, RETRY_AFTER,
+                                    ThrottleController, parse_retry_after)
+
+
+def controller(**kwargs):
+    options = dict(concurrency=2, delay=1.0, max_concurrency=4, target_latency=1.0,
+                   max_error_rate=0.1, window=10)
+    options.update(kwargs)
+    return ThrottleController(**options)
+
+
+def observe_window(throttle, statuses, latency=0.2, now=100.0):
+    decisions = [throttle.observe(latency, status, now=now) for status in statuses]
+    assert decisions[:-1] == [None] * (len(statuses) - 1)
+    return decisions[-1]
+
+
+def test_healthy_window_increases():
+    throttle = controller()
+    assert observe_window(throttle, [200] * 10) == INCREASE
+    assert (throttle.concurrency, throttle.delay) == (3, 0.5)
+
+
+def test_concurrency_stops_at_max():
+    throttle = controller(concurrency=4, delay=0.0)
+    assert observe_window(throttle, [200] * 10) == HOLD
+    assert throttle.concurrency == 4
+
+
+def test_errors_accumulate_over_the_window():
+    throttle = controller(concurrency=4)
+    assert observe_window(throttle, [200] * 8 + [503, 429]) == BACKOFF
+    assert (throttle.concurrency, throttle.delay) == (2, 2.0)
+
+
+def test_error_rate_within_budget_does_not_back_off():
+    throttle = controller(max_error_rate=0.2)
+    assert observe_window(throttle, [200] * 9 + [500]) == INCREASE
+
+
+def test_download_exceptions_count_as_errors():
+    throttle = controller(concurrency=4)
+    assert observe_window(throttle, [200] * 8 + [None, None]) == BACKOFF
+    assert throttle.concurrency == 2
+
+
+def test_high_latency_decreases():
+    throttle = controller(concurrency=3)
+    assert observe_window(throttle, [200] * 10, latency=3.0) == DECREASE
+    assert (throttle.concurrency, throttle.delay) == (2, 1.5)
+
+
+def test_errors_do_not_enter_latency_average():
+    throttle = controller()
+    throttle.observe(0.2, 200, now=0.0)
+    throttle.observe(30.0, 504, now=0.0)
+    assert throttle.latency == 0.2
+
+
+def test_retry_after_backs_off_immediately_and_holds():
+    throttle = controller(concurrency=4)
+    assert throttle.observe(0.1, 429, retry_after=5.0, now=100.0) == RETRY_AFTER
+    assert (throttle.concurrency, throttle.delay, throttle.hold_until) == (2, 5.0, 105.0)
+
+    # Janela saudável antes do prazo: segura; depois dele volta a subir
+    assert observe_window(throttle, [200] * 10, now=101.0) == HOLD
+    assert observe_window(throttle, [200] * 10, now=106.0) == INCREASE
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(b"120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == 10.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after("amanhã") is None
+
+
+def throttle_middleware(slot, **settings):
+    crawler = get_crawler(PokemonSpider, {"ADAPTIVE_THROTTLE_ENABLED": True, **settings})
+    crawler.engine = SimpleNamespace(downloader=SimpleNamespace(slots={"pokemondb.net": slot}))
+    return AdaptiveThrottleMiddleware.from_crawler(crawler), crawler.stats
+
+
+def slot_request(latency=0.2):
+    return Request("https://pokemondb.net/pokedex/bulbasaur",
+                   meta={"download_slot": "pokemondb.net", "download_latency": latency})
+
+
+def test_middleware_feeds_exceptions_into_the_slot():
+    slot = Slot(concurrency=4, delay=1.0)
+    middleware, stats = throttle_middleware(slot, ADAPTIVE_THROTTLE_WINDOW=4)
+    spider = PokemonSpider()
+    for _ in range(2):
+        request = slot_request()
+        middleware.process_response(request, Response(request.url, request=request), spider)
+    for _ in range(2):
+        assert middleware.process_exception(slot_request(), TimeoutError(), spider) is None
+
+    assert (slot.concurrency, slot.delay) == (2, 2.0)
+    assert stats.get_value("throttle/exception/TimeoutError") == 2
+    assert stats.get_value("throttle/decision/backoff") == 1
+
+
+def test_middleware_honors_retry_after():
+    slot = Slot(concurrency=4, delay=0.0)
+    middleware, stats = throttle_middleware(slot)
+    request = slot_request()
+    response = Response(request.url, status=429, headers={"Retry-After": "7"}, request=request)
+    middleware.process_response(request, response, PokemonSpider())
+
+    assert (slot.concurrency, slot.delay) == (2, 7.0)
+    assert stats.get_value("throttle/decision/retry_after") == 1
+    assert stats.get_value("throttle/status/429") == 1